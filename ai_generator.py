@@ -4,20 +4,793 @@ Uses Claude to intelligently create presentation content from user input
 """
 
 import os
+import re
 import json
-from typing import Dict, List, Optional
-import anthropic
+import time
+import random
+import logging
+import itertools
+import hashlib
+import tempfile
+import threading
+import contextlib
+import weakref
+from collections import OrderedDict, deque
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+log = logging.getLogger('slidecraft.ai')
+
+# Anthropic clients are shared per API key (async ones also per event loop), so
+# calls reuse pooled keep-alive connections instead of paying TCP/TLS setup each time
+CLIENT_LIMITS = {'max_connections': 20, 'max_keepalive_connections': 10, 'keepalive_expiry': 60.0}
+CLIENT_TIMEOUT = {'connect': 10.0, 'read': 600.0, 'write': 60.0, 'pool': 60.0}
+_clients = {}                                 # API key -> anthropic.Anthropic
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> {API key: anthropic.AsyncAnthropic}
+_clients_lock = threading.Lock()
+_closing = set()                              # aclose() tasks of replaced async clients, held until done
+
+
+def configure_clients(
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+    connect_timeout: Optional[float] = None,
+    read_timeout: Optional[float] = None
+):
+    """Connection-pool limits and timeouts for shared clients.
+
+    Clients created earlier are closed (async ones on their own event loop), so call
+    this between requests: one still running on an old client fails.
+    """
+    for name, value in (('max_connections', max_connections),
+                        ('max_keepalive_connections', max_keepalive_connections),
+                        ('keepalive_expiry', keepalive_expiry)):
+        if value is not None:
+            CLIENT_LIMITS[name] = value
+    if connect_timeout is not None:
+        CLIENT_TIMEOUT['connect'] = connect_timeout
+    if read_timeout is not None:
+        CLIENT_TIMEOUT['read'] = read_timeout
+    with _clients_lock:
+        old, old_async = list(_clients.values()), list(_async_clients.items())
+        _clients.clear()
+        _async_clients.clear()
+    for client in old:
+        client.close()
+    for loop, clients in old_async:
+        _close_on_loop(loop, list(clients.values()))
+
+
+def _close_on_loop(loop, clients):
+    """Schedule aclose() of async clients on the loop that owns their connections"""
+    if loop.is_closed():
+        return
+
+    def close():
+        for client in clients:
+            task = loop.create_task(client.close())
+            _closing.add(task)
+            task.add_done_callback(_closing.discard)
+
+    with contextlib.suppress(RuntimeError):  # closed since the check
+        loop.call_soon_threadsafe(close)
+
+
+def _http_options() -> Dict:
+    import httpx
+    return {
+        'limits': httpx.Limits(**CLIENT_LIMITS),
+        'timeout': httpx.Timeout(**CLIENT_TIMEOUT),
+        'follow_redirects': True,
+    }
+
+
+def shared_client(api_key: str):
+    """Process-wide anthropic.Anthropic for `api_key`, created on first use"""
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                import anthropic
+                import httpx
+                options = _http_options()
+                client = _clients[api_key] = anthropic.Anthropic(
+                    api_key=api_key, timeout=options['timeout'], max_retries=0, http_client=httpx.Client(**options))
+    return client
+
+
+def shared_async_client(api_key: str):
+    """anthropic.AsyncAnthropic for `api_key` on the running event loop (pooled connections belong to one loop)"""
+    import asyncio
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(api_key)
+        if client is None:
+            import anthropic
+            import httpx
+            options = _http_options()
+            client = clients[api_key] = anthropic.AsyncAnthropic(
+                api_key=api_key, timeout=options['timeout'], max_retries=0, http_client=httpx.AsyncClient(**options))
+    return client
+
+
+class _TokenBucket:
+    """Refills at `per_minute` units a minute, holding at most burst_seconds of them.
+
+    The level goes negative when a response used more than was reserved for it.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self._stamp = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def wait(self, amount, now) -> float:
+        """Seconds until `amount` can be taken"""
+        self._refill(now)
+        return max(0.0, (min(amount, self.capacity) - self.level) / self.rate)
+
+    def take(self, amount):
+        self.level -= amount
+
+
+class _Ticket:
+    __slots__ = ('tokens', 'lane', 'tenant', 'wake')
+
+    def __init__(self, tokens, lane, tenant, wake=None):
+        self.tokens = tokens
+        self.lane = lane
+        self.tenant = tenant
+        self.wake = wake  # async waiters: thread-safe callback that wakes the waiting task
+
+
+class RequestScheduler:
+    """Admission control and retries for every Claude request.
+
+    A request waits until it is next in line and the requests-per-minute and
+    tokens-per-minute buckets and the concurrency cap all have room. Lanes
+    are strict priorities ('interactive' before 'batch'); within a lane,
+    tenants take turns. 429/529/5xx responses and connection errors are
+    retried with jittered exponential backoff, honouring retry-after headers;
+    a retry-after pauses all admissions, since the limit is per account.
+    Rate limits depend on the account's tier, so none is set by default.
+    """
+
+    LANES = ('interactive', 'batch')
+    RETRY_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+    # Limits are per minute but may be enforced over shorter windows, so bursts are kept to a second's worth
+    BURST_SECONDS = 1.0
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: int = 8,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0
+    ):
+        self.options = {
+            'requests_per_minute': requests_per_minute, 'tokens_per_minute': tokens_per_minute,
+            'max_concurrency': max_concurrency, 'max_retries': max_retries,
+            'base_delay': base_delay, 'max_delay': max_delay,
+        }
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._requests = _TokenBucket(requests_per_minute, self.BURST_SECONDS) if requests_per_minute else None
+        self._tokens = _TokenBucket(tokens_per_minute, self.BURST_SECONDS) if tokens_per_minute else None
+        self._lanes = {lane: OrderedDict() for lane in self.LANES}  # lane -> tenant -> deque of tickets
+        self._active = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self.stats = {'requests': 0, 'retries': 0, 'throttled': 0}
+
+    # -- admission ---------------------------------------------------------
+
+    def _enqueue(self, tokens, lane, tenant, wake=None) -> _Ticket:
+        if lane not in self._lanes:
+            raise ValueError(f"Unknown priority lane '{lane}'. Use one of: {', '.join(self.LANES)}")
+        ticket = _Ticket(tokens, lane, tenant, wake)
+        with self._cond:
+            self._lanes[lane].setdefault(tenant, deque()).append(ticket)
+        return ticket
+
+    def _notify(self):
+        """Wake waiters after admissions change (lock held): threads through the condition,
+        and the head ticket directly if an async task holds it, since only the head can be admitted"""
+        self._cond.notify_all()
+        head = self._head()
+        if head is not None and head.wake is not None:
+            head.wake()
+
+    def _head(self) -> Optional[_Ticket]:
+        for tenants in self._lanes.values():
+            if tenants:
+                return next(iter(tenants.values()))[0]
+        return None
+
+    def _try_admit(self, ticket) -> Optional[float]:
+        """Admit `ticket` if it may start now (returns 0.0); else seconds to wait, None meaning until notified"""
+        with self._cond:
+            if self._head() is not ticket or self._active >= self.max_concurrency:
+                return None
+            now = time.monotonic()
+            wait = max(self._paused_until - now,
+                       self._requests.wait(1, now) if self._requests else 0.0,
+                       self._tokens.wait(ticket.tokens, now) if self._tokens else 0.0)
+            if wait > 0:
+                return wait
+            if self._requests:
+                self._requests.take(1)
+            if self._tokens:
+                self._tokens.take(ticket.tokens)
+            self._dequeue(ticket)
+            self._active += 1
+            self.stats['requests'] += 1
+            self._notify()
+            return 0.0
+
+    def _dequeue(self, ticket):
+        """Remove `ticket`; its tenant goes to the back of the lane so tenants take turns"""
+        tenants = self._lanes[ticket.lane]
+        queue = tenants.pop(ticket.tenant)
+        queue.remove(ticket)
+        if queue:
+            tenants[ticket.tenant] = queue
+
+    def _withdraw(self, ticket):
+        with self._cond:
+            queue = self._lanes[ticket.lane].get(ticket.tenant)
+            if queue is not None and ticket in queue:
+                queue.remove(ticket)
+                if not queue:
+                    del self._lanes[ticket.lane][ticket.tenant]
+                self._notify()
+
+    def _acquire(self, tokens, lane, tenant) -> _Ticket:
+        ticket = self._enqueue(tokens, lane, tenant)
+        try:
+            # The condition's lock is re-entrant: checking and waiting under one hold cannot miss a notify
+            with self._cond:
+                while True:
+                    wait = self._try_admit(ticket)
+                    if wait == 0.0:
+                        return ticket
+                    self._cond.wait(wait)
+        except BaseException:
+            self._withdraw(ticket)
+            raise
+
+    async def _acquire_async(self, tokens, lane, tenant) -> _Ticket:
+        import asyncio
+        loop = asyncio.get_running_loop()
+        woken = asyncio.Event()
+
+        def wake():
+            with contextlib.suppress(RuntimeError):  # loop already closed
+                loop.call_soon_threadsafe(woken.set)
+
+        ticket = self._enqueue(tokens, lane, tenant, wake)
+        try:
+            while True:
+                woken.clear()  # before checking, so a wake-up during the check is not lost
+                wait = self._try_admit(ticket)
+                if wait == 0.0:
+                    return ticket
+                # Sleep until a release/admission wakes us, or until the buckets or a pause allow it
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(woken.wait(), wait)
+        except BaseException:
+            self._withdraw(ticket)
+            raise
+
+    def _release(self, ticket, result=None):
+        """Free the slot; charge the tokens the response actually used instead of the estimate"""
+        usage = getattr(result, 'usage', None)
+        with self._cond:
+            self._active -= 1
+            if self._tokens and usage is not None:
+                used = (getattr(usage, 'input_tokens', 0) or 0) + (getattr(usage, 'output_tokens', 0) or 0)
+                self._tokens.take(used - ticket.tokens)
+            self._notify()
+
+    # -- retries -----------------------------------------------------------
+
+    def _retry_delay(self, error, attempt) -> Optional[float]:
+        """Seconds before retrying after `error`, or None if it should propagate"""
+        status = getattr(error, 'status_code', None)
+        connection = any(cls.__name__ == 'APIConnectionError' for cls in type(error).__mro__)
+        if attempt >= self.max_retries or not (status in self.RETRY_STATUSES or connection):
+            return None
+        retry_after = _retry_after(getattr(getattr(error, 'response', None), 'headers', None))
+        if retry_after is not None:
+            delay = min(retry_after, self.max_delay) * random.uniform(1.0, 1.2)
+            with self._cond:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        else:
+            delay = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+        self.stats['retries'] += 1
+        if status == 429:
+            self.stats['throttled'] += 1
+        log.warning("⏳ Claude request failed (%s); retry %d in %.1fs", status or type(error).__name__,
+                    attempt + 1, delay, extra={'event': 'ai_retry', 'status': status, 'delay': delay})
+        return delay
+
+    # -- entry points ------------------------------------------------------
+
+    def call(self, send: Callable, tokens: int = 0, lane: str = 'interactive', tenant: str = 'default'):
+        """send() once admitted, retrying retryable failures; returns its result"""
+        for attempt in itertools.count():
+            ticket = self._acquire(tokens, lane, tenant)
+            try:
+                result = send()
+            except Exception as error:
+                self._release(ticket)
+                delay = self._retry_delay(error, attempt)
+                if delay is None:
+                    raise
+            except BaseException:
+                self._release(ticket)  # interrupted or cancelled: never retried, but the slot is freed
+                raise
+            else:
+                self._release(ticket, result)
+                return result
+            time.sleep(delay)
+
+    async def call_async(self, send: Callable, tokens: int = 0, lane: str = 'interactive', tenant: str = 'default'):
+        """call() for coroutines: `send` returns an awaitable"""
+        import asyncio
+        for attempt in itertools.count():
+            ticket = await self._acquire_async(tokens, lane, tenant)
+            try:
+                result = await send()
+            except Exception as error:
+                self._release(ticket)
+                delay = self._retry_delay(error, attempt)
+                if delay is None:
+                    raise
+            except BaseException:
+                self._release(ticket)  # interrupted or cancelled: never retried, but the slot is freed
+                raise
+            else:
+                self._release(ticket, result)
+                return result
+            await asyncio.sleep(delay)
+
+    @contextlib.contextmanager
+    def stream(self, open_stream: Callable, tokens: int = 0, lane: str = 'interactive', tenant: str = 'default'):
+        """call() for streaming responses: retries opening the stream and holds the slot while it is read"""
+        for attempt in itertools.count():
+            ticket = self._acquire(tokens, lane, tenant)
+            try:
+                manager = open_stream()
+                stream = manager.__enter__()
+            except Exception as error:
+                self._release(ticket)
+                delay = self._retry_delay(error, attempt)
+                if delay is None:
+                    raise
+            except BaseException:
+                self._release(ticket)
+                raise
+            else:
+                break
+            time.sleep(delay)
+        with contextlib.ExitStack() as stack:
+            stack.callback(self._release, ticket)
+            stack.push(manager.__exit__)
+            yield stream
+
+    def scheduler_info(self) -> Dict:
+        with self._cond:
+            waiting = {lane: sum(len(queue) for queue in tenants.values()) for lane, tenants in self._lanes.items()}
+            return dict(self.stats, active=self._active, waiting=waiting)
+
+
+def _retry_after(headers) -> Optional[float]:
+    """Seconds from retry-after-ms / retry-after (seconds or an HTTP date), if the server sent one"""
+    if not headers:
+        return None
+    with contextlib.suppress(TypeError, ValueError):
+        if headers.get('retry-after-ms') is not None:
+            return max(0.0, float(headers['retry-after-ms']) / 1000)
+    value = headers.get('retry-after')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    with contextlib.suppress(TypeError, ValueError):
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    return None
+
+
+_scheduler = RequestScheduler()
+
+
+def configure_scheduler(**options) -> RequestScheduler:
+    """Replace the process-wide scheduler (RequestScheduler arguments); requests already admitted finish on the old one"""
+    global _scheduler
+    _scheduler = RequestScheduler(**options)
+    return _scheduler
+
+
+def shared_scheduler() -> RequestScheduler:
+    return _scheduler
+
+
+def _reset_clients():
+    """A forked child must not share the parent's sockets or scheduler state; it starts its own"""
+    global _clients_lock, _scheduler
+    _clients_lock = threading.Lock()
+    _clients.clear()
+    _async_clients.clear()
+    _scheduler = RequestScheduler(**_scheduler.options)
+    for cache in list(ResponseCache._live):
+        cache._lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_clients)
+
+
+class SlideStreamParser:
+    """Incremental parser for the JSON array of slides as Claude streams it.
+
+    feed() takes text chunks and returns each top-level object as soon as its
+    closing brace arrives; text before the first '[' (prose, a ```json fence)
+    is skipped, as _parse_ai_response does for complete responses.
+    """
+
+    _TOKENS = re.compile(r'[\[\]{}"\\]')
+
+    def __init__(self):
+        self._buffer = ''
+        self._pos = 0            # next index of _buffer to scan
+        self._start = None       # index where the current top-level item began
+        self._depth = 0          # nesting below the top-level array
+        self._in_string = False
+        self.started = False
+        self.done = False
+
+    def feed(self, text: str) -> List[Dict]:
+        """Slides completed by `text`, in order"""
+        self._buffer += text
+        buf, slides = self._buffer, []
+        pos = self._pos
+        while not self.done:
+            match = self._TOKENS.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            ch, pos = match.group(), match.end()
+            if self._in_string:
+                if ch == '\\':
+                    if pos == len(buf):
+                        pos -= 1  # escaped character not here yet
+                        break
+                    pos += 1
+                elif ch == '"':
+                    self._in_string = False
+            elif not self.started:
+                self.started = ch == '['
+            elif ch == '"':
+                self._in_string = True
+            elif ch in '[{':
+                if self._depth == 0:
+                    self._start = match.start()
+                self._depth += 1
+            elif self._depth == 0:
+                self.done = ch == ']'
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    item = self._load(buf[self._start:pos])
+                    if isinstance(item, dict):
+                        slides.append(item)
+
+        # Keep only the unfinished item
+        keep = self._start if self._depth else pos
+        self._buffer, self._pos = buf[keep:], pos - keep
+        if self._depth:
+            self._start = 0
+        return slides
+
+    def close(self):
+        """Check the array was complete once the response has ended"""
+        if not self.started:
+            raise ValueError("No JSON array found in response")
+        if not self.done:
+            raise ValueError("AI response ended before the slide array was complete")
+
+    @staticmethod
+    def _load(text):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse AI response as JSON: {e}")
+
+
+# A line that starts a new part of a long document: markdown heading, "Chapter 3", or an ALL-CAPS title
+_HEADING = re.compile(r"#{1,6}\s|(?i:chapter|section|part|article)\s+\w+|[A-Z][A-Z0-9 ,&/'()-]{3,}:?$")
+
+
+def split_sections(content: str, max_chars: int) -> List[str]:
+    """Split long source text into sections of at most max_chars.
+
+    Sections are cut between paragraphs, preferably at headings once a section is
+    half full; paragraphs longer than max_chars are cut between lines (or words).
+    """
+    sections, current, size = [], [], 0
+    for block in re.split(r'\n\s*\n', content.strip()):
+        for piece in _pieces(block, max_chars):
+            heading = _HEADING.match(piece.partition('\n')[0])
+            if current and (size + len(piece) > max_chars or (heading and size >= max_chars // 2)):
+                sections.append('\n\n'.join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece) + 2
+    if current:
+        sections.append('\n\n'.join(current))
+    return sections
+
+
+def _pieces(block: str, max_chars: int) -> List[str]:
+    """`block` cut into pieces of at most max_chars, between lines where possible"""
+    if len(block) <= max_chars:
+        return [block]
+    pieces, current = [], ''
+    for line in block.splitlines():
+        while len(line) > max_chars:
+            cut = line.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                pieces.append(current)
+                current = ''
+            pieces.append(line[:cut])
+            line = line[cut:].lstrip()
+        if current and len(current) + len(line) + 1 > max_chars:
+            pieces.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+class SectionMerger:
+    """Reduce step of map-reduce generation: joins per-section slides in order.
+
+    Only the first title slide is kept, repeated slides (same fields apart from
+    notes) are dropped and section slides are renumbered 01, 02, ... . Slides
+    are merged incrementally, so a streamed deck can emit each section as soon
+    as it and the ones before it are done.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.sections = 0
+        self._seen = set()
+
+    def add(self, slides: List[Dict]) -> List[Dict]:
+        """Slides of the next section that make it into the deck"""
+        kept = []
+        for slide in slides:
+            if slide.get('type') == 'title' and self.count:
+                continue
+            fingerprint = ' '.join(json.dumps({k: v for k, v in slide.items() if k not in ('notes', 'section_number')},
+                                              sort_keys=True).lower().split())
+            if fingerprint in self._seen:
+                continue
+            self._seen.add(fingerprint)
+            if slide.get('type') == 'section':
+                self.sections += 1
+                slide['section_number'] = f"{self.sections:02d}"
+            self.count += 1
+            kept.append(slide)
+        return kept
+
+
+class ResponseCache:
+    """Parsed Claude responses, keyed by a hash of the request.
+
+    Entries live on disk as JSON (written to a temp file and renamed into
+    place, so processes can share a directory) behind a small in-memory LRU.
+    Entries older than ttl seconds are misses; beyond max_bytes the least
+    recently used files are evicted, as in slidecraft_v5.OutputCache.
+    """
+
+    DEFAULT_TTL = 7 * 24 * 3600
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+    MEMORY_ENTRIES = 64
+    _instances = {}
+    _live = weakref.WeakSet()  # every instance, so a forked child can reset their locks
+
+    def __init__(self, directory: str, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        self.directory = directory
+        self.ttl = ttl or self.DEFAULT_TTL
+        self.max_bytes = max_bytes or self.DEFAULT_MAX_BYTES
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()  # key -> (created, JSON text)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        ResponseCache._live.add(self)
+
+    @classmethod
+    def at(cls, directory: str) -> 'ResponseCache':
+        """Shared instance for `directory`, so the memory tier and counts persist across generators"""
+        key = os.path.abspath(directory)
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = cls._instances.setdefault(key, cls(directory))
+        return instance
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Cached slides for `key` (a fresh copy), or None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is None:
+            entry = self._read(key)
+        else:
+            # Keep the disk copy's LRU position in step with the memory tier
+            with contextlib.suppress(OSError):
+                os.utime(self._path(key))
+        if entry is not None and time.time() - entry[0] > self.ttl:
+            self._drop(key, entry)
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(entry[1])
+
+    def _drop(self, key, entry):
+        """Forget an expired entry in both tiers, unless a put() has replaced it meanwhile"""
+        with self._lock:
+            if self._memory.get(key) is entry:
+                del self._memory[key]
+        path = self._path(key)
+        with contextlib.suppress(OSError, ValueError, KeyError):
+            with open(path, encoding='utf-8') as f:
+                created = json.load(f)['created']
+            if created == entry[0]:
+                os.remove(path)
+
+    def _read(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                stored = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        entry = (stored['created'], json.dumps(stored['slides']))
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.MEMORY_ENTRIES:
+                self._memory.popitem(last=False)
+
+    def put(self, key: str, slides: List[Dict]):
+        created = time.time()
+        self._remember(key, (created, json.dumps(slides)))
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'created': created, 'slides': slides}, f)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            raise
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                with contextlib.suppress(FileNotFoundError):
+                    st = entry.stat()
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            # Another process may have evicted it already
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+
+    def cache_info(self) -> Dict:
+        return {'hits': self.hits, 'misses': self.misses, 'directory': self.directory}
 
 
 class AIContentGenerator:
     """Generate presentation content using Claude AI"""
 
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize with Anthropic API key"""
+    # Content longer than this is split into sections of at most SECTION_CHARS, generated
+    # MAP_CONCURRENCY at a time and merged, so latency follows the slowest section
+    LONG_CONTENT_CHARS = 15000
+    SECTION_CHARS = 10000
+    MAP_CONCURRENCY = 8
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Union[str, ResponseCache, None] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        lane: str = 'interactive',
+        tenant: str = 'default'
+    ):
+        """Initialize with Anthropic API key, and optionally a ResponseCache (or its directory).
+
+        Requests go through `scheduler` (default: the process-wide one) in `lane`
+        ('interactive' or 'batch') on behalf of `tenant`.
+        """
         self.api_key = api_key or os.getenv('ANTHROPIC_API_KEY')
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not found. Set it in .env or pass it directly.")
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        if lane not in RequestScheduler.LANES:
+            raise ValueError(f"Unknown priority lane '{lane}'. Use one of: {', '.join(RequestScheduler.LANES)}")
+        self._scheduler = scheduler
+        self.lane = lane
+        self.tenant = tenant
+        self.cache = ResponseCache.at(cache) if isinstance(cache, (str, os.PathLike)) else cache
+        # Clients are looked up on first use: the SDK takes over a second to import and only AI mode needs it
+        self._client = None
+        self._async_client = None
+
+    @property
+    def client(self):
+        """Shared Anthropic client for the sync methods; looked up per call so configure_clients() takes effect"""
+        return self._client if self._client is not None else shared_client(self.api_key)
+
+    @client.setter
+    def client(self, client):
+        self._client = client
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        """The scheduler every request goes through; follows configure_scheduler() unless one was passed in"""
+        return self._scheduler or _scheduler
+
+    def _admission(self, params: Dict) -> Dict:
+        """Scheduler arguments for a request: estimated tokens (prompt at ~4 chars a token, plus max_tokens)"""
+        prompt_chars = sum(len(message['content']) for message in params['messages'])
+        return {'tokens': prompt_chars // 4 + params['max_tokens'], 'lane': self.lane, 'tenant': self.tenant}
+
+    @property
+    def async_client(self):
+        """Shared AsyncAnthropic client for the *_async methods, on the running event loop"""
+        return self._async_client if self._async_client is not None else shared_async_client(self.api_key)
+
+    @async_client.setter
+    def async_client(self, client):
+        self._async_client = client
 
     def generate_presentation_structure(
         self,
@@ -25,7 +798,8 @@ class AIContentGenerator:
         content: str,
         theme: str = 'software_professional',
         num_slides: Optional[int] = None,
-        presentation_type: str = 'general'
+        presentation_type: str = 'general',
+        fresh: bool = False
     ) -> Dict:
         """
         Generate complete presentation structure from user input
@@ -36,46 +810,200 @@ class AIContentGenerator:
             theme: Visual theme to apply
             num_slides: Target number of slides (if None, AI decides)
             presentation_type: Type of presentation (sermon, business, education, etc.)
+            fresh: Skip the response cache and ask Claude again (the new answer is cached)
 
         Returns:
             Dict with presentation structure ready for create_presentation()
         """
 
-        # Build the prompt for Claude
-        prompt = self._build_generation_prompt(topic, content, num_slides, presentation_type)
+        if len(content) > self.LONG_CONTENT_CHARS:
+            merger = SectionMerger()
+            slides = [slide
+                      for section in self._generate_sections(topic, content, num_slides, presentation_type, fresh)
+                      for slide in merger.add(section)]
+        else:
+            # Build the prompt for Claude
+            params = self._message_params(self._build_generation_prompt(topic, content, num_slides, presentation_type))
+            slides = self._slides_for(params, fresh)
+
+        return {'theme': theme, 'slides_content': slides}
+
+    def _slides_for(self, params: Dict, fresh: bool = False) -> List[Dict]:
+        """Parsed slides for one request, from the response cache or Claude"""
+        key = self._cache_key(params)
+        slides = None if fresh else self._cache_get(key)
+        if slides is None:
+            # Call Claude API
+            message = self.scheduler.call(lambda: self.client.messages.create(**params), **self._admission(params))
+            slides = self._parse_ai_response(message.content[0].text)
+            self._cache_put(key, slides)
+        return slides
+
+    def _section_params(self, topic, content, num_slides, presentation_type) -> List[Dict]:
+        """Map step inputs: one request per section of long content"""
+        sections = split_sections(content, self.SECTION_CHARS)
+        total = sum(len(section) for section in sections)
+        return [
+            self._message_params(self._build_generation_prompt(
+                topic, section,
+                max(2, round(num_slides * len(section) / total)) if num_slides else None,
+                presentation_type,
+                part=(number, len(sections))
+            ))
+            for number, section in enumerate(sections, 1)
+        ]
+
+    def _generate_sections(self, topic, content, num_slides, presentation_type, fresh) -> Iterator[List[Dict]]:
+        """Slides for each section of long content, generated concurrently and yielded in order"""
+        requests = self._section_params(topic, content, num_slides, presentation_type)
+        pool = ThreadPoolExecutor(min(self.MAP_CONCURRENCY, len(requests)), thread_name_prefix='slidecraft-ai')
+        try:
+            futures = [pool.submit(self._slides_for, params, fresh) for params in requests]
+            for future in futures:
+                yield future.result()
+        finally:
+            # Sections not yet requested are dropped if the caller stops early or one fails
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def generate_presentation_structure_async(
+        self,
+        topic: str,
+        content: str,
+        theme: str = 'software_professional',
+        num_slides: Optional[int] = None,
+        presentation_type: str = 'general',
+        fresh: bool = False
+    ) -> Dict:
+        """generate_presentation_structure on the async client; the event loop stays free while Claude writes"""
+        if len(content) > self.LONG_CONTENT_CHARS:
+            import asyncio
+            slots = asyncio.Semaphore(self.MAP_CONCURRENCY)
+
+            async def section(params):
+                async with slots:
+                    return await self._slides_for_async(params, fresh)
+
+            requests = self._section_params(topic, content, num_slides, presentation_type)
+            tasks = [asyncio.ensure_future(section(params)) for params in requests]
+            try:
+                results = await asyncio.gather(*tasks)
+            finally:
+                # As in the sync path, sections still in flight are dropped once one fails or we are cancelled
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            merger = SectionMerger()
+            slides = [slide for slides in results for slide in merger.add(slides)]
+        else:
+            params = self._message_params(self._build_generation_prompt(topic, content, num_slides, presentation_type))
+            slides = await self._slides_for_async(params, fresh)
+        return {'theme': theme, 'slides_content': slides}
+
+    async def _slides_for_async(self, params: Dict, fresh: bool = False) -> List[Dict]:
+        key = self._cache_key(params)
+        slides = None if fresh else self._cache_get(key)
+        if slides is None:
+            message = await self.scheduler.call_async(lambda: self.async_client.messages.create(**params),
+                                                      **self._admission(params))
+            slides = self._parse_ai_response(message.content[0].text)
+            self._cache_put(key, slides)
+        return slides
+
+    def stream_slides(
+        self,
+        topic: str,
+        content: str,
+        num_slides: Optional[int] = None,
+        presentation_type: str = 'general',
+        fresh: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Yield each slide as soon as Claude finishes writing it (streaming Messages API).
+
+        Pass the iterator as config['slides_content'] and the builder renders
+        every slide while the next one is still being generated. A cached
+        response is replayed at once; a streamed one is cached when it completes.
+        Long content is generated section by section instead, and each section's
+        slides are yielded once it and the sections before it are done.
+        """
+        if len(content) > self.LONG_CONTENT_CHARS:
+            merger = SectionMerger()
+            for section in self._generate_sections(topic, content, num_slides, presentation_type, fresh):
+                yield from merger.add(section)
+            return
+
+        params = self._message_params(self._build_generation_prompt(topic, content, num_slides, presentation_type))
+        key = self._cache_key(params)
+        cached = None if fresh else self._cache_get(key)
+        if cached is not None:
+            yield from cached
+            return
+
+        parser = SlideStreamParser()
+        slides = []
+        with self.scheduler.stream(lambda: self.client.messages.stream(**params), **self._admission(params)) as stream:
+            for text in stream.text_stream:
+                for slide in parser.feed(text):
+                    slides.append(self._normalize_slide(slide))
+                    yield slide
+        parser.close()
+        self._cache_put(key, slides)
 
-        # Call Claude API
-        message = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            temperature=0.7,
-            messages=[{
+    def _message_params(self, prompt: str) -> Dict:
+        """Request parameters shared by the sync and async calls"""
+        return {
+            'model': "claude-sonnet-4-20250514",
+            'max_tokens': 4000,
+            'temperature': 0.7,
+            'messages': [{
                 "role": "user",
                 "content": prompt
             }]
-        )
+        }
 
-        # Parse response
-        response_text = message.content[0].text
+    @staticmethod
+    def _cache_key(params: Dict) -> str:
+        """Hash of the request fields that determine Claude's answer (theme is not among them)"""
+        payload = json.dumps([params['model'], params['temperature'], params['max_tokens'], params['messages']],
+                             sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
-        # Extract JSON from response
-        slides_content = self._parse_ai_response(response_text)
+    def _cache_get(self, key: str) -> Optional[List[Dict]]:
+        return self.cache.get(key) if self.cache is not None else None
 
-        return {
-            'theme': theme,
-            'slides_content': slides_content
-        }
+    def _cache_put(self, key: str, slides: List[Dict]):
+        if self.cache is not None:
+            self.cache.put(key, slides)
 
     def _build_generation_prompt(
         self,
         topic: str,
         content: str,
         num_slides: Optional[int],
-        presentation_type: str
+        presentation_type: str,
+        part: Optional[Tuple[int, int]] = None
     ) -> str:
-        """Build the prompt for Claude to generate presentation content"""
+        """Build the prompt for Claude to generate presentation content
+
+        part=(number, total) asks for the slides of one section of a longer source.
+        """
+
+        # Normalize whitespace and case so trivially different inputs share a cache entry
+        topic = ' '.join(topic.split())
+        content = '\n'.join(line.rstrip() for line in content.strip().splitlines())
+        presentation_type = presentation_type.strip().lower()
 
         slide_count_guidance = f"Create approximately {num_slides} slides" if num_slides else "Create an appropriate number of slides (typically 8-15)"
+        part_guidance = ''
+        if part:
+            number, total = part
+            if not num_slides:
+                slide_count_guidance = "Create an appropriate number of slides (typically 3-8)"
+            part_guidance = f"""
+**This content is part {number} of {total} of a longer source.** Other parts are handled separately, so only cover this part.
+- {"Open with the title slide for the whole presentation." if number == 1 else "Do not add a title slide; begin with a section slide for this part."}
+- {"End with the closing slide for the whole presentation." if number == total else "Do not add closing, summary or next-steps slides."}
+"""
 
         type_guidance = {
             'sermon': """
@@ -117,7 +1045,7 @@ This is a GENERAL presentation. Structure it professionally with:
 
 **Instructions:**
 {slide_count_guidance} for this presentation.
-{type_guidance.get(presentation_type, type_guidance['general'])}
+{type_guidance.get(presentation_type, type_guidance['general'])}{part_guidance}
 
 Analyze the user's content and create a well-structured presentation. Return ONLY a JSON array of slide objects.
 
@@ -199,10 +1127,7 @@ Return ONLY the JSON array, no other text or explanation."""
 
             # Ensure all slides have required fields
             for slide in slides:
-                if 'type' not in slide:
-                    slide['type'] = 'content'
-                if 'notes' not in slide:
-                    slide['notes'] = ''
+                self._normalize_slide(slide)
 
             return slides
 
@@ -211,6 +1136,15 @@ Return ONLY the JSON array, no other text or explanation."""
         except Exception as e:
             raise ValueError(f"Error processing AI response: {e}")
 
+    @staticmethod
+    def _normalize_slide(slide: Dict) -> Dict:
+        """Fill the fields every slide needs"""
+        if 'type' not in slide:
+            slide['type'] = 'content'
+        if 'notes' not in slide:
+            slide['notes'] = ''
+        return slide
+
 
 def generate_with_ai(
     topic: str,
@@ -218,7 +1152,9 @@ def generate_with_ai(
     theme: str = 'software_professional',
     num_slides: Optional[int] = None,
     presentation_type: str = 'general',
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    cache: Union[str, ResponseCache, None] = None,
+    fresh: bool = False
 ) -> Dict:
     """
     Convenience function to generate presentation with AI
@@ -230,17 +1166,81 @@ def generate_with_ai(
         num_slides: Target slide count (optional)
         presentation_type: Type of presentation
         api_key: Anthropic API key (optional, reads from env)
+        cache: ResponseCache or its directory; repeated requests skip the API call
+        fresh: Bypass the cache for this request ("regenerate")
 
     Returns:
         Configuration dict ready for create_presentation()
     """
-    generator = AIContentGenerator(api_key)
+    generator = AIContentGenerator(api_key, cache)
     return generator.generate_presentation_structure(
         topic=topic,
         content=content,
         theme=theme,
         num_slides=num_slides,
-        presentation_type=presentation_type
+        presentation_type=presentation_type,
+        fresh=fresh
+    )
+
+
+def generate_with_ai_streaming(
+    topic: str,
+    content: str,
+    theme: str = 'software_professional',
+    num_slides: Optional[int] = None,
+    presentation_type: str = 'general',
+    api_key: Optional[str] = None,
+    cache: Union[str, ResponseCache, None] = None,
+    fresh: bool = False
+) -> Dict:
+    """
+    generate_with_ai whose 'slides_content' is an iterator of slides arriving
+    from the streaming API. create_presentation() renders each slide as it
+    arrives, so rendering overlaps generation. The request starts on first
+    iteration, and the iterator can only be consumed once.
+
+    Returns:
+        Configuration dict ready for create_presentation()
+    """
+    generator = AIContentGenerator(api_key, cache)
+    return {
+        'theme': theme,
+        'slides_content': generator.stream_slides(
+            topic=topic,
+            content=content,
+            num_slides=num_slides,
+            presentation_type=presentation_type,
+            fresh=fresh
+        )
+    }
+
+
+async def generate_with_ai_async(
+    topic: str,
+    content: str,
+    theme: str = 'software_professional',
+    num_slides: Optional[int] = None,
+    presentation_type: str = 'general',
+    api_key: Optional[str] = None,
+    cache: Union[str, ResponseCache, None] = None,
+    fresh: bool = False
+) -> Dict:
+    """
+    generate_with_ai for asyncio services: uses the Anthropic async client,
+    so many slow AI requests can wait concurrently on one event loop.
+    Cancelling the awaiting task cancels the HTTP request.
+
+    Returns:
+        Configuration dict ready for create_presentation_async()
+    """
+    generator = AIContentGenerator(api_key, cache)
+    return await generator.generate_presentation_structure_async(
+        topic=topic,
+        content=content,
+        theme=theme,
+        num_slides=num_slides,
+        presentation_type=presentation_type,
+        fresh=fresh
     )
 
 
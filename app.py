@@ -10,7 +10,7 @@ from slidecraft_v5 import (
     TEMPLATE_LIBRARY,
     BrandKit
 )
-from ai_generator import generate_with_ai
+from ai_generator import AIContentGenerator
 import os
 from datetime import datetime
 from dotenv import load_dotenv
@@ -20,6 +20,16 @@ from pathlib import Path
 env_path = Path(__file__).parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+# Claude responses are cached here, so regenerating the same request (e.g. with another theme) is instant
+AI_CACHE_DIR = os.getenv('SLIDECRAFT_AI_CACHE', str(Path(__file__).parent / '.ai_cache'))
+
+
+@st.cache_resource(show_spinner=False)
+def ai_generator_for(api_key):
+    """One generator per API key for the server's lifetime; reruns and sessions share its pooled Claude client"""
+    return AIContentGenerator(api_key, cache=AI_CACHE_DIR)
+
+
 # Page config
 st.set_page_config(
     page_title="SlideCraft v5.0",
@@ -274,6 +284,12 @@ Example for business:
             help="Leave at 0 to let Claude decide the optimal number"
         )
 
+        regenerate_fresh = st.checkbox(
+            "🔄 Regenerate fresh",
+            value=False,
+            help="Ask Claude again instead of reusing the answer to an identical earlier request"
+        )
+
         # API Key input (check Streamlit secrets first, then .env)
         api_key = None
 
@@ -309,52 +325,61 @@ Example for business:
         elif not api_key:
             st.error("⚠️ Please enter your Anthropic API key or add it to .env file")
         else:
-            with st.spinner("🤖 Claude is analyzing your content and creating slides..."):
-                try:
-                    # Generate presentation with AI
-                    config = generate_with_ai(
+            try:
+                # Slides stream in from Claude and each one is rendered as soon as it arrives;
+                # st.status closes in the error state if either step raises
+                with st.status("🤖 Claude is analyzing your content and creating slides...", expanded=True) as status:
+                    slides = ai_generator_for(api_key).stream_slides(
                         topic=topic,
                         content=content,
-                        theme=selected_theme,
                         num_slides=num_slides_ai if num_slides_ai > 0 else None,
                         presentation_type=presentation_type,
-                        api_key=api_key
+                        fresh=regenerate_fresh
                     )
+                    generated = []
+                    progress = st.progress(0.0)
+
+                    def track(slides):
+                        for slide in slides:
+                            generated.append(slide)
+                            expected = max(num_slides_ai, len(generated) + 1)
+                            status.update(label=f"🎨 Rendering slide {len(generated)}: {slide.get('title', 'N/A')}")
+                            progress.progress(min(len(generated) / expected, 1.0))
+                            st.write(f"**Slide {len(generated)}:** {slide.get('type', 'content').title()} - {slide.get('title', 'N/A')}")
+                            yield slide
 
                     # Create the presentation
-                    result = create_presentation(config)
-
-                    st.success("✅ AI-powered presentation created successfully!")
-
-                    # Show what was generated
-                    st.info(f"📊 Generated {len(config['slides_content'])} slides with speaker notes")
-
-                    # Download button
-                    if os.path.exists(result['filepath']):
-                        with open(result['filepath'], 'rb') as f:
-                            st.download_button(
-                                label="📥 Download AI-Generated Presentation",
-                                data=f,
-                                file_name=f"slidecraft_ai_{topic.lower().replace(' ', '_')[:30]}_{datetime.now().strftime('%Y%m%d')}.pptx",
-                                mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                                type="primary"
-                            )
+                    result = create_presentation({'theme': selected_theme, 'slides_content': track(slides)}, output='bytes')
+                    progress.progress(1.0)
+                    status.update(label=f"✅ {len(generated)} slides generated and rendered", state="complete", expanded=False)
+
+                st.success("✅ AI-powered presentation created successfully!")
+
+                # Show what was generated
+                st.info(f"📊 Generated {len(generated)} slides with speaker notes")
+
+                # Download button
+                st.download_button(
+                    label="📥 Download AI-Generated Presentation",
+                    data=result['data'],
+                    file_name=f"slidecraft_ai_{topic.lower().replace(' ', '_')[:30]}_{datetime.now().strftime('%Y%m%d')}.pptx",
+                    mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+                    type="primary"
+                )
 
-                        # Show preview of generated structure
-                        with st.expander("📋 View Generated Structure"):
-                            for i, slide in enumerate(config['slides_content'], 1):
-                                st.write(f"**Slide {i}:** {slide.get('type', 'content').title()} - {slide.get('title', 'N/A')}")
+                # Show preview of generated structure
+                with st.expander("📋 View Generated Structure"):
+                    for i, slide in enumerate(generated, 1):
+                        st.write(f"**Slide {i}:** {slide.get('type', 'content').title()} - {slide.get('title', 'N/A')}")
 
-                        st.info(f"💡 **Pro Tip:** The AI added comprehensive speaker notes to help you present. Open in PowerPoint to view them.")
-                    else:
-                        st.error("Presentation file not found. Please try again.")
+                st.info(f"💡 **Pro Tip:** The AI added comprehensive speaker notes to help you present. Open in PowerPoint to view them.")
 
-                except ValueError as ve:
-                    st.error(f"⚠️ Error: {str(ve)}")
-                    st.caption("Check that your API key is valid and you have credits available.")
-                except Exception as e:
-                    st.error(f"❌ Error generating presentation: {str(e)}")
-                    st.exception(e)
+            except ValueError as ve:
+                st.error(f"⚠️ Error: {str(ve)}")
+                st.caption("Check that your API key is valid and you have credits available.")
+            except Exception as e:
+                st.error(f"❌ Error generating presentation: {str(e)}")
+                st.exception(e)
 
 elif mode == "Quick Create":
     st.header("✨ Quick Create")
@@ -543,24 +568,20 @@ elif mode == "Quick Create":
                         'slides_content': slides_content
                     }
 
-                    result = create_presentation(config)
+                    result = create_presentation(config, output='bytes')
 
                     st.success("✅ Presentation created successfully!")
 
                     # Download button
-                    if os.path.exists(result['filepath']):
-                        with open(result['filepath'], 'rb') as f:
-                            st.download_button(
-                                label="📥 Download Presentation",
-                                data=f,
-                                file_name=f"slidecraft_{topic.lower().replace(' ', '_')[:30]}_{datetime.now().strftime('%Y%m%d')}.pptx",
-                                mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                                type="primary"
-                            )
+                    st.download_button(
+                        label="📥 Download Presentation",
+                        data=result['data'],
+                        file_name=f"slidecraft_{topic.lower().replace(' ', '_')[:30]}_{datetime.now().strftime('%Y%m%d')}.pptx",
+                        mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+                        type="primary"
+                    )
 
-                        st.info(f"💡 **Tip:** Open in PowerPoint or Google Slides. Contains {len(slides_content)} slides with speaker notes.")
-                    else:
-                        st.error("Presentation file not found. Please try again.")
+                    st.info(f"💡 **Tip:** Open in PowerPoint or Google Slides. Contains {len(slides_content)} slides with speaker notes.")
 
                 except ValueError as ve:
                     st.error(f"⚠️ Validation error: {str(ve)}")
@@ -733,24 +754,20 @@ elif mode == "Template-Based":
                             'slides_content': slides_content
                         }
 
-                        result = create_presentation(config)
+                        result = create_presentation(config, output='bytes')
 
                         st.success("✅ Presentation created successfully!")
 
                         # Download button
-                        if os.path.exists(result['filepath']):
-                            with open(result['filepath'], 'rb') as f:
-                                st.download_button(
-                                    label="📥 Download Presentation",
-                                    data=f,
-                                    file_name=f"slidecraft_{template_id}_{datetime.now().strftime('%Y%m%d')}.pptx",
-                                    mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                                    type="primary"
-                                )
-
-                            st.info(f"💡 **Tip:** Contains {len(slides_content)} slides with speaker notes. Theme: {template.get('theme', selected_theme)}")
-                        else:
-                            st.error("Presentation file not found. Please try again.")
+                        st.download_button(
+                            label="📥 Download Presentation",
+                            data=result['data'],
+                            file_name=f"slidecraft_{template_id}_{datetime.now().strftime('%Y%m%d')}.pptx",
+                            mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+                            type="primary"
+                        )
+
+                        st.info(f"💡 **Tip:** Contains {len(slides_content)} slides with speaker notes. Theme: {template.get('theme', selected_theme)}")
 
                     except ValueError as ve:
                         st.error(f"⚠️ Validation error: {str(ve)}")
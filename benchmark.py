@@ -0,0 +1,633 @@
+"""
+SlideCraft Benchmark - reproducible rendering timings
+Covers every slide type, theme, library template, BrandKit with/without logo
+and deck sizes from 5 to 5,000 slides. Runs offline: the Claude client is stubbed.
+
+    python benchmark.py                         # full suite -> benchmark_results.json
+    python benchmark.py --quick                 # small decks only
+    python benchmark.py --only theme --sizes 50 # one scenario group
+    python benchmark.py --compare old.json new.json
+    python benchmark.py --memory-check 3000     # low-memory build must stay under --ceiling-mb
+    python benchmark.py --only startup          # cold import time of the entry modules
+    python benchmark.py --stress 64             # concurrent builds in threads and forked workers
+    python benchmark.py --ai-pool 200           # pooled vs per-call Claude clients on a local mock server
+    python benchmark.py --ai-rate-limit 120     # request scheduler against a mock server that returns 429s
+
+Each scenario runs in a fresh interpreter so peak RSS is its own.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import re
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+SIZES = [5, 50, 500, 5000]
+QUICK_SIZES = [5, 50]
+
+# Entry modules timed by the startup group, and the dependencies they should not pull in eagerly
+IMPORT_MODULES = ['slidecraft_v5', 'slidecraft_batch', 'ai_generator']
+HEAVY_MODULES = ('pptx', 'PIL', 'lxml', 'anthropic')
+
+# One representative slide per SlideFactory type
+SAMPLE_SLIDES = {
+    'title': {'type': 'title', 'title': 'Quarterly Business Review', 'subtitle': 'Q3 2025\nFinance & Operations',
+              'notes': 'Welcome everyone and set the agenda.'},
+    'content': {'type': 'content', 'title': 'Key Highlights', 'bullets': [
+        'Revenue grew 18% year over year, ahead of plan',
+        'Two new enterprise customers signed in the quarter',
+        'Support backlog reduced by a third since July',
+        'Hiring on track for engineering and sales',
+    ], 'notes': 'Emphasize the revenue beat.'},
+    'section': {'type': 'section', 'title': 'Financial Results', 'section_number': '02'},
+    'two_column': {'type': 'two_column', 'title': 'Before and After',
+                   'left_header': 'Before', 'left_items': ['Manual reports', 'Weekly syncs', 'Siloed data'],
+                   'right_header': 'After', 'right_items': ['Live dashboards', 'Async updates', 'Shared metrics'],
+                   'notes': 'Walk through each pair.'},
+    'quote': {'type': 'quote', 'quote': 'The best way to predict the future is to create it.',
+              'attribution': 'Peter Drucker'},
+    'stats': {'type': 'stats', 'title': 'By the Numbers', 'stats': ['18%: Revenue growth', '42: New customers',
+                                                                   '99.9%: Uptime']},
+}
+
+
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+
+def _deck(slide_types, size):
+    """`size` slides cycling through `slide_types`, each with a unique title"""
+    slides = []
+    for i in range(size):
+        slide = json.loads(json.dumps(SAMPLE_SLIDES[slide_types[i % len(slide_types)]]))
+        slide['title'] = f"{slide.get('title', '')} {i + 1}"
+        slides.append(slide)
+    return slides
+
+
+def _fill_template(template):
+    """Replace every {field} in a TEMPLATE_LIBRARY entry with sample text"""
+    def fill(value):
+        if isinstance(value, str):
+            return re.sub(r'\{(\w+)\}', lambda m: m.group(1).replace('_', ' ').title(), value)
+        if isinstance(value, list):
+            return [fill(v) for v in value]
+        if isinstance(value, dict):
+            return {k: fill(v) for k, v in value.items()}
+        return value
+    return fill(template['slides'])
+
+
+def scenarios(sizes, only=None):
+    """Scenario specs: plain dicts so they can be handed to a child interpreter as JSON"""
+    from slidecraft_v5 import SlideFactory, TEMPLATE_LIBRARY, ThemeGallery
+
+    all_types = list(SlideFactory.SLIDE_TYPES)
+    mid = sorted(sizes)[len(sizes) // 2]
+    specs = []
+    for size in sizes:
+        specs.append({'group': 'size', 'name': f'mixed_{size}', 'kind': 'theme',
+                      'theme': 'software_professional', 'types': all_types, 'size': size})
+    for slide_type in all_types:
+        specs.append({'group': 'slide_type', 'name': f'type_{slide_type}', 'kind': 'theme',
+                      'theme': 'software_professional', 'types': [slide_type], 'size': mid})
+    for theme in ThemeGallery.THEMES:
+        specs.append({'group': 'theme', 'name': f'theme_{theme}', 'kind': 'theme',
+                      'theme': theme, 'types': all_types, 'size': mid})
+    for template_id in TEMPLATE_LIBRARY:
+        specs.append({'group': 'template', 'name': f'template_{template_id}', 'kind': 'template',
+                      'template': template_id})
+    for logo in (False, True):
+        specs.append({'group': 'brand_kit', 'name': f"brand_kit_{'logo' if logo else 'no_logo'}",
+                      'kind': 'brand_kit', 'logo': logo, 'types': all_types, 'size': mid})
+    specs.append({'group': 'ai', 'name': 'ai_stubbed', 'kind': 'ai', 'size': min(mid, 50)})
+    if only:
+        specs = [s for s in specs if s['group'] in only]
+    return specs
+
+
+def _config(spec, workdir):
+    from slidecraft_v5 import BrandKit, TEMPLATE_LIBRARY
+
+    if spec['kind'] == 'theme':
+        return {'theme': spec['theme'], 'slides_content': _deck(spec['types'], spec['size'])}
+    if spec['kind'] == 'template':
+        template = TEMPLATE_LIBRARY[spec['template']]
+        return {'theme': template['theme'], 'slides_content': _fill_template(template)}
+    if spec['kind'] == 'brand_kit':
+        logo_path = None
+        if spec['logo']:
+            from PIL import Image, ImageDraw
+            logo_path = os.path.join(workdir, 'logo.png')
+            img = Image.new('RGBA', (2400, 1200), (0, 0, 0, 0))
+            ImageDraw.Draw(img).ellipse((100, 100, 2300, 1100), fill=(17, 34, 51, 255))
+            img.save(logo_path)
+        brand_kit = BrandKit(name='Bench Co', logo_path=logo_path, primary_colors=['#112233', '#445566'],
+                             secondary_colors=['#778899', '#AABBCC'])
+        return {'brand_kit': brand_kit, 'slides_content': _deck(spec['types'], spec['size'])}
+    raise ValueError(f"Unknown scenario kind: {spec['kind']}")
+
+
+class _StubMessages:
+    def create(self, **kwargs):
+        slides = _deck(list(SAMPLE_SLIDES), _StubAnthropic.size)
+        text = 'Here is your presentation:\n' + json.dumps(slides)
+        return type('Message', (), {'content': [type('Block', (), {'text': text})()]})()
+
+
+class _StubAnthropic:
+    """Offline stand-in for anthropic.Anthropic returning a canned slide array"""
+
+    size = 10
+
+    def __init__(self, **kwargs):
+        self.messages = _StubMessages()
+
+
+def _ai_config(spec):
+    import anthropic
+    import ai_generator
+
+    _StubAnthropic.size = spec['size']
+    anthropic.Anthropic = _StubAnthropic
+    return ai_generator.generate_with_ai(topic='Benchmark', content='Offline benchmark run',
+                                         api_key='offline-benchmark')
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def run_one(spec, repeat, engine=None, phases=False):
+    """Time one scenario in this process; returns the result record"""
+    from slidecraft_v5 import create_presentation, preload
+
+    preload()  # startup cost is measured by the startup group, not per scenario
+    with tempfile.TemporaryDirectory() as workdir:
+        # Inputs (and the stubbed AI module) are prepared outside the timed region
+        if spec['kind'] == 'ai':
+            import anthropic, ai_generator  # noqa: F401,E401
+        else:
+            prepared = _config(spec, workdir)
+
+        timings, size, slides, breakdown = [], 0, 0, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                config = _ai_config(spec) if spec['kind'] == 'ai' else dict(prepared)
+                if engine:
+                    config['engine'] = engine
+                if phases:
+                    config['timing'] = True
+                built = create_presentation(config, output='bytes')
+            elapsed = time.perf_counter() - started
+            if not timings or elapsed < min(timings):
+                breakdown = built.get('timings')
+            timings.append(elapsed)
+            data = built['data']
+            size, slides = len(data), len(config['slides_content'])
+
+    best = min(timings)
+    result = dict(spec, slides=slides, seconds=round(best, 4), per_slide_ms=round(best / max(slides, 1) * 1000, 3),
+                  runs=[round(t, 4) for t in timings], output_bytes=size, peak_rss_mb=round(_peak_rss_mb(), 1))
+    if breakdown is not None:
+        result['phases'] = breakdown
+    return result
+
+
+def memory_check(size, ceiling_mb, engine=None, window=True, rss_ceiling_mb=None):
+    """Build a `size`-slide deck with config['low_memory']; True if both the traced peak stays under
+    `ceiling_mb` and the RSS growth during the build stays under `rss_ceiling_mb` (default: 2x ceiling_mb).
+
+    tracemalloc sees Python allocations only; lxml and zlib allocate in C, which only RSS shows.
+    """
+    rss_ceiling_mb = 2 * ceiling_mb if rss_ceiling_mb is None else rss_ceiling_mb
+    from slidecraft_v5 import SlideFactory, create_presentation
+
+    config = {'theme': 'software_professional', 'slides_content': _deck(list(SlideFactory.SLIDE_TYPES), size),
+              'low_memory': window}
+    if engine:
+        config['engine'] = engine
+    with tempfile.TemporaryDirectory() as workdir, contextlib.redirect_stdout(io.StringIO()):
+        # Warm the per-process caches (fonts, blueprints, templates) outside the measurement
+        create_presentation(dict(config, slides_content=config['slides_content'][:12]), output='bytes')
+        rss_before = _rss_mb()
+        tracemalloc.start()
+        started = time.perf_counter()
+        create_presentation(config, output=os.path.join(workdir, 'deck.pptx'))
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+        rss_growth = _peak_rss_mb() - rss_before
+
+    ok = peak <= ceiling_mb and rss_growth <= rss_ceiling_mb
+    print(f"{'✅' if ok else '✗'} {size} slides in {elapsed:.1f}s: traced peak {peak:.1f} MB "
+          f"(ceiling {ceiling_mb} MB), RSS growth {rss_growth:.1f} MB (ceiling {rss_ceiling_mb} MB), "
+          f"peak RSS {_peak_rss_mb():.1f} MB")
+    return ok
+
+
+def _stress_config(i, workdir):
+    """Build `i` of the stress check: its own theme, engine and a title that names it"""
+    from slidecraft_v5 import SlideFactory, ThemeGallery
+
+    themes = sorted(ThemeGallery.THEMES)
+    slides = _deck(list(SlideFactory.SLIDE_TYPES), 12 + i % 5)
+    slides[0] = dict(slides[0], type='title', title=f'Stress build {i}')
+    return {'theme': themes[i % len(themes)], 'slides_content': slides, 'output_dir': workdir,
+            'engine': 'stream' if i % 3 == 0 else 'pptx', 'low_memory': 4 if i % 3 == 1 else False,
+            'notes_sidecar': 'md' if i % 4 == 0 else None}
+
+
+def _stress_build(args):
+    from slidecraft_v5 import create_presentation
+
+    i, workdir = args
+    result = create_presentation(_stress_config(i, workdir))
+    return i, result['filepath'], os.getpid()
+
+
+def stress_check(builds, workers=8):
+    """Run `builds` builds at once, half on threads and half in forked workers, all writing
+    timestamped files into one directory; True if every deck is distinct and intact."""
+    from pptx import Presentation
+    from slidecraft_v5 import ThemeGallery, preload
+
+    preload()
+    themes_before = {k: (dict(t.colors), dict(t.fonts)) for k, t in ThemeGallery.THEMES.items()}
+    with tempfile.TemporaryDirectory() as workdir:
+        jobs = [(i, workdir) for i in range(builds)]
+        started = time.perf_counter()
+        # Forking while the thread pool is mid-build is the case register_at_fork guards against
+        with ThreadPoolExecutor(workers) as threads, multiprocessing.get_context('fork').Pool(workers) as procs:
+            threaded = threads.map(_stress_build, jobs[::2])
+            forked = procs.map_async(_stress_build, jobs[1::2])
+            results = list(threaded) + forked.get()
+        elapsed = time.perf_counter() - started
+
+        problems = []
+        paths = [path for _, path, _ in results]
+        if len(set(paths)) != builds or len([n for n in os.listdir(workdir) if n.endswith('.pptx')]) != builds:
+            problems.append(f"{len(set(paths))} distinct outputs for {builds} builds")
+        for i, path, _ in results:
+            config = _stress_config(i, workdir)
+            try:
+                prs = Presentation(path)
+                title = ' '.join(s.text_frame.text for s in prs.slides[0].shapes if s.has_text_frame)
+                if len(prs.slides) != len(config['slides_content']) or f'Stress build {i}' not in title:
+                    problems.append(f"build {i}: wrong content in {os.path.basename(path)}")
+                if config['notes_sidecar'] and not os.path.exists(os.path.splitext(path)[0] + '.notes.md'):
+                    problems.append(f"build {i}: notes sidecar missing")
+            except Exception as e:
+                problems.append(f"build {i}: {type(e).__name__}: {e}")
+    if {k: (dict(t.colors), dict(t.fonts)) for k, t in ThemeGallery.THEMES.items()} != themes_before:
+        problems.append("shared themes changed during the run")
+
+    for problem in problems[:10]:
+        print(f"  ✗ {problem}")
+    ok = not problems
+    print(f"{'✅' if ok else '✗'} {builds} concurrent builds ({len({pid for *_, pid in results})} processes, "
+          f"{workers} threads) in {elapsed:.1f}s, {len(problems)} problems")
+    return ok
+
+
+def _mock_messages_server(connect_ms, requests_per_second=None, overload_every=0, latency_ms=0.0):
+    """Local HTTP/1.1 server answering POST /v1/messages with a canned slide array.
+
+    Each new connection waits connect_ms first, standing in for TCP/TLS setup to the real API.
+    Beyond requests_per_second it answers 429 with retry-after headers, and every
+    overload_every-th request gets a 529; server.counts tallies the responses.
+    """
+    import threading
+    from collections import deque
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    lock = threading.Lock()
+    recent = deque()  # times of requests accepted in the last second
+    counts = {'ok': 0, '429': 0, '529': 0}
+
+    body = json.dumps({
+        'id': 'msg_benchmark', 'type': 'message', 'role': 'assistant', 'model': 'mock',
+        'content': [{'type': 'text', 'text': json.dumps(_deck(list(SAMPLE_SLIDES), 10))}],
+        'stop_reason': 'end_turn', 'stop_sequence': None, 'usage': {'input_tokens': 1, 'output_tokens': 1},
+    }).encode('utf-8')
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def setup(self):
+            time.sleep(connect_ms / 1000)
+            super().setup()
+            # Headers and body go out as separate writes; don't let Nagle hold the body back
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            with lock:
+                now = time.monotonic()
+                while recent and now - recent[0] >= 1.0:
+                    recent.popleft()
+                served = sum(counts.values()) + 1
+                if overload_every and served % overload_every == 0:
+                    status, wait = 529, None
+                elif requests_per_second and len(recent) >= requests_per_second:
+                    status, wait = 429, recent[0] + 1.0 - now
+                else:
+                    status, wait = 200, None
+                    recent.append(now)
+                counts['ok' if status == 200 else str(status)] += 1
+            if status != 200:
+                kind = 'rate_limit_error' if status == 429 else 'overloaded_error'
+                self._reply(status, json.dumps({'type': 'error', 'error': {'type': kind, 'message': kind}}).encode(),
+                            {'retry-after': str(max(1, round(wait))), 'retry-after-ms': str(round(wait * 1000))}
+                            if wait is not None else {})
+                return
+            time.sleep(latency_ms / 1000)
+            self._reply(200, body)
+
+        def _reply(self, status, payload, headers=None):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.counts = counts
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def ai_pool_check(requests, connect_ms=20.0):
+    """p50/p95 latency of generate calls with a new client per call vs the shared pooled client"""
+    import anthropic
+    import ai_generator
+
+    server = _mock_messages_server(connect_ms)
+    os.environ['ANTHROPIC_BASE_URL'] = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        results = {}
+        for mode in ('per_call', 'pooled'):
+            ai_generator.configure_clients()  # start without open connections
+            samples = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                generator = ai_generator.AIContentGenerator('benchmark-key')
+                if mode == 'per_call':
+                    generator.client = anthropic.Anthropic(api_key='benchmark-key')
+                generator.generate_presentation_structure('Benchmark', 'Offline benchmark run')
+                samples.append((time.perf_counter() - started) * 1000)
+            samples.sort()
+            results[mode] = {'p50_ms': round(samples[len(samples) // 2], 2),
+                             'p95_ms': round(samples[int(len(samples) * 0.95) - 1], 2)}
+            print(f"  {mode:<9} p50 {results[mode]['p50_ms']:>7.2f} ms   p95 {results[mode]['p95_ms']:>7.2f} ms")
+    finally:
+        server.shutdown()
+        os.environ.pop('ANTHROPIC_BASE_URL', None)
+    print(f"{'✅' if results['pooled']['p50_ms'] < results['per_call']['p50_ms'] else '✗'} {requests} requests, "
+          f"{connect_ms:g} ms simulated connection setup")
+    return results
+
+
+def ai_rate_limit_check(requests, server_rps=20):
+    """Bursts of Claude requests against a mock API allowing server_rps requests a second.
+
+    Runs the burst without retries (the old behaviour), with retries only, and with the
+    scheduler's rate limit set to the server's; then checks lanes and tenant fairness.
+    """
+    import ai_generator
+
+    server = _mock_messages_server(0, requests_per_second=server_rps, overload_every=25, latency_ms=20)
+    os.environ['ANTHROPIC_BASE_URL'] = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def burst(scheduler, jobs):
+        """Run (lane, tenant) jobs at once; returns completion order and failures"""
+        finished, failures = [], []
+
+        def job(index, lane, tenant):
+            generator = ai_generator.AIContentGenerator('benchmark-key', scheduler=scheduler, lane=lane, tenant=tenant)
+            try:
+                generator.generate_presentation_structure('Benchmark', f'Request {index}')
+                finished.append((lane, tenant))
+            except Exception as e:  # noqa: BLE001 - counted, not raised
+                failures.append(type(e).__name__)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(len(jobs)) as pool:
+            for index, (lane, tenant) in enumerate(jobs):
+                pool.submit(job, index, lane, tenant)
+                time.sleep(0.001)  # keep submission order deterministic
+        return finished, failures, time.perf_counter() - started
+
+    ok = True
+    try:
+        ai_generator.configure_clients()
+        for name, options in (('no retries', {'requests_per_minute': None, 'max_concurrency': 64, 'max_retries': 0}),
+                              ('retries only', {'requests_per_minute': None, 'max_concurrency': 64}),
+                              ('scheduled', {'requests_per_minute': server_rps * 60, 'max_concurrency': 8})):
+            before = dict(server.counts)
+            finished, failures, elapsed = burst(ai_generator.RequestScheduler(**options), [('interactive', 'a')] * requests)
+            sent = {k: server.counts[k] - before[k] for k in before}
+            print(f"  {name:<13} {len(finished):>4}/{requests} ok  {len(failures):>4} failed  "
+                  f"{sent['429']:>4} x 429  {sent['529']:>3} x 529  {elapsed:6.2f}s")
+            ok = ok and (name == 'no retries' or not failures)
+
+        # One scheduler: tenant a floods the batch lane, tenant b queues a few batch jobs, then interactive work arrives
+        jobs = [('batch', 'a')] * 40 + [('batch', 'b')] * 8 + [('interactive', 'c')] * 8
+        finished, failures, elapsed = burst(ai_generator.RequestScheduler(requests_per_minute=server_rps * 60,
+                                                                          max_concurrency=4), jobs)
+
+        def median_position(lane, tenant):
+            positions = [i for i, job in enumerate(finished) if job == (lane, tenant)]
+            return positions[len(positions) // 2] if positions else None
+
+        positions = {f"{lane}/{tenant}": median_position(lane, tenant)
+                     for lane, tenant in (('interactive', 'c'), ('batch', 'b'), ('batch', 'a'))}
+        print(f"  median completion position: {positions}  ({len(failures)} failed, {elapsed:.2f}s)")
+        ok = ok and not failures and positions['interactive/c'] < positions['batch/b'] < positions['batch/a']
+    finally:
+        server.shutdown()
+        os.environ.pop('ANTHROPIC_BASE_URL', None)
+    print(f"{'✅' if ok else '✗'} scheduler against a {server_rps} req/s mock API")
+    return ok
+
+
+def import_times(repeat):
+    """Cold import cost of each entry module, best of `repeat` fresh interpreters"""
+    results = []
+    for module in IMPORT_MODULES:
+        best, heavy = None, []
+        probe = f"import sys, {module}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        for _ in range(repeat):
+            proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', probe], capture_output=True, text=True,
+                                  cwd=os.path.dirname(os.path.abspath(__file__)))
+            if proc.returncode != 0:
+                best = None
+                break
+            # importtime lines: "import time: self [us] | cumulative | name", top level indented by one space
+            us = next(int(line.split('|')[1]) for line in proc.stderr.splitlines()
+                      if line.count('|') == 2 and line.split('|')[2] == f' {module}')
+            best = us if best is None else min(best, us)
+            heavy = proc.stdout.split()
+        if best is None:
+            results.append({'module': module, 'error': proc.stderr.strip().splitlines()[-1]})
+            print(f"  ✗ import {module}: {results[-1]['error']}")
+            continue
+        results.append({'module': module, 'import_ms': round(best / 1000, 2), 'heavy_imports': heavy})
+        print(f"  import {module:<29} {best / 1000:>8.1f} ms  loads: {', '.join(heavy) or '-'}")
+    return results
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _rss_mb():
+    """Current resident set size; falls back to the peak where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return _peak_rss_mb()
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_suite(sizes, repeat, only=None, engine=None, phases=False):
+    startup = import_times(repeat) if not only or 'startup' in only else []
+    results = []
+    for spec in scenarios(sizes, only):
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--run-one', json.dumps(spec),
+             '--repeat', str(repeat)] + (['--engine', engine] if engine else []) + (['--phases'] if phases else []),
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        if proc.returncode != 0:
+            result = dict(spec, error=proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'failed')
+            print(f"  ✗ {spec['name']}: {result['error']}")
+        else:
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(f"  {result['name']:<36} {result['slides']:>5} slides  {result['seconds']:>8.3f}s  "
+                  f"{result['per_slide_ms']:>7.2f} ms/slide  {result['peak_rss_mb']:>7.1f} MB  "
+                  f"{result['output_bytes'] / 1024:>8.0f} KB")
+            for name, phase in list(result.get('phases', {}).items())[:3]:
+                print(f"      {name:<32} {phase['total_ms']:>10.1f} ms  x{phase['count']}")
+        results.append(result)
+    return {
+        'commit': _git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'engine': engine or 'pptx',
+        'repeat': repeat,
+        'startup': startup,
+        'results': results,
+    }
+
+
+def compare(old_path, new_path):
+    """Print per-scenario changes between two result files"""
+    with open(old_path) as f:
+        old = {r['name']: r for r in json.load(f)['results'] if 'error' not in r}
+    with open(new_path) as f:
+        new_report = json.load(f)
+    new = new_report['results']
+
+    with open(old_path) as f:
+        old_startup = {r['module']: r for r in json.load(f).get('startup', []) if 'error' not in r}
+    for r in new_report.get('startup', []):
+        before = old_startup.get(r['module'])
+        if before and 'error' not in r:
+            a, b = before['import_ms'], r['import_ms']
+            print(f"import {r['module']:<29} {b:>8.1f} ms ({(b - a) / a * 100 if a else 0.0:+5.1f}%)")
+
+    print(f"{'scenario':<36} {'ms/slide':>18} {'peak MB':>16} {'size KB':>18}")
+    for r in new:
+        before = old.get(r['name'])
+        if before is None or 'error' in r:
+            continue
+
+        def delta(key, scale=1.0):
+            a, b = before[key] * scale, r[key] * scale
+            pct = (b - a) / a * 100 if a else 0.0
+            return f"{b:>8.1f} ({pct:+5.1f}%)"
+        print(f"{r['name']:<36} {delta('per_slide_ms'):>18} {delta('peak_rss_mb'):>16} "
+              f"{delta('output_bytes', 1 / 1024):>18}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='SlideCraft rendering benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=None, help=f'deck sizes (default: {SIZES})')
+    parser.add_argument('--quick', action='store_true', help=f'use sizes {QUICK_SIZES}')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per scenario; the fastest is reported')
+    parser.add_argument('--only', nargs='+', help='scenario groups: startup size slide_type theme template brand_kit ai')
+    parser.add_argument('--engine', choices=['pptx', 'stream'], help='render engine (default: pptx)')
+    parser.add_argument('--phases', action='store_true', help='record a per-phase timing breakdown')
+    parser.add_argument('--output', default='benchmark_results.json', help='where to save JSON results')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two result files')
+    parser.add_argument('--memory-check', type=int, metavar='SLIDES', help='check a low-memory build stays bounded')
+    parser.add_argument('--ceiling-mb', type=float, default=32.0, help='traced peak allowed by --memory-check')
+    parser.add_argument('--rss-ceiling-mb', type=float, default=None,
+                        help='RSS growth allowed by --memory-check (default: 2x --ceiling-mb)')
+    parser.add_argument('--stress', type=int, metavar='BUILDS', help='run BUILDS concurrent builds and verify them')
+    parser.add_argument('--ai-pool', type=int, metavar='REQUESTS', help='time pooled vs per-call Claude clients')
+    parser.add_argument('--connect-ms', type=float, default=20.0, help='simulated connection setup for --ai-pool')
+    parser.add_argument('--ai-rate-limit', type=int, metavar='REQUESTS',
+                        help='burst REQUESTS Claude calls at a mock API that returns 429s')
+    parser.add_argument('--run-one', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+    if args.memory_check:
+        return 0 if memory_check(args.memory_check, args.ceiling_mb, args.engine,
+                                 rss_ceiling_mb=args.rss_ceiling_mb) else 1
+    if args.stress:
+        return 0 if stress_check(args.stress) else 1
+    if args.ai_rate_limit:
+        return 0 if ai_rate_limit_check(args.ai_rate_limit) else 1
+    if args.ai_pool:
+        results = ai_pool_check(args.ai_pool, args.connect_ms)
+        return 0 if results['pooled']['p50_ms'] < results['per_call']['p50_ms'] else 1
+    if args.run_one:
+        print(json.dumps(run_one(json.loads(args.run_one), args.repeat, args.engine, args.phases)))
+        return 0
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    print(f"🏁 SlideCraft benchmark: sizes {sizes}, {args.repeat} runs each")
+    report = run_suite(sizes, args.repeat, args.only, args.engine, args.phases)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results saved to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+SlideCraft Batch - builds many decks across a pool of worker processes
+
+    from slidecraft_batch import create_presentations
+    for result in create_presentations(configs, workers=8, output_dir='decks'):
+        print(result['status'], result['filepath'])
+
+CLI (one JSON config per line, '-' for stdin; results are printed as JSONL):
+
+    python slidecraft_batch.py configs.jsonl --workers 8 --output-dir decks
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+
+from slidecraft_v5 import ThemeGallery, create_presentation, preload
+
+# Decks submitted per worker before waiting for results; bounds memory on long JSONL streams
+IN_FLIGHT_PER_WORKER = 2
+
+_WARMUP_SLIDES = [
+    {'type': 'title', 'title': 'Warmup', 'subtitle': 'Warmup'},
+    {'type': 'content', 'title': 'Warmup', 'bullets': ['Warmup']},
+    {'type': 'section', 'title': 'Warmup', 'section_number': '01'},
+    {'type': 'two_column', 'title': 'Warmup', 'left_header': 'A', 'left_items': ['A'],
+     'right_header': 'B', 'right_items': ['B']},
+    {'type': 'quote', 'quote': 'Warmup', 'attribution': 'Warmup'},
+    {'type': 'stats', 'title': 'Warmup', 'stats': ['1: Warmup']},
+]
+
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+def _warm_worker(themes, template_paths):
+    """Pool initializer: render a throwaway deck per theme and template so the
+    first real build does not pay for imports, parsing and blueprint setup"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        for theme in themes:
+            create_presentation({'theme': theme, 'slides_content': _WARMUP_SLIDES}, output='bytes')
+        for template_path in template_paths:
+            try:
+                create_presentation({'template_path': template_path, 'slides_content': _WARMUP_SLIDES[:1]},
+                                    output='bytes')
+            except Exception:
+                pass  # reported by the deck that uses it
+
+
+def _build_one(index, config, output_path):
+    started = time.perf_counter()
+    result = {'index': index, 'name': config.get('name'), 'status': 'ok', 'filepath': None,
+              'slides': len(config.get('slides_content', [])), 'worker': os.getpid()}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            built = create_presentation(config, output=output_path)
+        result['filepath'] = built['filepath']
+        result['theme'] = built['theme']
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def _output_path(index, config, output_dir):
+    """Explicit per-deck path; the builder's timestamped names collide across workers.
+
+    The name is reduced to a safe file name inside the directory, and the index
+    keeps decks with the same name apart.
+    """
+    directory = config.get('output_dir') or output_dir
+    os.makedirs(directory, exist_ok=True)
+    name = re.sub(r'[^\w.-]+', '_', str(config.get('name') or 'deck')).strip('._') or 'deck'
+    return os.path.join(directory, f"{name}_{index:05d}.pptx")
+
+
+def _error_result(index, name, error):
+    return {'index': index, 'name': name, 'status': 'error', 'filepath': None, 'seconds': 0.0, 'error': error}
+
+
+def _new_pool(workers, templates):
+    return ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker,
+                               initargs=(ThemeGallery.list_themes(), tuple(templates)))
+
+
+# ============================================================================
+# API
+# ============================================================================
+
+def create_presentations(configs, workers=None, output_dir='outputs', templates=()):
+    """Build every config on a process pool, yielding results in completion order.
+
+    configs: any iterable of create_presentation() configs (consumed lazily).
+    A config may carry 'name' to choose its file name (saved as
+    <name>_<index>.pptx). Each result holds
+    index, name, status ('ok' or 'error'), filepath, seconds, slides, worker
+    and, on failure, error. A failing config never stops the batch: if a
+    worker process dies, the decks it took down with it are rebuilt and only
+    the deck that crashes a worker on its own is reported as an error.
+    templates: template paths to preload in every worker.
+    """
+    workers = workers or os.cpu_count() or 1
+    configs = enumerate(configs)
+    pending = {}       # future -> (index, config, isolated)
+    suspects = deque()  # (index, config) in flight when a worker died
+    preload()  # import python-pptx and Pillow once here; forked workers inherit them
+
+    pool = _new_pool(workers, templates)
+    try:
+        while True:
+            if suspects:
+                # After a worker death, rerun the decks that were in flight one at a time:
+                # the one that kills a worker alone is the culprit, the rest build normally
+                if not pending:
+                    index, config = suspects.popleft()
+                    pending[pool.submit(_build_one, index, config, _output_path(index, config, output_dir))] = (
+                        index, config, True)
+            else:
+                for index, config in islice(configs, workers * IN_FLIGHT_PER_WORKER - len(pending)):
+                    if not isinstance(config, dict):
+                        # read_jsonl passes parse errors through as strings
+                        error = config if isinstance(config, str) else f"Config must be an object, got {type(config).__name__}"
+                        yield _error_result(index, None, error)
+                        continue
+                    try:
+                        output_path = _output_path(index, config, output_dir)
+                    except OSError as e:
+                        yield _error_result(index, config.get('name'), f"{type(e).__name__}: {e}")
+                        continue
+                    try:
+                        future = pool.submit(_build_one, index, config, output_path)
+                    except BrokenProcessPool:
+                        suspects.append((index, config))
+                        break
+                    pending[future] = (index, config, False)
+            if not pending:
+                if suspects:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = _new_pool(workers, templates)
+                    continue
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                index, config, isolated = pending.pop(future)
+                try:
+                    yield future.result()
+                except BrokenProcessPool as e:
+                    broken = True
+                    if isolated:
+                        # Worker process died on this deck alone (e.g. out of memory)
+                        yield _error_result(index, config.get('name'), f"{type(e).__name__}: {e}")
+                    else:
+                        suspects.append((index, config))
+                except Exception as e:
+                    # e.g. a config that cannot be pickled, or a future cancelled under us
+                    yield _error_result(index, config.get('name'), f"{type(e).__name__}: {e}")
+            if broken:
+                # The pool cannot be reused; everything still in it is rerun
+                suspects.extend((index, config) for index, config, _ in pending.values())
+                pending.clear()
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = _new_pool(workers, templates)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def read_jsonl(stream):
+    """Yield configs from a JSONL stream; malformed lines become error placeholders"""
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield f"line {line_no}: {e}"
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build many SlideCraft decks in parallel')
+    parser.add_argument('configs', help="JSONL file with one config per line, or '-' for stdin")
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--output-dir', default='outputs', help='directory for decks without output_dir')
+    parser.add_argument('--template', action='append', default=[], help='template to preload in workers')
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.configs == '-' else open(args.configs, encoding='utf-8')
+    ok = failed = 0
+    started = time.perf_counter()
+    with source:
+        for result in create_presentations(read_jsonl(source), args.workers, args.output_dir, args.template):
+            print(json.dumps(result), flush=True)
+            if result['status'] == 'ok':
+                ok += 1
+            else:
+                failed += 1
+
+    print(f"✅ {ok} built, {failed} failed in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,448 @@
+"""
+SlideCraft Merge - joins and splits .pptx decks at the package level
+
+    from slidecraft_merge import merge_decks, split_deck
+    merge_decks(['sales.pptx', 'engineering.pptx'], 'all_hands.pptx')
+    split_deck('all_hands.pptx', ['1-10', '11-20', '21-'], output_dir='chapters')
+
+Slides are copied as XML with their relationships; nothing is re-rendered.
+Media, themes, masters and layouts are deduplicated by content hash, so decks
+built from the same theme or template share one copy. The first deck supplies
+the slide size, presentation properties and the notes master (a package holds
+only one).
+
+CLI:
+
+    python slidecraft_merge.py merge all_hands.pptx sales.pptx engineering.pptx
+    python slidecraft_merge.py split all_hands.pptx 1-10 11-20 21- --output-dir chapters
+"""
+
+import argparse
+import hashlib
+import itertools
+import os
+import posixpath
+import re
+import sys
+import time
+import zipfile
+from copy import deepcopy
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.oxml.ns import qn
+
+from slidecraft_stream import CT_NS, PackageStreamWriter
+
+# sldMasterId / sldLayoutId values share one range per presentation (ECMA-376 starts it here)
+MASTER_ID_BASE = 2147483648
+FIRST_SLIDE_ID = 256
+
+
+# ============================================================================
+# SOURCE DECKS
+# ============================================================================
+
+class SourceDeck:
+    """Read side of a .pptx: part blobs, content types and relationships, parsed on demand"""
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        self._names = set(self._zip.namelist())
+        self._rels = {}
+        types = etree.fromstring(self._zip.read('[Content_Types].xml'))
+        self._defaults = {e.get('Extension').lower(): e.get('ContentType')
+                          for e in types if e.tag == f'{{{CT_NS}}}Default'}
+        self._overrides = {e.get('PartName'): e.get('ContentType')
+                           for e in types if e.tag == f'{{{CT_NS}}}Override'}
+
+        self.presentation = next(t for _, reltype, t, _ in self.rels('/') if reltype == RT.OFFICE_DOCUMENT)
+        self.element = etree.fromstring(self.blob(self.presentation))
+        targets = {rId: t for rId, _, t, _ in self.rels(self.presentation)}
+        sld_id_lst = self.element.find(qn('p:sldIdLst'))
+        self.slides = [targets[s.get(qn('r:id'))] for s in (sld_id_lst if sld_id_lst is not None else [])]
+
+    def blob(self, partname):
+        return self._zip.read(partname.lstrip('/'))
+
+    def content_type(self, partname):
+        return self._overrides.get(partname) or self._defaults[partname.rsplit('.', 1)[-1].lower()]
+
+    def rels(self, partname):
+        """[(rId, reltype, target partname or external URL, external)] of `partname`"""
+        rels = self._rels.get(partname)
+        if rels is None:
+            directory, filename = posixpath.split(partname)
+            name = f'{directory}/_rels/{filename}.rels'.lstrip('/')
+            rels = []
+            if name in self._names:
+                for r in etree.fromstring(self._zip.read(name)):
+                    external = r.get('TargetMode') == 'External'
+                    target = r.get('Target')
+                    if not external:
+                        target = posixpath.normpath(posixpath.join(directory, target))
+                    rels.append((r.get('Id'), r.get('Type'), target, external))
+            self._rels[partname] = rels
+        return rels
+
+    def close(self):
+        self._zip.close()
+
+
+# ============================================================================
+# ASSEMBLER
+# ============================================================================
+
+class DeckAssembler:
+    """Write side: copies slides from SourceDecks into one new package.
+
+    Shared parts are copied once per distinct content. A slide master is
+    copied together with all of its layouts, so two masters only merge when
+    the whole set is identical; slide XML keeps its rIds untouched.
+    """
+
+    def __init__(self, target):
+        self._writer = PackageStreamWriter(target)
+        self._taken = set()
+        self._digests = {}       # (deck, partname) -> content digest of the part and everything it relates to
+        self._copies = {}        # content digest -> output partname
+        self._master_units = {}  # master digest -> (output master, {layout rId: output layout})
+        self._layouts = {}       # (deck, layout partname) -> output layout
+        self._masters = []       # (output master partname, sldMasterId) in presentation order
+        self._next_id = MASTER_ID_BASE
+        self._notes_master = None
+        self._slides = []
+        self._base = None
+        self._base_rels = []
+
+    def add_slides(self, deck, indexes=None):
+        """Append slides of `deck` (0-based `indexes`, default all) in order"""
+        if self._base is None:
+            self._start(deck)
+        for index in range(len(deck.slides)) if indexes is None else indexes:
+            self._add_slide(deck, deck.slides[index])
+
+    @property
+    def slide_count(self):
+        return len(self._slides)
+
+    def _start(self, deck):
+        """The first deck provides presentation.xml, its properties parts and its masters"""
+        self._base = deck
+        for rId, reltype, target, external in deck.rels(deck.presentation):
+            if reltype == RT.SLIDE:
+                continue
+            if reltype == RT.SLIDE_MASTER:
+                self._copy_master(deck, target)
+                continue
+            if not external:
+                target = self._copy(deck, target)
+                if reltype == RT.NOTES_MASTER:
+                    self._notes_master = target
+            self._base_rels.append((rId, reltype, target, external))
+
+    def _add_slide(self, deck, slide):
+        partname = self._allocate('/ppt/slides/slide%d.xml')
+        rels = []
+        for rId, reltype, target, external in deck.rels(slide):
+            if external:
+                pass
+            elif reltype == RT.SLIDE_LAYOUT:
+                target = self._layout(deck, target)
+            elif reltype == RT.NOTES_SLIDE:
+                target = self._copy_notes(deck, target, partname)
+            elif reltype == RT.SLIDE:
+                raise ValueError(f"{deck.path}: {slide} links to another slide; those links are not remapped")
+            else:
+                target = self._copy(deck, target)
+            rels.append((rId, reltype, target, external))
+        self._write(partname, deck.blob(slide), deck.content_type(slide), rels)
+        self._slides.append(partname)
+
+    def _copy_notes(self, deck, notes, slide_partname):
+        partname = self._allocate('/ppt/notesSlides/notesSlide%d.xml')
+        rels = []
+        for rId, reltype, target, external in deck.rels(notes):
+            if reltype == RT.SLIDE:
+                target = slide_partname
+            elif reltype == RT.NOTES_MASTER:
+                if self._notes_master is None:
+                    self._notes_master = self._copy(deck, target)
+                target = self._notes_master
+            elif not external:
+                target = self._copy(deck, target)
+            rels.append((rId, reltype, target, external))
+        self._write(partname, deck.blob(notes), deck.content_type(notes), rels)
+        return partname
+
+    # ------------------------------------------------------------------------
+    # Shared parts
+    # ------------------------------------------------------------------------
+
+    def _digest(self, deck, partname):
+        key = (deck, partname)
+        digest = self._digests.get(key)
+        if digest is None:
+            if key in self._digests:
+                raise ValueError(f"{deck.path}: circular relationships at {partname}")
+            self._digests[key] = None
+            h = hashlib.sha256(deck.content_type(partname).encode('utf-8') + b'\0' + deck.blob(partname))
+            for rId, reltype, target, external in deck.rels(partname):
+                h.update(f'\0{rId}\0{reltype}\0'.encode('utf-8'))
+                h.update(target.encode('utf-8') if external else self._digest(deck, target).encode('ascii'))
+            digest = self._digests[key] = h.hexdigest()
+        return digest
+
+    def _copy(self, deck, partname):
+        """Copy a part and everything it relates to, once per distinct content; returns its output partname"""
+        digest = self._digest(deck, partname)
+        out = self._copies.get(digest)
+        if out is None:
+            rels = [(rId, reltype, target if external else self._copy(deck, target), external)
+                    for rId, reltype, target, external in deck.rels(partname)]
+            out = self._copies[digest] = self._allocate_like(partname)
+            self._write(out, deck.blob(partname), deck.content_type(partname), rels)
+        return out
+
+    def _layout(self, deck, layout):
+        """Output partname of `layout`, copying its master (and sibling layouts) on first use"""
+        out = self._layouts.get((deck, layout))
+        if out is None:
+            master = next(t for _, reltype, t, _ in deck.rels(layout) if reltype == RT.SLIDE_MASTER)
+            self._copy_master(deck, master)
+            out = self._layouts[(deck, layout)]
+        return out
+
+    def _master_digest(self, deck, master):
+        """Digest of a master with its layouts; the layout -> master back-references are left out"""
+        h = hashlib.sha256(deck.blob(master))
+        for rId, reltype, target, external in deck.rels(master):
+            h.update(f'\0{rId}\0{reltype}\0'.encode('utf-8'))
+            if external:
+                h.update(target.encode('utf-8'))
+            elif reltype == RT.SLIDE_LAYOUT:
+                h.update(deck.blob(target))
+                for l_rId, l_reltype, l_target, l_external in deck.rels(target):
+                    h.update(f'\0{l_rId}\0{l_reltype}\0'.encode('utf-8'))
+                    if l_reltype != RT.SLIDE_MASTER:
+                        h.update(l_target.encode('utf-8') if l_external else self._digest(deck, l_target).encode('ascii'))
+            else:
+                h.update(self._digest(deck, target).encode('ascii'))
+        return h.hexdigest()
+
+    def _copy_master(self, deck, master):
+        digest = self._master_digest(deck, master)
+        unit = self._master_units.get(digest)
+        if unit is None:
+            out_master = self._allocate_like(master)
+            layouts, rels = {}, []
+            for rId, reltype, target, external in deck.rels(master):
+                if external:
+                    pass
+                elif reltype == RT.SLIDE_LAYOUT:
+                    layouts[rId] = self._copy_layout(deck, target, out_master)
+                    target = layouts[rId]
+                else:
+                    target = self._copy(deck, target)
+                rels.append((rId, reltype, target, external))
+            unit = self._master_units[digest] = (out_master, layouts)
+            xml, master_id = self._renumber_master(deck.blob(master))
+            self._write(out_master, xml, deck.content_type(master), rels)
+            self._masters.append((out_master, master_id))
+
+        out_master, layouts = unit
+        for rId, reltype, target, _ in deck.rels(master):
+            if reltype == RT.SLIDE_LAYOUT:
+                self._layouts[(deck, target)] = layouts[rId]
+
+    def _copy_layout(self, deck, layout, out_master):
+        rels = [(rId, reltype,
+                 out_master if reltype == RT.SLIDE_MASTER else target if external else self._copy(deck, target),
+                 external)
+                for rId, reltype, target, external in deck.rels(layout)]
+        out = self._allocate_like(layout)
+        self._write(out, deck.blob(layout), deck.content_type(layout), rels)
+        return out
+
+    def _renumber_master(self, blob):
+        """Give the master and its layouts ids no other master in the package uses"""
+        master_id = self._next_id
+        element = etree.fromstring(blob)
+        layout_ids = element.find(qn('p:sldLayoutIdLst'))
+        for offset, layout_id in enumerate(layout_ids if layout_ids is not None else [], 1):
+            layout_id.set('id', str(master_id + offset))
+        self._next_id = master_id + 1 + (len(layout_ids) if layout_ids is not None else 0)
+        return serialize_part_xml(element), master_id
+
+    # ------------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------------
+
+    def _allocate(self, tmpl):
+        partname = self._writer.next_partname(tmpl, self._taken)
+        self._taken.add(partname)
+        return partname
+
+    def _allocate_like(self, partname):
+        """A free partname shaped like `partname`, e.g. /ppt/media/image7.png -> /ppt/media/image%d.png"""
+        stem, ext = posixpath.splitext(partname)
+        if not re.search(r'\d$', stem) and partname not in self._taken:
+            self._taken.add(partname)
+            return partname
+        return self._allocate(re.sub(r'\d*$', '', stem).replace('%', '%%') + '%d' + ext)
+
+    def _write(self, partname, blob, content_type, rels):
+        self._writer.write(partname, blob, content_type)
+        if rels:
+            directory = posixpath.dirname(partname)
+            self._writer.write_rels(partname, [
+                (rId, reltype, target if external else posixpath.relpath(target, directory), external)
+                for rId, reltype, target, external in rels
+            ])
+
+    def close(self):
+        """Write presentation.xml for the collected masters and slides and finish the package"""
+        if self._base is None:
+            raise ValueError("No slides to write")
+        base = self._base
+        rels = list(self._base_rels)
+        numbers = itertools.count(max((int(r[0][3:]) for r in rels if r[0][3:].isdigit()), default=0) + 1)
+
+        def next_rId():
+            return f'rId{next(numbers)}'
+
+        prs = deepcopy(base.element)
+        master_lst = prs.find(qn('p:sldMasterIdLst'))
+        master_lst.clear()
+        for out_master, master_id in self._masters:
+            rId = next_rId()
+            rels.append((rId, RT.SLIDE_MASTER, out_master, False))
+            etree.SubElement(master_lst, qn('p:sldMasterId'), id=str(master_id)).set(qn('r:id'), rId)
+
+        if self._notes_master is not None and not any(r[1] == RT.NOTES_MASTER for r in rels):
+            # Notes came from a later deck: the base had no notes master to point at
+            rId = next_rId()
+            rels.append((rId, RT.NOTES_MASTER, self._notes_master, False))
+            notes_lst = etree.Element(qn('p:notesMasterIdLst'))
+            etree.SubElement(notes_lst, qn('p:notesMasterId')).set(qn('r:id'), rId)
+            master_lst.addnext(notes_lst)
+
+        sld_id_lst = prs.find(qn('p:sldIdLst'))
+        if sld_id_lst is None:
+            anchor = master_lst
+            for tag in ('p:notesMasterIdLst', 'p:handoutMasterIdLst'):
+                if prs.find(qn(tag)) is not None:
+                    anchor = prs.find(qn(tag))
+            sld_id_lst = etree.Element(qn('p:sldIdLst'))
+            anchor.addnext(sld_id_lst)
+        sld_id_lst.clear()
+        for slide_id, slide in enumerate(self._slides, FIRST_SLIDE_ID):
+            rId = next_rId()
+            rels.append((rId, RT.SLIDE, slide, False))
+            etree.SubElement(sld_id_lst, qn('p:sldId'), id=str(slide_id)).set(qn('r:id'), rId)
+
+        self._taken.add(base.presentation)
+        self._write(base.presentation, serialize_part_xml(prs), base.content_type(base.presentation), rels)
+
+        package_rels = []
+        for rId, reltype, target, external in base.rels('/'):
+            if not external:
+                target = base.presentation if reltype == RT.OFFICE_DOCUMENT else self._copy(base, target)
+                target = target.lstrip('/')
+            package_rels.append((rId, reltype, target, external))
+        self._writer.write_rels('/', package_rels)
+        self._writer.close()
+
+
+# ============================================================================
+# API
+# ============================================================================
+
+def merge_decks(paths, output):
+    """Concatenate the slides of every deck in `paths`, in order, into `output` (a path or binary stream)"""
+    if isinstance(output, (str, os.PathLike)) and os.path.abspath(output) in {os.path.abspath(p) for p in paths}:
+        raise ValueError(f"Output {output} is also an input")
+    decks = [SourceDeck(p) for p in paths]
+    try:
+        assembler = DeckAssembler(output)
+        for deck in decks:
+            assembler.add_slides(deck)
+        assembler.close()
+    finally:
+        for deck in decks:
+            deck.close()
+    return {'filepath': output if isinstance(output, (str, os.PathLike)) else None,
+            'decks': len(decks), 'slides': assembler.slide_count}
+
+
+def split_deck(path, ranges, output_dir=None):
+    """Write one deck per slide range, e.g. ['1-10', '11-'] (1-based, inclusive); returns a result per part"""
+    output_dir = output_dir or os.path.dirname(os.path.abspath(path))
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    deck = SourceDeck(path)
+    results = []
+    try:
+        for spec in ranges:
+            first, last = parse_range(spec, len(deck.slides))
+            output = os.path.join(output_dir, f"{stem}_{first}-{last}.pptx")
+            assembler = DeckAssembler(output)
+            assembler.add_slides(deck, range(first - 1, last))
+            assembler.close()
+            results.append({'filepath': output, 'first': first, 'last': last, 'slides': assembler.slide_count})
+    finally:
+        deck.close()
+    return results
+
+
+def parse_range(spec, count):
+    """(first, last) 1-based inclusive for '3', '3-7', '3-' or '-7' within a deck of `count` slides"""
+    if isinstance(spec, (tuple, list)):
+        first, last = spec
+    else:
+        match = re.fullmatch(r'\s*(\d*)\s*(-?)\s*(\d*)\s*', str(spec))
+        if not match or not (match.group(1) or match.group(3)):
+            raise ValueError(f"Invalid slide range: {spec!r}")
+        first = int(match.group(1)) if match.group(1) else 1
+        last = int(match.group(3)) if match.group(3) else (count if match.group(2) else first)
+    if not 1 <= first <= last <= count:
+        raise ValueError(f"Slide range {spec!r} is outside 1-{count}")
+    return first, last
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Merge or split SlideCraft decks without re-rendering')
+    commands = parser.add_subparsers(dest='command', required=True)
+    merge = commands.add_parser('merge', help='concatenate decks in order')
+    merge.add_argument('output', help='merged .pptx to write')
+    merge.add_argument('decks', nargs='+', help='input .pptx files')
+    split = commands.add_parser('split', help='write one deck per slide range')
+    split.add_argument('deck', help='input .pptx')
+    split.add_argument('ranges', nargs='+', help="1-based inclusive ranges such as 1-10, 11- or 5")
+    split.add_argument('--output-dir', default=None, help='directory for the parts (default: next to the input)')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        if args.command == 'merge':
+            result = merge_decks(args.decks, args.output)
+            print(f"✅ Merged {result['decks']} decks ({result['slides']} slides) into {args.output} "
+                  f"in {time.perf_counter() - started:.2f}s")
+        else:
+            for result in split_deck(args.deck, args.ranges, args.output_dir):
+                print(f"✓ Slides {result['first']}-{result['last']}: {result['filepath']}")
+            print(f"✅ Split in {time.perf_counter() - started:.2f}s")
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        print(f"✗ {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,781 @@
+"""
+SlideCraft Stream Engine - writes .pptx packages one slide part at a time
+Opt-in render engine for PresentationBuilderPro: config['engine'] = 'stream'
+
+The built-in slide types draw onto lightweight shape recorders that mirror the
+subset of the python-pptx API they use. Each finished slide is serialized to
+XML and written straight into the zip, so memory stays flat regardless of deck
+size. python-pptx is only used for the base package (masters, layouts, theme)
+and to prepare the placeholder skeleton of each layout once.
+"""
+
+import posixpath
+import re
+import zipfile
+from copy import deepcopy
+from io import BytesIO
+from xml.sax.saxutils import escape, quoteattr
+
+from lxml import etree
+from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.spec import default_content_types
+from pptx.oxml.ns import qn
+from pptx.parts.image import Image
+from pptx.shapes.autoshape import AutoShapeType
+from pptx.util import Emu, Length
+
+XML_HEADER = "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+RELS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+CT_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+
+# Fixed entry timestamp so identical decks produce identical archives
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+_SHAPE_STYLE = (
+    '<p:style><a:lnRef idx="1"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="3"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="2"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="lt1"/></a:fontRef></p:style>'
+    '<p:txBody><a:bodyPr rtlCol="0" anchor="ctr"/><a:lstStyle/><a:p><a:pPr algn="ctr"/></a:p></p:txBody>'
+)
+_NOTES_BODY = '<a:lstStyle/><a:p/></p:txBody>'
+_CTRL_CHARS = re.compile(r'([\x00-\x08\x0B-\x1F])')
+
+
+def _text(s):
+    """Escape run text the way python-pptx does (XML entities + _xHHHH_ control chars)"""
+    return escape(_CTRL_CHARS.sub(lambda m: '_x%04X_' % ord(m.group(1)), s))
+
+
+def _xfrm(x, y, cx, cy):
+    return f'<a:xfrm><a:off x="{int(x)}" y="{int(y)}"/><a:ext cx="{int(cx)}" cy="{int(cy)}"/></a:xfrm>'
+
+
+def _solid_fill(rgb):
+    return f'<a:solidFill><a:srgbClr val="{rgb}"/></a:solidFill>'
+
+
+# ============================================================================
+# PACKAGE WRITER
+# ============================================================================
+
+class PackageStreamWriter:
+    """Append-only OPC package writer: parts go to the zip as soon as they are written"""
+
+    def __init__(self, target):
+        self._zip = zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED)
+        self._defaults = {'rels': CT.OPC_RELATIONSHIPS, 'xml': CT.XML}
+        self._overrides = {}
+        self._counters = {}
+        self.partnames = set()
+
+    def write(self, partname, blob, content_type=None):
+        """Write `blob` as `partname`; `content_type` is registered for the content-types item"""
+        info = zipfile.ZipInfo(partname.lstrip('/'), date_time=ZIP_DATE_TIME)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o600 << 16
+        self._zip.writestr(info, blob)
+        self.partnames.add(partname)
+        if content_type is not None:
+            ext = partname.rsplit('.', 1)[-1].lower()
+            if (ext, content_type) in default_content_types:
+                self._defaults[ext] = content_type
+            else:
+                self._overrides[partname] = content_type
+
+    def write_rels(self, partname, rels):
+        """Write the .rels item for `partname` from (rId, reltype, target[, external]) tuples"""
+        directory, filename = posixpath.split(partname)
+        items = []
+        for rel in rels:
+            rId, reltype, target = rel[:3]
+            mode = ' TargetMode="External"' if len(rel) > 3 and rel[3] else ''
+            items.append(f'<Relationship Id="{rId}" Type="{reltype}" Target={quoteattr(target)}{mode}/>')
+        blob = f'{XML_HEADER}<Relationships xmlns="{RELS_NS}">{"".join(items)}</Relationships>'
+        self.write(f'{directory}/_rels/{filename}.rels', blob.encode('utf-8'))
+
+    def next_partname(self, tmpl, taken=()):
+        """Return the first unused partname for printf-style `tmpl`, e.g. '/ppt/slides/slide%d.xml'"""
+        # Partnames are only ever added, so the search resumes where the last one stopped
+        n = self._counters.get(tmpl, 1)
+        while tmpl % n in self.partnames or tmpl % n in taken:
+            n += 1
+        self._counters[tmpl] = n
+        return tmpl % n
+
+    def close(self):
+        defaults = ''.join(
+            f'<Default Extension="{ext}" ContentType="{ct}"/>' for ext, ct in sorted(self._defaults.items())
+        )
+        overrides = ''.join(
+            f'<Override PartName="{name}" ContentType="{ct}"/>' for name, ct in sorted(self._overrides.items())
+        )
+        blob = f'{XML_HEADER}<Types xmlns="{CT_NS}">{defaults}{overrides}</Types>'
+        self.write('/[Content_Types].xml', blob.encode('utf-8'))
+        self._zip.close()
+
+    def abort(self):
+        """Close the target without finishing the package (the caller discards it)"""
+        self._zip.close()
+
+
+def save_package(prs, target):
+    """Save a python-pptx Presentation through PackageStreamWriter.
+
+    Same parts as prs.save(), but with fixed zip entry timestamps, so
+    identical decks produce identical bytes.
+    """
+    package = prs.part.package
+    writer = PackageStreamWriter(target)
+    for part in package.iter_parts():
+        writer.write(part.partname, part.blob, part.content_type)
+        if part._rels:
+            writer.write(part.partname.rels_uri, part.rels.xml)
+    writer.write('/_rels/.rels', package._rels.xml)
+    writer.close()
+
+
+# ============================================================================
+# SHAPE RECORDERS
+# ============================================================================
+
+class _StreamColor:
+    def __init__(self):
+        self.rgb = None
+
+
+class _StreamFill:
+    def __init__(self):
+        self.kind = None
+        self.fore_color = _StreamColor()
+        # Accepted for API parity; python-pptx does not write fill transparency either
+        self.transparency = None
+
+    def solid(self):
+        self.kind = 'solid'
+
+    def background(self):
+        self.kind = 'none'
+
+    def xml(self):
+        if self.kind == 'none':
+            return '<a:noFill/>'
+        if self.kind == 'solid':
+            return _solid_fill(self.fore_color.rgb) if self.fore_color.rgb is not None else '<a:solidFill/>'
+        return ''
+
+
+class _StreamLine:
+    def __init__(self):
+        self.fill = _StreamFill()
+        self.width = None
+
+    @property
+    def color(self):
+        self.fill.solid()
+        return self.fill.fore_color
+
+    def xml(self):
+        if self.fill.kind is None and self.width is None:
+            return ''
+        width = f' w="{int(self.width)}"' if self.width is not None else ''
+        return f'<a:ln{width}>{self.fill.xml()}</a:ln>'
+
+
+class _StreamFont:
+    def __init__(self):
+        self.name = None
+        self.size = None
+        self.bold = None
+        self.italic = None
+        self.color = _StreamColor()
+
+    def xml(self):
+        attrs = ''
+        if self.size is not None:
+            attrs += f' sz="{Length(self.size).centipoints}"'
+        if self.bold is not None:
+            attrs += f' b="{int(bool(self.bold))}"'
+        if self.italic is not None:
+            attrs += f' i="{int(bool(self.italic))}"'
+        children = _solid_fill(self.color.rgb) if self.color.rgb is not None else ''
+        if self.name is not None:
+            children += f'<a:latin typeface={quoteattr(self.name)}/>'
+        return f'<a:defRPr{attrs}>{children}</a:defRPr>' if children else f'<a:defRPr{attrs}/>'
+
+
+class _StreamParagraph:
+    """Records the paragraph properties and runs python-pptx would write"""
+
+    def __init__(self, text=''):
+        self._runs = ''
+        self._font = None
+        self._has_ppr = False
+        self.alignment = None
+        self.space_after = None
+        self.line_spacing = None
+        self._level = 0
+        if text:
+            self.text = text
+
+    @property
+    def text(self):
+        raise AttributeError('stream paragraphs are write-only')
+
+    @text.setter
+    def text(self, text):
+        parts = re.split('\n|\v', text)
+        self._runs = '<a:br/>'.join(f'<a:r><a:t>{_text(p)}</a:t></a:r>' if p else '' for p in parts)
+
+    @property
+    def font(self):
+        self._has_ppr = True
+        if self._font is None:
+            self._font = _StreamFont()
+        return self._font
+
+    @property
+    def level(self):
+        return self._level
+
+    @level.setter
+    def level(self, level):
+        self._has_ppr = True
+        self._level = level
+
+    def xml(self):
+        has_ppr = (self._has_ppr or self.alignment is not None
+                   or self.space_after is not None or self.line_spacing is not None)
+        if not has_ppr:
+            return f'<a:p>{self._runs}</a:p>' if self._runs else '<a:p/>'
+
+        attrs = f' lvl="{self._level}"' if self._level else ''
+        if self.alignment is not None:
+            attrs += f' algn="{PP_ALIGN(self.alignment).xml_value}"'
+        children = ''
+        if self.line_spacing is not None:
+            if isinstance(self.line_spacing, Length):
+                children += f'<a:lnSpc><a:spcPts val="{self.line_spacing.centipoints}"/></a:lnSpc>'
+            else:
+                children += f'<a:lnSpc><a:spcPct val="{int(round(self.line_spacing * 100000.0))}"/></a:lnSpc>'
+        if self.space_after is not None:
+            children += f'<a:spcAft><a:spcPts val="{Length(self.space_after).centipoints}"/></a:spcAft>'
+        if self._font is not None:
+            children += self._font.xml()
+        ppr = f'<a:pPr{attrs}>{children}</a:pPr>' if children else f'<a:pPr{attrs}/>'
+        return f'<a:p>{ppr}{self._runs}</a:p>'
+
+
+class _StreamTextFrame:
+    def __init__(self):
+        self.paragraphs = [_StreamParagraph()]
+        self.word_wrap = None
+        self.vertical_anchor = None
+
+    @property
+    def text(self):
+        raise AttributeError('stream text frames are write-only')
+
+    @text.setter
+    def text(self, text):
+        self.paragraphs = [_StreamParagraph(line) for line in text.split('\n')]
+
+    def add_paragraph(self):
+        p = _StreamParagraph()
+        self.paragraphs.append(p)
+        return p
+
+    def xml(self):
+        return ''.join(p.xml() for p in self.paragraphs)
+
+
+class _StreamAutoShape:
+    def __init__(self, shape_id, autoshape_type, x, y, cx, cy):
+        shape_type = AutoShapeType(autoshape_type)
+        self.shape_id = shape_id
+        self.name = f'{shape_type.basename} {shape_id - 1}'
+        self._geometry = (x, y, cx, cy)
+        self._prst = shape_type.prst
+        self.fill = _StreamFill()
+        self.line = _StreamLine()
+
+    def body_xml(self):
+        """Everything after the cNvPr element; identical for stamped copies"""
+        return (
+            f'<p:cNvSpPr/><p:nvPr/></p:nvSpPr><p:spPr>{_xfrm(*self._geometry)}'
+            f'<a:prstGeom prst="{self._prst}"><a:avLst/></a:prstGeom>'
+            f'{self.fill.xml()}{self.line.xml()}</p:spPr>{_SHAPE_STYLE}</p:sp>'
+        )
+
+    def xml(self):
+        return f'<p:sp><p:nvSpPr><p:cNvPr id="{self.shape_id}" name="{self.name}"/>{self.body_xml()}'
+
+
+class _StampedShape:
+    def __init__(self, shape_id, basename, body):
+        self.shape_id = shape_id
+        self.name = f'{basename} {shape_id - 1}'
+        self._body = body
+
+    def xml(self):
+        return f'<p:sp><p:nvSpPr><p:cNvPr id="{self.shape_id}" name="{self.name}"/>{self._body}'
+
+
+class _StreamTextBox:
+    def __init__(self, shape_id, x, y, cx, cy):
+        self.shape_id = shape_id
+        self.name = f'TextBox {shape_id - 1}'
+        self._geometry = (x, y, cx, cy)
+        self.text_frame = _StreamTextFrame()
+
+    def xml(self):
+        tf = self.text_frame
+        wrap = ' wrap="square"' if tf.word_wrap else ' wrap="none"'
+        anchor = f' anchor="{MSO_ANCHOR(tf.vertical_anchor).xml_value}"' if tf.vertical_anchor is not None else ''
+        return (
+            f'<p:sp><p:nvSpPr><p:cNvPr id="{self.shape_id}" name="{self.name}"/>'
+            f'<p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr><p:spPr>{_xfrm(*self._geometry)}'
+            f'<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+            f'<p:txBody><a:bodyPr{wrap}{anchor}><a:spAutoFit/></a:bodyPr><a:lstStyle/>{tf.xml()}</p:txBody></p:sp>'
+        )
+
+
+class _StreamPicture:
+    def __init__(self, shape_id, rId, desc, x, y, cx, cy):
+        self.shape_id = shape_id
+        self.name = f'Picture {shape_id - 1}'
+        self._rId = rId
+        self._desc = desc
+        self._geometry = (x, y, cx, cy)
+
+    def xml(self):
+        return (
+            f'<p:pic><p:nvPicPr><p:cNvPr id="{self.shape_id}" name="{self.name}" descr={quoteattr(self._desc)}/>'
+            f'<p:cNvPicPr><a:picLocks noChangeAspect="1"/></p:cNvPicPr><p:nvPr/></p:nvPicPr>'
+            f'<p:blipFill><a:blip r:embed="{self._rId}"/><a:stretch><a:fillRect/></a:stretch></p:blipFill>'
+            f'<p:spPr>{_xfrm(*self._geometry)}<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></p:spPr></p:pic>'
+        )
+
+
+class StreamShapes:
+    """Shape collection of a stream slide; mirrors the python-pptx calls the slide types make"""
+
+    MAX_ENTRIES = 4096  # same bound as ShapeBlueprints
+    _stamps = {}
+
+    def __init__(self, slide, first_id):
+        self._slide = slide
+        self._next_id = first_id
+        self.items = []
+
+    def _add(self, shape):
+        self.items.append(shape)
+        self._next_id += 1
+        return shape
+
+    def add_shape(self, autoshape_type, left, top, width, height):
+        return self._add(_StreamAutoShape(self._next_id, autoshape_type, left, top, width, height))
+
+    def add_textbox(self, left, top, width, height):
+        return self._add(_StreamTextBox(self._next_id, left, top, width, height))
+
+    def add_picture(self, image_file, left, top, width=None, height=None):
+        rId, image = self._slide.relate_image(image_file)
+        width, height = _scale_image(image, width, height)
+        desc = image.filename or f'image.{image.ext}'  # python-pptx's generic name for file-like input
+        return self._add(_StreamPicture(self._next_id, rId, desc, left, top, width, height))
+
+    def stamp(self, key, build):
+        """Blueprint hook used by ShapeBlueprints: reuse the serialized body of an identical shape"""
+        proto = StreamShapes._stamps.get(key)
+        if proto is None:
+            shape = build()
+            if len(StreamShapes._stamps) >= StreamShapes.MAX_ENTRIES:
+                StreamShapes._stamps.clear()
+            StreamShapes._stamps[key] = (shape.name.rsplit(' ', 1)[0], shape.body_xml())
+            return shape
+        basename, body = proto
+        return self._add(_StampedShape(self._next_id, basename, body))
+
+    def xml(self):
+        return ''.join(shape.xml() for shape in self.items)
+
+
+def _scale_image(image, cx, cy):
+    """Same aspect-preserving scaling python-pptx applies in add_picture"""
+    horz_dpi, vert_dpi = image.dpi
+    px_cx, px_cy = image.size
+    native_cx, native_cy = int(914400 * px_cx / horz_dpi), int(914400 * px_cy / vert_dpi)
+    if cx and cy:
+        return cx, cy
+    if cx:
+        return cx, int(round(native_cy * float(cx) / float(native_cx)))
+    if cy:
+        return int(round(native_cx * float(cy) / float(native_cy))), cy
+    return Emu(native_cx), Emu(native_cy)
+
+
+# ============================================================================
+# STREAM SLIDES
+# ============================================================================
+
+class _StreamNotesSlide:
+    def __init__(self):
+        self.notes_text_frame = _StreamTextFrame()
+
+
+class StreamSlide:
+    def __init__(self, prs, layout_info):
+        self._prs = prs
+        self._layout = layout_info
+        self.rels = [('rId1', RT.SLIDE_LAYOUT, layout_info['partname'])]
+        self.shapes = StreamShapes(self, layout_info['next_id'])
+        self._notes_slide = None
+
+    @property
+    def notes_slide(self):
+        if self._notes_slide is None:
+            self._notes_slide = _StreamNotesSlide()
+        return self._notes_slide
+
+    def relate_image(self, image_file):
+        partname, image = self._prs._image_part(image_file)
+        for rId, reltype, target in self.rels:
+            if target == partname:
+                return rId, image
+        rId = self._next_rId()
+        self.rels.append((rId, RT.IMAGE, partname))
+        return rId, image
+
+    def _next_rId(self):
+        return f'rId{len(self.rels) + 1}'
+
+    def xml(self):
+        head, tail = self._layout['skeleton']
+        return (head + self.shapes.xml() + tail).encode('utf-8')
+
+
+class _StreamSlides:
+    def __init__(self, prs):
+        self._prs = prs
+
+    def add_slide(self, slide_layout):
+        return self._prs._add_slide(slide_layout)
+
+    def __len__(self):
+        return self._prs.slide_count
+
+
+# ============================================================================
+# STREAM PRESENTATION
+# ============================================================================
+
+class StreamPresentation:
+    """Stands in for a python-pptx Presentation while slides stream to `target`.
+
+    `base` is the python-pptx Presentation providing masters, layouts and theme
+    (the blank default or a loaded template). It never receives the new slides.
+    """
+
+    def __init__(self, base, target):
+        self._base = base
+        self._writer = PackageStreamWriter(target) if target is not None else None
+        self._layouts = {}
+        self._notes_skeleton = None
+        self._images = {}
+        self._pending = None
+        self._slides = []
+        self._reserved = {p.partname for p in base.part.package.iter_parts()}
+        self.slide_width = base.slide_width
+        self.slide_height = base.slide_height
+        self.slides = _StreamSlides(self)
+
+    @property
+    def slide_layouts(self):
+        return self._base.slide_layouts
+
+    @property
+    def slide_count(self):
+        return len(self._slides) + (self._pending is not None)
+
+    def _add_slide(self, slide_layout):
+        self._flush()
+        self._pending = StreamSlide(self, self._layout_info(slide_layout))
+        return self._pending
+
+    def _layout_info(self, slide_layout):
+        """Placeholder skeleton of `slide_layout`, prepared once via a throwaway python-pptx slide"""
+        partname = slide_layout.part.partname
+        info = self._layouts.get(partname)
+        if info is None:
+            slide = self._base.slides.add_slide(slide_layout)
+            xml = slide.part.blob.decode('utf-8')
+            head, tail = xml.split('</p:spTree>', 1)
+            info = {
+                'partname': partname,
+                'skeleton': (head, '</p:spTree>' + tail),
+                'next_id': slide.shapes._spTree.max_shape_id + 1,
+            }
+            self._drop_scratch_slide(slide)
+            self._layouts[partname] = info
+        return info
+
+    def _notes_xml(self, paragraphs):
+        """Notes slide XML: the notes-master skeleton is prepared once, then only text is stamped in"""
+        skeleton = self._notes_info()[0]
+        return skeleton.replace(_NOTES_BODY, '<a:lstStyle/>' + paragraphs + '</p:txBody>', 1).encode('utf-8')
+
+    def _notes_info(self):
+        """(notes slide skeleton, notes master partname); creates the notes master in the base if needed"""
+        if self._notes_skeleton is None:
+            slide = self._base.slides.add_slide(self._base.slide_layouts[0])
+            notes = slide.notes_slide
+            self._notes_skeleton = (notes.part.blob.decode('utf-8'), notes.part.notes_master.part.partname)
+            self._drop_scratch_slide(slide)
+        return self._notes_skeleton
+
+    def _drop_scratch_slide(self, slide):
+        sld_id_lst = self._base.slides._sldIdLst
+        for sld_id in list(sld_id_lst):
+            if self._base.part.related_part(sld_id.rId) is slide.part:
+                sld_id_lst.remove(sld_id)
+                self._base.part.drop_rel(sld_id.rId)
+
+    def _image_part(self, image_file):
+        image = Image.from_file(image_file)
+        entry = self._images.get(image.sha1)
+        if entry is None:
+            partname = self._writer.next_partname(f'/ppt/media/image%d.{image.ext}', self._reserved)
+            self._writer.write(partname, image.blob, image.content_type)
+            entry = self._images[image.sha1] = (partname, image)
+        return entry
+
+    def _flush(self):
+        """Serialize the pending slide (and its notes) into the package and forget it"""
+        slide, self._pending = self._pending, None
+        if slide is None:
+            return
+        notes = slide._notes_slide.notes_text_frame.xml() if slide._notes_slide is not None else None
+        self._write_slide(slide.xml(), slide.rels, notes)
+
+    def add_rendered(self, records, images):
+        """Append slides rendered by a StreamShard, in order; media is renumbered and deduplicated"""
+        self._flush()
+        self._append(records, images)
+
+    def _append(self, records, images):
+        media = {key: self._image_part(BytesIO(blob))[0] for key, blob in images.items()}
+        for xml, rels, notes in records:
+            rels = [rel if rel[3:] and rel[3] else rel[:2] + (media.get(rel[2], rel[2]),) for rel in rels]
+            self._write_slide(xml, rels, notes)
+
+    def _write_slide(self, xml, rels, notes):
+        """Write slide XML with rels given as (rId, reltype, target partname) or (rId, reltype, URL, True).
+
+        notes: None, the notes paragraphs XML (str), or a complete notes slide part (bytes).
+        """
+        partname = self._writer.next_partname('/ppt/slides/slide%d.xml', self._reserved)
+        directory = posixpath.dirname(partname)
+        rels = list(rels)
+
+        if notes is not None:
+            notes_name = self._writer.next_partname('/ppt/notesSlides/notesSlide%d.xml', self._reserved)
+            notes_dir = posixpath.dirname(notes_name)
+            notes_xml = notes if isinstance(notes, bytes) else self._notes_xml(notes)
+            self._writer.write(notes_name, notes_xml, CT.PML_NOTES_SLIDE)
+            self._writer.write_rels(notes_name, [
+                ('rId1', RT.NOTES_MASTER, posixpath.relpath(self._notes_info()[1], notes_dir)),
+                ('rId2', RT.SLIDE, posixpath.relpath(partname, notes_dir)),
+            ])
+            rId_nums = [int(rel[0][3:]) for rel in rels if rel[0][3:].isdigit()]
+            rels.append((f'rId{max(rId_nums, default=0) + 1}', RT.NOTES_SLIDE, notes_name))
+
+        self._writer.write(partname, xml, CT.PML_SLIDE)
+        self._writer.write_rels(partname, [
+            rel if rel[3:] and rel[3] else (rel[0], rel[1], posixpath.relpath(rel[2], directory)) for rel in rels
+        ])
+        self._slides.append(partname)
+
+    def abort(self):
+        """Stop writing a build that will not be saved"""
+        self._pending = None
+        if self._writer is not None:
+            self._writer.abort()
+
+    def save(self, file=None):
+        """Finish the package: copy the base parts and write presentation.xml with the new slides"""
+        self._flush()
+        base_part = self._base.part
+        package = base_part.package
+
+        for part in package.iter_parts():
+            if part is base_part:
+                continue
+            self._writer.write(part.partname, part.blob, part.content_type)
+            if part._rels:
+                self._writer.write(part.partname.rels_uri, part.rels.xml)
+        self._writer.write('/_rels/.rels', package._rels.xml)
+
+        rels = etree.fromstring(base_part.rels.xml)
+        rId_nums = [int(r.get('Id')[3:]) for r in rels if r.get('Id', '').startswith('rId') and r.get('Id')[3:].isdigit()]
+        next_rId = max(rId_nums, default=0) + 1
+
+        prs_elm = deepcopy(base_part._element)
+        sld_id_lst = prs_elm.find(qn('p:sldIdLst'))
+        if sld_id_lst is None:
+            sld_id_lst = etree.Element(qn('p:sldIdLst'))
+            prs_elm.find(qn('p:sldMasterIdLst')).addnext(sld_id_lst)
+        next_sld_id = max([int(s.get('id')) for s in sld_id_lst] + [255]) + 1
+
+        for partname in self._slides:
+            rId = f'rId{next_rId}'
+            next_rId += 1
+            etree.SubElement(rels, f'{{{RELS_NS}}}Relationship', Id=rId, Type=RT.SLIDE,
+                             Target=posixpath.relpath(partname, '/ppt'))
+            sld_id = etree.SubElement(sld_id_lst, qn('p:sldId'), id=str(next_sld_id))
+            sld_id.set(qn('r:id'), rId)
+            next_sld_id += 1
+
+        sld_sz = prs_elm.find(qn('p:sldSz'))
+        sld_sz.set('cx', str(int(self.slide_width)))
+        sld_sz.set('cy', str(int(self.slide_height)))
+
+        self._writer.write(base_part.partname, serialize_part_xml(prs_elm), base_part.content_type)
+        self._writer.write(base_part.partname.rels_uri, serialize_part_xml(rels))
+        self._writer.close()
+
+
+class StreamShard(StreamPresentation):
+    """Renders a run of slides in a worker process into picklable records.
+
+    Nothing is written: each slide becomes (xml, rels, notes paragraphs) with
+    image targets keyed by content hash, and StreamPresentation.add_rendered
+    assigns the final part names when the shards are assembled in order.
+    """
+
+    def __init__(self, base):
+        super().__init__(base, None)
+        self.records = []
+        self.images = {}
+
+    def _image_part(self, image_file):
+        image = Image.from_file(image_file)
+        key = f'sha1:{image.sha1}'
+        self.images.setdefault(key, image.blob)
+        return key, image
+
+    def _flush(self):
+        slide, self._pending = self._pending, None
+        if slide is None:
+            return
+        notes = slide._notes_slide.notes_text_frame.xml() if slide._notes_slide is not None else None
+        self.records.append((slide.xml(), slide.rels, notes))
+
+    def collect(self):
+        """(records, images) for StreamPresentation.add_rendered"""
+        self._flush()
+        return self.records, self.images
+
+    def save(self, file=None):
+        raise TypeError('StreamShard output is assembled by StreamPresentation.add_rendered')
+
+
+class SpoolingPresentation(StreamPresentation):
+    """Low-memory mode for the python-pptx engine.
+
+    Slides are rendered by python-pptx onto `base` as usual, but every `window`
+    finished slides are written to `target` and removed from the object graph,
+    so memory tracks the window instead of the whole deck.
+    """
+
+    def __init__(self, base, target, window):
+        super().__init__(base, target)
+        self.window = window
+
+    @property
+    def slide_count(self):
+        return len(self._slides) + len(self._base.slides)
+
+    def _add_slide(self, slide_layout):
+        if len(self._base.slides) >= self.window:
+            self._flush()
+        return self._base.slides.add_slide(slide_layout)
+
+    def _flush(self):
+        """Move every slide still held by python-pptx into the package"""
+        slides = list(self._base.slides)
+        if not slides:
+            return
+        images = {}
+        records = [_part_record(slide.part, images) for slide in slides]
+        for slide in slides:
+            self._drop_scratch_slide(slide)
+        self._append(records, images)
+
+
+def _part_record(slide_part, images):
+    """(xml, rels, notes part bytes) of a python-pptx slide part; its images are added to `images`"""
+    rels, notes = [], None
+    for rId, rel in slide_part.rels.items():
+        if rel.is_external or rel.reltype not in (RT.SLIDE_LAYOUT, RT.IMAGE, RT.NOTES_SLIDE):
+            raise ValueError(f"Low-memory builds cannot spool {rel.reltype.rsplit('/', 1)[-1]} relationships")
+        target = rel.target_part
+        if rel.reltype == RT.NOTES_SLIDE:
+            notes = target.blob
+            continue
+        if rel.reltype == RT.IMAGE:
+            images.setdefault(target.partname, target.blob)
+        rels.append((rId, rel.reltype, target.partname))
+    return slide_part.blob, rels, notes
+
+
+# ============================================================================
+# EXISTING PACKAGES
+# ============================================================================
+
+def read_slide_records(blob, indexes):
+    """Records of existing slides for StreamPresentation.add_rendered.
+
+    blob: bytes of a .pptx package; indexes: 0-based slide positions to read.
+    Returns ({index: record}, images); notes come back as complete notes parts,
+    images are keyed by their partname in the old package and external
+    relationships (hyperlinks) keep their URL as (rId, reltype, URL, True).
+    """
+    records, images = {}, {}
+    with zipfile.ZipFile(BytesIO(blob)) as z:
+        names = set(z.namelist())
+
+        def rels_of(partname):
+            directory, filename = posixpath.split(partname)
+            rels_name = f'{directory}/_rels/{filename}.rels'.lstrip('/')
+            if rels_name not in names:
+                return []
+            return [
+                (r.get('Id'), r.get('Type'), r.get('Target'), True) if r.get('TargetMode') == 'External'
+                else (r.get('Id'), r.get('Type'), posixpath.normpath(posixpath.join(directory, r.get('Target'))))
+                for r in etree.fromstring(z.read(rels_name))
+            ]
+
+        prs_rels = {rel[0]: rel[2] for rel in rels_of('/ppt/presentation.xml') if not rel[3:]}
+        prs_elm = etree.fromstring(z.read('ppt/presentation.xml'))
+        sld_id_lst = prs_elm.find(qn('p:sldIdLst'))
+        slides = [prs_rels[s.get(qn('r:id'))] for s in (sld_id_lst if sld_id_lst is not None else [])]
+
+        for index in indexes:
+            partname = slides[index]
+            rels, notes = [], None
+            for rel in rels_of(partname):
+                rId, reltype, target = rel[:3]
+                if rel[3:]:
+                    rels.append(rel)
+                    continue
+                if reltype == RT.NOTES_SLIDE:
+                    notes = z.read(target.lstrip('/'))
+                    continue
+                if reltype == RT.IMAGE:
+                    images.setdefault(target, z.read(target.lstrip('/')))
+                rels.append(rel)
+            records[index] = (z.read(partname.lstrip('/')), rels, notes)
+    return records, images
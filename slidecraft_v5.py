@@ -6,18 +6,67 @@ NEW in v5: Church templates (sermon, board, staff), larger fonts, enhanced visib
 Includes: Brand Kits, Theme Gallery (11 themes), Template Library, Smart layouts
 """
 
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-from pptx.dml.color import RGBColor
-from pptx.enum.shapes import MSO_SHAPE
-from PIL import Image, ImageDraw
 from io import BytesIO
+from copy import deepcopy
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+import contextlib
+import hashlib
+import importlib
 import os
+import tempfile
+import threading
+import time
+import weakref
 import json
+import logging
+import uuid
 from datetime import datetime
 from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+
+# ============================================================================
+# LAZY IMPORTS
+# ============================================================================
+
+_LAZY_IMPORTS = {
+    'Presentation': ('pptx', 'Presentation'),
+    'Emu': ('pptx.util', 'Emu'),
+    'Inches': ('pptx.util', 'Inches'),
+    'Length': ('pptx.util', 'Length'),
+    'Pt': ('pptx.util', 'Pt'),
+    'PP_ALIGN': ('pptx.enum.text', 'PP_ALIGN'),
+    'MSO_ANCHOR': ('pptx.enum.text', 'MSO_ANCHOR'),
+    'RGBColor': ('pptx.dml.color', 'RGBColor'),
+    'MSO_SHAPE': ('pptx.enum.shapes', 'MSO_SHAPE'),
+    'RT': ('pptx.opc.constants', 'RELATIONSHIP_TYPE'),
+    'Image': ('PIL.Image', None),
+    'ImageFont': ('PIL.ImageFont', None),
+    'ProcessPoolExecutor': ('concurrent.futures', 'ProcessPoolExecutor'),
+}
+
+
+def __getattr__(name):
+    """python-pptx and Pillow names re-exported on first access (PEP 562).
+
+    They are only needed once a deck is built, so importing this module for its
+    theme and template lists stays cheap; the builder imports them where used.
+    """
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attr = _LAZY_IMPORTS[name]
+    value = importlib.import_module(module)
+    if attr:
+        value = getattr(value, attr)
+    globals()[name] = value
+    return value
+
+
+def preload():
+    """Import everything deferred above now, e.g. in a parent process before forking workers"""
+    for module, _ in _LAZY_IMPORTS.values():
+        importlib.import_module(module)
 
 # ============================================================================
 # BRAND KIT
@@ -35,6 +84,8 @@ class BrandKit:
     
     def to_palette(self):
         """Convert to color palette"""
+        from pptx.dml.color import RGBColor
+
         def hex_to_rgb(h):
             h = h.lstrip('#')
             return RGBColor(*[int(h[i:i+2], 16) for i in (0, 2, 4)])
@@ -60,6 +111,50 @@ class BrandKit:
     def from_file(cls, path):
         with open(path) as f:
             return cls(**json.load(f))
+
+    # Logo pixels per inch at the rendered size; enough for print and high-DPI screens
+    LOGO_DPI = 300
+    _assets = {}  # (path, mtime_ns, size, height, dpi) -> prepared image bytes
+
+    def logo_asset(self, height, dpi=None):
+        """Logo bytes decoded once, downscaled to `height` (EMU) at `dpi` and recompressed"""
+        dpi = dpi or self.LOGO_DPI
+        st = os.stat(self.logo_path)
+        key = (os.path.abspath(self.logo_path), st.st_mtime_ns, st.st_size, int(height), dpi)
+        blob = BrandKit._assets.get(key)
+        if blob is None:
+            blob = BrandKit._prepare_logo(self.logo_path, height, dpi)
+            if len(BrandKit._assets) >= 64:
+                BrandKit._assets.clear()
+            BrandKit._assets[key] = blob
+        return blob
+
+    @staticmethod
+    def _prepare_logo(path, height, dpi):
+        from pptx.util import Emu
+        from PIL import Image
+
+        with open(path, 'rb') as f:
+            original = f.read()
+        img = Image.open(BytesIO(original))
+        # Photos stay JPEG; flat and transparent logos stay lossless
+        fmt = 'JPEG' if img.format == 'JPEG' else 'PNG'
+        target_h = max(1, round(Emu(height).inches * dpi))
+        resized = img.height > target_h
+        if resized:
+            if img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+                img = img.convert('RGB' if fmt == 'JPEG' else 'RGBA')
+            target_w = max(1, round(img.width * target_h / img.height))
+            img = img.resize((target_w, target_h), Image.LANCZOS)
+
+        out = BytesIO()
+        if fmt == 'JPEG':
+            img.save(out, 'JPEG', quality=90, optimize=True, dpi=(dpi, dpi))
+        else:
+            img.save(out, 'PNG', optimize=True, dpi=(dpi, dpi))
+        blob = out.getvalue()
+        # Small logos may already be tighter than our re-encode
+        return blob if resized or len(blob) < len(original) else original
     
     def save(self, path):
         with open(path, 'w') as f:
@@ -69,24 +164,50 @@ class BrandKit:
 # THEME GALLERY - 10+ Professional Themes
 # ============================================================================
 
-@dataclass
+class _FrozenDict(dict):
+    """Read-only dict: unlike MappingProxyType it pickles, deep-copies and survives asdict()"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"'{type(self).__name__}' object does not support item assignment")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+@dataclass(frozen=True)
 class Theme:
     name: str
     description: str
-    colors: Dict[str, str]
-    fonts: Dict[str, str]
+    colors: Mapping[str, str]
+    fonts: Mapping[str, str]
     style: str
+
+    def __post_init__(self):
+        # Gallery themes are shared by every build in the process, so the nested dicts are frozen too
+        object.__setattr__(self, 'colors', _FrozenDict(self.colors))
+        object.__setattr__(self, 'fonts', _FrozenDict(self.fonts))
     
     def to_palette(self):
+        from pptx.dml.color import RGBColor
+
         def hex_to_rgb(h):
             h = h.lstrip('#')
             return RGBColor(*[int(h[i:i+2], 16) for i in (0, 2, 4)])
         return {k: hex_to_rgb(v) for k, v in self.colors.items()}
 
 class ThemeGallery:
-    """10+ ready-to-use themes"""
+    """10+ ready-to-use themes (read-only; see register)"""
     
-    THEMES = {
+    THEMES = MappingProxyType({
         'software_professional': Theme(
             'Software Professional', 'Tech/enterprise',
             {'primary': '#1C3A56', 'primary_light': '#2E5470', 'secondary': '#2E86AB',
@@ -164,11 +285,18 @@ class ThemeGallery:
              'text': '#322816', 'text_light': '#78643C'},
             {'heading': 'Georgia Bold', 'body': 'Georgia'}, 'warm'
         )
-    }
+    })
+    _lock = threading.Lock()
     
     @staticmethod
     def get_theme(name):
         return ThemeGallery.THEMES.get(name, ThemeGallery.THEMES['software_professional'])
+
+    @staticmethod
+    def register(key, theme):
+        """Add a theme; the gallery is swapped for a new mapping, so running builds never see it change"""
+        with ThemeGallery._lock:
+            ThemeGallery.THEMES = MappingProxyType({**ThemeGallery.THEMES, key: theme})
     
     @staticmethod
     def list_themes():
@@ -179,21 +307,39 @@ class ThemeGallery:
 # ============================================================================
 
 class LayoutConfig:
-    WIDESCREEN_16_9 = {
-        'name': '16:9 Widescreen', 'width': Inches(13.333), 'height': Inches(7.5),
-        'margins': {'top': Inches(0.8), 'bottom': Inches(0.5), 'left': Inches(0.8), 'right': Inches(0.8)},
-        'header_height': Inches(1.0), 'content_padding': Inches(0.4), 'line_spacing': 1.3
-    }
+    WIDESCREEN_16_9 = None  # built on first use, so python-pptx is not imported with this module
     
     @staticmethod
     def get_layout(format_type='16:9'):
-        return LayoutConfig.WIDESCREEN_16_9
+        from pptx.util import Inches
+
+        if LayoutConfig.WIDESCREEN_16_9 is None:
+            LayoutConfig.WIDESCREEN_16_9 = {
+                'name': '16:9 Widescreen', 'width': Inches(13.333), 'height': Inches(7.5),
+                'margins': {'top': Inches(0.8), 'bottom': Inches(0.5), 'left': Inches(0.8), 'right': Inches(0.8)},
+                'header_height': Inches(1.0), 'content_padding': Inches(0.4), 'line_spacing': 1.3
+            }
+        # Each build gets its own copy of the shared definition
+        layout = dict(LayoutConfig.WIDESCREEN_16_9)
+        layout['margins'] = dict(layout['margins'])
+        return layout
 
 # ============================================================================
 # TEMPLATE MANAGER
 # ============================================================================
 
 class TemplateManager:
+    """Loads .pptx templates (or the blank default) through a process-wide LRU
+    of parsed packages. Builds get a deep copy of the cached prototype: XML
+    parts are copied, media and font blobs are shared between copies."""
+
+    MAX_ENTRIES = 16
+    MAX_BYTES = 256 * 1024 * 1024
+    _cache = OrderedDict()  # (path, mtime_ns, sha256) -> (prototype, layout catalog, file size)
+    _digests = {}           # (path, mtime_ns, size) -> sha256, so unchanged files are not re-hashed
+    _stats = {'hits': 0, 'misses': 0}
+    _lock = threading.Lock()
+
     def __init__(self, template_path=None):
         self.template_path = template_path
         self.prs = None
@@ -202,14 +348,87 @@ class TemplateManager:
     def load(self):
         if self.template_path and os.path.exists(self.template_path):
             try:
-                self.prs = Presentation(self.template_path)
-                self._catalog_layouts()
-                print(f"✓ Template: {self.template_path}")
+                self.prs, catalog = TemplateManager._checkout(self.template_path)
+                self.available_layouts = dict(catalog)
+                log.info("✓ Template: %s", self.template_path, extra={'event': 'template', 'template': self.template_path})
             except Exception as e:
                 raise ValueError(f"Template error: {e}")
         else:
-            self.prs = Presentation()
+            self.prs = TemplateManager.blank()
         return self.prs
+
+    @staticmethod
+    def blank():
+        """Copy of the cached blank default Presentation()"""
+        return TemplateManager._checkout(None)[0]
+
+    @staticmethod
+    def _checkout(path):
+        from pptx import Presentation
+
+        if path is None:
+            key, size = ('<default>',), 0
+        else:
+            path = os.path.abspath(path)
+            st = os.stat(path)
+            key, size = (path, st.st_mtime_ns, TemplateManager.digest(path)), st.st_size
+
+        with TemplateManager._lock:
+            entry = TemplateManager._cache.get(key)
+            if entry is not None:
+                TemplateManager._cache.move_to_end(key)
+                TemplateManager._stats['hits'] += 1
+        if entry is None:
+            prototype = Presentation(path) if path else Presentation()
+            loader = TemplateManager()
+            loader.prs = prototype
+            loader._catalog_layouts()
+            entry = (prototype, loader.available_layouts, size)
+            TemplateManager._store(key, entry)
+
+        prototype, catalog, _ = entry
+        return deepcopy(prototype), catalog
+
+    @staticmethod
+    def digest(path):
+        """SHA-256 of a file (template or logo), recomputed only when its mtime or size changes"""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stamp = (path, st.st_mtime_ns, st.st_size)
+        digest = TemplateManager._digests.get(stamp)
+        if digest is None:
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            if len(TemplateManager._digests) >= 1024:
+                TemplateManager._digests.clear()
+            TemplateManager._digests[stamp] = digest
+        return digest
+
+    @staticmethod
+    def _store(key, entry):
+        with TemplateManager._lock:
+            TemplateManager._stats['misses'] += 1
+            cache = TemplateManager._cache
+            cache[key] = entry
+            while len(cache) > 1 and (
+                len(cache) > TemplateManager.MAX_ENTRIES
+                or sum(size for _, _, size in cache.values()) > TemplateManager.MAX_BYTES
+            ):
+                cache.popitem(last=False)
+
+    @staticmethod
+    def cache_info():
+        """Hit/miss counts and current size of the template cache"""
+        with TemplateManager._lock:
+            return dict(TemplateManager._stats, entries=len(TemplateManager._cache),
+                        bytes=sum(size for _, _, size in TemplateManager._cache.values()))
+
+    @staticmethod
+    def clear_cache():
+        with TemplateManager._lock:
+            TemplateManager._cache.clear()
+            TemplateManager._digests.clear()
+            TemplateManager._stats.update(hits=0, misses=0)
     
     def _catalog_layouts(self):
         for idx, layout in enumerate(self.prs.slide_layouts):
@@ -246,11 +465,449 @@ class TemplateManager:
         
         return custom_templates
 
+# ============================================================================
+# SHAPE BLUEPRINTS
+# ============================================================================
+
+class ShapeBlueprints:
+    """Pre-styled shapes (backgrounds, header bars, cards, text boxes), built once and stamped by deep copy.
+
+    A blueprint is keyed by everything that defines the shape - type, geometry, fill,
+    outline, fonts - so each (slide type, palette, layout) combination is styled through
+    python-pptx exactly once per process and every later slide only copies its XML.
+    Text boxes keep their frame and paragraph styling; only the text is filled in.
+    """
+    MAX_ENTRIES = 4096
+    _cache = {}
+
+    @staticmethod
+    def stamp(shapes, key, build):
+        """Append the blueprint for `key` to `shapes`, calling `build()` to create it on a miss"""
+        if hasattr(shapes, 'stamp'):
+            # Render engines with their own shape representation keep their own blueprints
+            return shapes.stamp(key, build)
+
+        proto = ShapeBlueprints._cache.get(key)
+        if proto is None:
+            shape = build()
+            if len(ShapeBlueprints._cache) >= ShapeBlueprints.MAX_ENTRIES:
+                ShapeBlueprints._cache.clear()
+            ShapeBlueprints._cache[key] = deepcopy(shape._element)
+            return shape
+
+        return ShapeBlueprints._place(shapes, deepcopy(proto))
+
+    @staticmethod
+    def stamp_text(shapes, key, paragraphs, build, each=False):
+        """Append a text box holding `paragraphs`, styled like the one build() makes for `key`.
+
+        The first paragraph carries the styling (as after TextFrame.text = ...), or with
+        `each` every paragraph does (bullet lists styled paragraph by paragraph).
+        """
+        key = ('text', each) + tuple(key)
+        entry = ShapeBlueprints._cache.get(key)
+        if entry is None:
+            shape = build()
+            sp = deepcopy(shape._element)
+            p_lst = sp.txBody.p_lst
+            pPr = p_lst[0].pPr if p_lst else None
+            for p in p_lst:
+                sp.txBody.remove(p)
+            if len(ShapeBlueprints._cache) >= ShapeBlueprints.MAX_ENTRIES:
+                ShapeBlueprints._cache.clear()
+            ShapeBlueprints._cache[key] = (sp, pPr)
+            return shape
+
+        proto, pPr = entry
+        sp = deepcopy(proto)
+        for idx, text in enumerate(paragraphs):
+            p = sp.txBody.add_p()
+            if pPr is not None and (each or idx == 0):
+                p.insert(0, deepcopy(pPr))
+            p.append_text(text)
+        return ShapeBlueprints._place(shapes, sp)
+
+    @staticmethod
+    def _place(shapes, sp):
+        """Give a stamped shape the next id and python-pptx's default name, and append it"""
+        shape_id = shapes._next_shape_id
+        c_nv_pr = sp.nvSpPr.cNvPr
+        c_nv_pr.id = shape_id
+        c_nv_pr.name = f"{c_nv_pr.name.rsplit(' ', 1)[0]} {shape_id - 1}"
+        shapes._spTree.insert_element_before(sp, 'p:extLst')
+        return shapes._shape_factory(sp)
+
+    @staticmethod
+    def clear():
+        ShapeBlueprints._cache.clear()
+
+# ============================================================================
+# SPEAKER NOTES
+# ============================================================================
+
+class SpeakerNotes:
+    """Bulk notes-slide writer for python-pptx slides.
+
+    The first notes slide in a package is created the normal way (notes master,
+    cloned placeholders); its empty XML is kept as a skeleton and every later
+    notes slide is a deep copy of it, named from a counter instead of
+    python-pptx's scan of every part in the package. That state lives on the
+    package itself, so it goes away with the deck.
+    """
+
+    @staticmethod
+    def add(slide_part, text):
+        from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+        from pptx.opc.packuri import PackURI
+        from pptx.parts.slide import NotesSlidePart
+
+        package = slide_part.package
+        # [skeleton, notes master part, next number, taken names]; a module-level table keyed
+        # by package would keep every package alive through the master part
+        entry = getattr(package, '_speaker_notes', None)
+        if entry is None:
+            notes_slide = slide_part.notes_slide
+            number = int(notes_slide.part.partname.idx)
+            taken = {p.partname for p in package.iter_parts()}
+            package._speaker_notes = [deepcopy(notes_slide._element),
+                                      notes_slide.part.part_related_by(RT.NOTES_MASTER), number + 1, taken]
+            notes_slide.notes_text_frame.text = text
+            return
+
+        skeleton, master_part, number, taken = entry
+        while f'/ppt/notesSlides/notesSlide{number}.xml' in taken:
+            number += 1
+        entry[2] = number + 1
+        part = NotesSlidePart(PackURI(f'/ppt/notesSlides/notesSlide{number}.xml'), CT.PML_NOTES_SLIDE,
+                              package, deepcopy(skeleton))
+        part.relate_to(master_part, RT.NOTES_MASTER)
+        part.relate_to(slide_part, RT.SLIDE)
+        slide_part.relate_to(part, RT.NOTES_SLIDE)
+        part.notes_slide.notes_text_frame.text = text
+
+    @staticmethod
+    def document(slides_data, fmt='md'):
+        """Notes of every slide as a Markdown or JSON sidecar document"""
+        entries = [{'slide': idx, 'type': d.get('type', 'content'), 'title': d.get('title', ''),
+                    'notes': d.get('notes') or ''} for idx, d in enumerate(slides_data, 1)]
+        if fmt == 'json':
+            return json.dumps(entries, indent=2, ensure_ascii=False)
+        if fmt != 'md':
+            raise ValueError(f"Unknown notes sidecar format: {fmt}")
+        lines = ['# Speaker Notes', '']
+        for e in entries:
+            lines += [f"## {e['slide']}. {e['title'] or e['type'].replace('_', ' ').title()}", '']
+            if e['notes']:
+                lines += [e['notes'], '']
+        return '\n'.join(lines)
+
+# ============================================================================
+# SLIDE REUSE
+# ============================================================================
+
+_R_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+
+def _remap_rIds(element, rIds):
+    """Rewrite r:id / r:embed / r:link references under `element` through the {old: new} map"""
+    for e in element.iter():
+        for name, value in e.attrib.items():
+            if name.startswith(_R_NS) and value in rIds:
+                e.set(name, rIds[value])
+
+
+class SlideReuse:
+    """Renders each distinct slide of a build once and clones its repeats.
+
+    Slides are keyed by their slide hash (type, data, palette, fonts, layout,
+    template, logo), so a repeated 'Thank You' divider or filler slide is a
+    copy of the first one's finished XML. Only hashes that occur more than once
+    in `slide_hashes` are kept, as serialized records, and each is dropped after
+    its last repeat. Clones relate the same media parts.
+    """
+
+    def __init__(self, slide_hashes):
+        self.cloned = 0
+        self._records = {}
+        self._remaining = {}  # hash -> clones still to make
+        for key in slide_hashes:
+            self._remaining[key] = self._remaining.get(key, -1) + 1
+        self._remaining = {key: count for key, count in self._remaining.items() if count}
+
+    def __contains__(self, key):
+        return key in self._records
+
+    def remember(self, key, slide):
+        if key in self._remaining and key not in self._records:
+            self._records[key] = self._record(slide)
+
+    @staticmethod
+    def _record(slide):
+        """(layout, slide XML, rels) of a finished python-pptx slide; notes are added per clone"""
+        from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+        from lxml import etree
+        rels = [(rId, rel.reltype, rel.target_ref if rel.is_external else rel.target_part, rel.is_external)
+                for rId, rel in slide.part.rels.items() if rel.reltype != RT.NOTES_SLIDE]
+        return slide.slide_layout, etree.tostring(slide._element), rels
+
+    def clone(self, prs, key, notes=None):
+        """Append to `prs` a copy of the slide rendered for `key`"""
+        from pptx.oxml import parse_xml
+
+        layout, xml, rels = self._records[key]
+        self._remaining[key] -= 1
+        if not self._remaining[key]:
+            del self._records[key], self._remaining[key]
+
+        slide = prs.slides.add_slide(layout)
+        part = slide.part
+        rIds = {}
+        for rId, reltype, target, external in rels:
+            # The layout rel already exists, so relate_to just returns its rId
+            rIds[rId] = part.relate_to(target, reltype, is_external=True) if external else part.relate_to(target, reltype)
+        element = slide._element
+        for child in list(element):
+            element.remove(child)
+        for child in list(parse_xml(xml)):
+            element.append(child)
+        _remap_rIds(element, rIds)
+        if notes:
+            SpeakerNotes.add(part, notes)
+        self.cloned += 1
+
+# ============================================================================
+# TEXT FIT
+# ============================================================================
+
+class TextFitter:
+    """Picks the largest font size at which text fits its box, measured with Pillow.
+
+    Glyph advances are cached per font as fractions of an em, and a call
+    measures all of its not-yet-seen characters in one batch, so fitting
+    a slide is mostly dictionary lookups.
+    """
+
+    # Font files tried per font name: the Windows/Mac file, then a metric-compatible substitute
+    FONT_FILES = {
+        'arial': ('arial.ttf', 'Arial.ttf', 'LiberationSans-Regular.ttf'),
+        'arial bold': ('arialbd.ttf', 'Arial Bold.ttf', 'LiberationSans-Bold.ttf'),
+        'arial black': ('ariblk.ttf', 'Arial Black.ttf', 'LiberationSans-Bold.ttf'),
+        'calibri': ('calibri.ttf', 'Calibri.ttf', 'Carlito-Regular.ttf'),
+        'calibri bold': ('calibrib.ttf', 'Calibri Bold.ttf', 'Carlito-Bold.ttf'),
+        'times new roman': ('times.ttf', 'Times New Roman.ttf', 'LiberationSerif-Regular.ttf', 'DejaVuSerif.ttf'),
+        'times new roman bold': ('timesbd.ttf', 'Times New Roman Bold.ttf', 'LiberationSerif-Bold.ttf', 'DejaVuSerif-Bold.ttf'),
+        'georgia': ('georgia.ttf', 'Georgia.ttf', 'DejaVuSerif.ttf'),
+        'georgia bold': ('georgiab.ttf', 'Georgia Bold.ttf', 'DejaVuSerif-Bold.ttf'),
+    }
+    FALLBACK_FILES = {False: ('DejaVuSans.ttf',), True: ('DejaVuSans-Bold.ttf',)}
+    FALLBACK_ADVANCE = 0.6  # em; used when no font file can be loaded at all
+
+    REFERENCE_SIZE = 1000   # px; advances are measured once at this size
+    LINE_HEIGHT = 1.2       # single line spacing in ems when the font gives no metrics
+    INSET_X = 91440         # python-pptx text box insets (0.1", 0.05" in EMU)
+    INSET_Y = 45720
+
+    _fonts = {}  # (font name, bold) -> (ImageFont or None, line height in ems, {char: advance in ems})
+    _lock = threading.Lock()  # FreeType faces are not safe to use from several threads at once
+
+    @staticmethod
+    def _font(name, bold):
+        key = (name, bool(bold))
+        entry = TextFitter._fonts.get(key)
+        if entry is None:
+            font = TextFitter._load_font(name, bold)
+            line_height = TextFitter.LINE_HEIGHT
+            if hasattr(font, 'getmetrics'):
+                ascent, descent = font.getmetrics()
+                line_height = (ascent + descent) / TextFitter.REFERENCE_SIZE
+            entry = TextFitter._fonts.setdefault(key, (font, line_height, {}))
+        return entry
+
+    @staticmethod
+    def _load_font(name, bold):
+        from PIL import ImageFont
+
+        lowered = (name or '').lower()
+        bold = bold or lowered.endswith((' bold', ' black'))
+        candidates = list(TextFitter.FONT_FILES.get(lowered, ()))
+        if bold and not lowered.endswith((' bold', ' black')):
+            candidates = list(TextFitter.FONT_FILES.get(f'{lowered} bold', ())) + candidates
+        candidates.append(f"{(name or '').replace(' ', '')}.ttf")
+        candidates.extend(TextFitter.FALLBACK_FILES[bool(bold)])
+        for filename in candidates:
+            try:
+                return ImageFont.truetype(filename, TextFitter.REFERENCE_SIZE)
+            except OSError:
+                continue
+        try:
+            return ImageFont.load_default(TextFitter.REFERENCE_SIZE)
+        except (OSError, TypeError):
+            return None
+
+    @staticmethod
+    def _advances(name, bold, texts):
+        """Advance table for the font, extended with every unseen character in `texts`"""
+        font, _, advances = TextFitter._font(name, bold)
+        missing = set().union(*texts).difference(advances)
+        if missing:
+            with TextFitter._lock:
+                for ch in missing:
+                    advances[ch] = (font.getlength(ch) / TextFitter.REFERENCE_SIZE
+                                    if font is not None else TextFitter.FALLBACK_ADVANCE)
+        return advances
+
+    @staticmethod
+    def _lines(words, space, max_em):
+        """Greedy word wrap of pre-measured words; over-long words break across lines"""
+        lines, line = 1, 0.0
+        for word in words:
+            if line and line + space + word <= max_em:
+                line += space + word
+                continue
+            if line:
+                lines += 1
+            if word > max_em:
+                lines += int(word // max_em)
+                word = word % max_em
+            line = word
+        return lines
+
+    @staticmethod
+    def fit(paragraphs, font_name, width, height, max_size, min_size=None, bold=False,
+            line_spacing=1.0, space_after=0, wrap=True):
+        """Largest size (whole points, min_size..max_size) at which `paragraphs` fit the box.
+
+        height=None checks width only (auto-growing boxes). space_after may be
+        a Length or a callable size -> Length for spacing that scales.
+        min_size defaults to 12pt.
+        """
+        from pptx.util import Length, Pt
+
+        if min_size is None:
+            min_size = Pt(12)
+        paragraphs = [p for p in paragraphs if p is not None]
+        if not paragraphs:
+            return max_size
+        advances = TextFitter._advances(font_name, bold, paragraphs)
+        line_height = TextFitter._font(font_name, bold)[1] * line_spacing
+        space = advances.get(' ', TextFitter.FALLBACK_ADVANCE / 2)
+        measured = [[sum(advances[ch] for ch in word) for word in p.split()] or [0.0] for p in paragraphs]
+
+        box_w = max(1, int(width) - 2 * int(TextFitter.INSET_X))
+        box_h = int(height) - 2 * int(TextFitter.INSET_Y) if height is not None else None
+
+        def fits(size):
+            max_em = box_w / size
+            if wrap:
+                lines = sum(TextFitter._lines(words, space, max_em) for words in measured)
+            else:
+                if max(sum(words) + space * (len(words) - 1) for words in measured) > max_em:
+                    return False
+                lines = len(measured)
+            if box_h is None:
+                return True
+            gap = space_after(size) if callable(space_after) else space_after
+            used = lines * size * line_height + int(gap) * (len(measured) - 1)
+            return used <= box_h
+
+        lo, hi = int(Length(min_size).pt), int(Length(max_size).pt)
+        if fits(Pt(hi)):
+            return max_size
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if fits(Pt(mid)):
+                lo = mid
+            else:
+                hi = mid - 1
+        return Pt(lo)
+
+# ============================================================================
+# LOGGING & CONCURRENCY
+# ============================================================================
+
+log = logging.getLogger('slidecraft')
+
+
+class BuildLog(logging.LoggerAdapter):
+    """Adds the build's id to every record (with any per-call extra fields such as
+    event, index or filepath), so interleaved concurrent builds can be told apart."""
+
+    def process(self, msg, kwargs):
+        kwargs['extra'] = {**self.extra, **kwargs.get('extra', {})}
+        return msg, kwargs
+
+
+class BuildCancelled(Exception):
+    """Raised from a build whose cancel_event was set; partial stream output is removed first"""
+
+
+def _reset_locks():
+    """A fork can copy a lock another thread was holding; the child starts with fresh ones"""
+    TemplateManager._lock = threading.Lock()
+    TextFitter._lock = threading.Lock()
+    ThemeGallery._lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_locks)
+
+# ============================================================================
+# PHASE TIMING
+# ============================================================================
+
+class PhaseTimer:
+    """Collects durations and call counts per build phase.
+
+    Slide phases are named '<slide_type>.<step>' (e.g. 'content._add_content'),
+    builder phases 'build.<step>'. An optional callback(phase, seconds) sees
+    every measurement as it happens, e.g. to forward it to a metrics client.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.totals = {}
+        self.counts = {}
+
+    @classmethod
+    def from_config(cls, timing):
+        """config['timing']: falsy (off), True, a callback, or a PhaseTimer"""
+        if not timing:
+            return None
+        if isinstance(timing, cls):
+            return timing
+        if callable(timing):
+            return cls(timing)
+        return cls()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+        if self.callback:
+            self.callback(name, seconds)
+
+    def summary(self):
+        """{phase: {count, total_ms, mean_ms}}, slowest phase first"""
+        return {
+            name: {'count': self.counts[name], 'total_ms': round(total * 1000, 3),
+                   'mean_ms': round(total * 1000 / self.counts[name], 3)}
+            for name, total in sorted(self.totals.items(), key=lambda item: -item[1])
+        }
+
 # ============================================================================
 # BASE SLIDE (v4 Architecture)
 # ============================================================================
 
 class BaseSlide:
+    FRAME_STEPS = ('_add_background', '_add_brand_logo', '_add_header_bar')
+
     def __init__(self, prs, palette, layout, fonts=None, brand_kit=None):
         self.prs = prs
         self.palette = palette
@@ -259,49 +916,129 @@ class BaseSlide:
         self.brand_kit = brand_kit
         self.slide = None
     
-    def create(self, data, template_manager=None):
-        layout = template_manager.get_layout(self.slide_type) if template_manager else self.prs.slide_layouts[6]
-        self.slide = self.prs.slides.add_slide(layout)
-        
-        self._add_background()
-        self._add_brand_logo()
-        self._add_header(data)
-        self._add_content(data)
-        self._add_decorations()
-        self._add_speaker_notes(data)
-        
+    def create(self, data, template_manager=None, timer=None, theme_layouts=None):
+        """Render `data` onto a new slide; with `theme_layouts` the frame comes from the slide's layout.
+
+        With a `timer`, every step is reported to it as '<slide_type>.<step>'.
+        """
+        def phase(step):
+            return timer.phase(f'{self.slide_type}.{step}') if timer is not None else contextlib.nullcontext()
+
+        with phase('add_slide'):
+            self.slide = self.prs.slides.add_slide(self._slide_layout(template_manager, theme_layouts))
+
+        if theme_layouts is None:
+            for step in self.FRAME_STEPS:
+                with phase(step):
+                    getattr(self, step)()
+        with phase('_add_header'):
+            self._add_header(data)
+        with phase('_add_content'):
+            self._add_content(data)
+        with phase('_add_decorations'):
+            self._add_decorations()
+        with phase('_add_speaker_notes'):
+            self._add_speaker_notes(data)
+
         return self.slide
+
+    def _slide_layout(self, template_manager, theme_layouts):
+        if theme_layouts is not None:
+            return theme_layouts.get_layout(self.slide_type)
+        return template_manager.get_layout(self.slide_type) if template_manager else self.prs.slide_layouts[6]
+
+    def _add_frame(self):
+        """Shapes that depend only on the theme and slide type, never on the slide's data"""
+        for step in self.FRAME_STEPS:
+            getattr(self, step)()
+    
+    def _add_panel(self, shape_type, left, top, width, height, fill,
+                   transparency=None, outline=None, outline_width=None):
+        """Add a solid static shape, stamped from its blueprint after the first build"""
+        def build():
+            shape = self.slide.shapes.add_shape(shape_type, left, top, width, height)
+            shape.fill.solid()
+            shape.fill.fore_color.rgb = fill
+            if transparency is not None:
+                shape.fill.transparency = transparency
+            if outline is None:
+                shape.line.fill.background()
+            else:
+                shape.line.color.rgb = outline
+                shape.line.width = outline_width
+            return shape
+
+        key = (shape_type, left, top, width, height, fill, transparency, outline, outline_width)
+        return ShapeBlueprints.stamp(self.slide.shapes, key, build)
+
+    def _add_text(self, key, paragraphs, build, each=False):
+        """Add a text box stamped from its blueprint and filled with `paragraphs`.
+
+        build() adds and styles the box through python-pptx on a miss; `key` must hold
+        everything it uses except the text. With `each`, every paragraph is styled.
+        """
+        shapes = self.slide.shapes
+        if hasattr(shapes, 'stamp') or not paragraphs:
+            # The stream engine writes text boxes as strings already; an empty list has no styled paragraph
+            return build()
+        return ShapeBlueprints.stamp_text(shapes, (type(self).__name__,) + tuple(key), paragraphs, build, each)
     
     def _add_background(self):
-        bg = self.slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, self.layout['width'], self.layout['height'])
-        bg.fill.solid()
-        bg.fill.fore_color.rgb = RGBColor(255, 255, 255)
-        bg.line.fill.background()
+        from pptx.dml.color import RGBColor
+        from pptx.enum.shapes import MSO_SHAPE
+
+        self._add_panel(MSO_SHAPE.RECTANGLE, 0, 0, self.layout['width'], self.layout['height'], RGBColor(255, 255, 255))
     
     def _add_brand_logo(self):
+        from pptx.util import Inches
+        from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
         if self.brand_kit and self.brand_kit.logo_path and os.path.exists(self.brand_kit.logo_path):
             try:
-                self.slide.shapes.add_picture(
-                    self.brand_kit.logo_path,
-                    self.layout['width'] - Inches(1.5), Inches(0.2),
-                    height=Inches(0.5)
-                )
+                height = Inches(0.5)
+                blob = self.brand_kit.logo_asset(height)
+                left, top = self.layout['width'] - Inches(1.5), Inches(0.2)
+                shapes = self.slide.shapes
+                if hasattr(shapes, 'stamp'):
+                    # Stream engine: media parts are already deduplicated by hash
+                    shapes.add_picture(BytesIO(blob), left, top, height=height)
+                    return
+                # One image part per deck; skips python-pptx's scan of every part for a matching hash.
+                # Kept on the package ({logo bytes: image part}) so it is collected with the deck
+                package = self.slide.part.package
+                parts = getattr(package, '_logo_parts', None)
+                if parts is None:
+                    parts = package._logo_parts = {}
+                image_part = parts.get(blob)
+                if image_part is None:
+                    image_part, rId = self.slide.part.get_or_add_image_part(BytesIO(blob))
+                    parts[blob] = image_part
+                else:
+                    rId = self.slide.part.relate_to(image_part, RT.IMAGE)
+                shapes._add_pic_from_image_part(image_part, rId, left, top, None, height)
             except:
                 pass
     
-    def _add_header(self, data):
+    def _add_header_bar(self):
+        from pptx.enum.shapes import MSO_SHAPE
+
         if hasattr(self, 'skip_header') and self.skip_header:
             return
-        header = self.slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, self.layout['width'], self.layout['header_height'])
-        header.fill.solid()
-        header.fill.fore_color.rgb = self.palette['primary']
-        header.line.fill.background()
+        self._add_panel(MSO_SHAPE.RECTANGLE, 0, 0, self.layout['width'], self.layout['header_height'], self.palette['primary'])
+
+    def _add_header(self, data):
+        pass
     
     def _add_decorations(self):
         pass
     
     def _add_speaker_notes(self, data):
-        if data.get('notes'):
+        if not data.get('notes'):
+            return
+        if hasattr(self.slide, 'part'):
+            SpeakerNotes.add(self.slide.part, data['notes'])
+        else:
+            # Stream engine: its notes recorder already stamps a prepared skeleton
             self.slide.notes_slide.notes_text_frame.text = data['notes']
     
     def _add_content(self, data):
@@ -320,72 +1057,87 @@ class TitleSlide(BaseSlide):
     skip_header = True
     
     def _add_background(self):
-        bg_bottom = self.slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, self.layout['width'], self.layout['height'])
-        bg_bottom.fill.solid()
-        bg_bottom.fill.fore_color.rgb = self.palette['primary']
-        bg_bottom.line.fill.background()
-        
-        bg_top = self.slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, self.layout['width'], Inches(3))
-        bg_top.fill.solid()
-        bg_top.fill.fore_color.rgb = self.palette['primary_light']
-        bg_top.fill.transparency = 0.3
-        bg_top.line.fill.background()
+        from pptx.util import Inches
+        from pptx.enum.shapes import MSO_SHAPE
+
+        self._add_panel(MSO_SHAPE.RECTANGLE, 0, 0, self.layout['width'], self.layout['height'], self.palette['primary'])
+        self._add_panel(MSO_SHAPE.RECTANGLE, 0, 0, self.layout['width'], Inches(3), self.palette['primary_light'],
+                        transparency=0.3)
     
     def _add_content(self, data):
-        title_box = self.slide.shapes.add_textbox(Inches(1.5), Inches(2.0), Inches(10.3), Inches(2.0))
-        tf = title_box.text_frame
-        tf.text = data.get('title', 'Presentation Title')
-        tf.paragraphs[0].font.name = self.fonts['heading']
-        tf.paragraphs[0].font.size = Pt(66)
-        tf.paragraphs[0].font.bold = True
-        tf.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-        tf.paragraphs[0].alignment = PP_ALIGN.CENTER
-        
+        from pptx.util import Inches, Pt
+        from pptx.enum.text import PP_ALIGN
+        from pptx.dml.color import RGBColor
+
+        title = data.get('title', 'Presentation Title')
+
+        def build_title():
+            title_box = self.slide.shapes.add_textbox(Inches(1.5), Inches(2.0), Inches(10.3), Inches(2.0))
+            tf = title_box.text_frame
+            tf.text = title
+            tf.paragraphs[0].font.name = self.fonts['heading']
+            tf.paragraphs[0].font.size = Pt(66)
+            tf.paragraphs[0].font.bold = True
+            tf.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
+            tf.paragraphs[0].alignment = PP_ALIGN.CENTER
+            return title_box
+
+        self._add_text(('title', self.fonts['heading']), title.split('\n'), build_title)
+
         if data.get('subtitle'):
-            sub_box = self.slide.shapes.add_textbox(Inches(1.5), Inches(4.3), Inches(10.3), Inches(1.2))
-            sf = sub_box.text_frame
-            sf.text = data['subtitle']
-            sf.paragraphs[0].font.name = self.fonts['body']
-            sf.paragraphs[0].font.size = Pt(32)
-            sf.paragraphs[0].font.color.rgb = self.palette['accent_light']
-            sf.paragraphs[0].alignment = PP_ALIGN.CENTER
+            def build_subtitle():
+                sub_box = self.slide.shapes.add_textbox(Inches(1.5), Inches(4.3), Inches(10.3), Inches(1.2))
+                sf = sub_box.text_frame
+                sf.text = data['subtitle']
+                sf.paragraphs[0].font.name = self.fonts['body']
+                sf.paragraphs[0].font.size = Pt(32)
+                sf.paragraphs[0].font.color.rgb = self.palette['accent_light']
+                sf.paragraphs[0].alignment = PP_ALIGN.CENTER
+                return sub_box
+
+            self._add_text(('subtitle', self.fonts['body'], self.palette['accent_light']),
+                           data['subtitle'].split('\n'), build_subtitle)
 
 class ContentSlide(BaseSlide):
     slide_type = 'content'
 
     def _add_header(self, data):
-        super()._add_header(data)
-        title_box = self.slide.shapes.add_textbox(Inches(0.9), Inches(0.15), Inches(11), Inches(0.7))
-        tf = title_box.text_frame
-        tf.text = data.get('title', 'Slide Title')
-        tf.paragraphs[0].font.name = self.fonts['heading']
-        tf.paragraphs[0].font.size = Pt(44)
-        tf.paragraphs[0].font.bold = True
-        tf.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
+        from pptx.util import Inches, Pt
+        from pptx.dml.color import RGBColor
+
+        title = data.get('title', 'Slide Title')
+
+        def build():
+            title_box = self.slide.shapes.add_textbox(Inches(0.9), Inches(0.15), Inches(11), Inches(0.7))
+            tf = title_box.text_frame
+            tf.text = title
+            tf.paragraphs[0].font.name = self.fonts['heading']
+            tf.paragraphs[0].font.size = Pt(44)
+            tf.paragraphs[0].font.bold = True
+            tf.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
+            return title_box
+
+        self._add_text(('header', self.fonts['heading']), title.split('\n'), build)
 
     def _add_content(self, data):
+        from pptx.util import Emu, Inches, Pt
+        from pptx.enum.text import MSO_ANCHOR
+        from pptx.enum.shapes import MSO_SHAPE
+
         # Content background with better positioning
-        bg = self.slide.shapes.add_shape(
+        self._add_panel(
             MSO_SHAPE.ROUNDED_RECTANGLE,
             self.layout['margins']['left'], self.layout['header_height'] + Inches(0.5),
-            self.layout['width'] - self.layout['margins']['left'] - self.layout['margins']['right'], Inches(5.4)
+            self.layout['width'] - self.layout['margins']['left'] - self.layout['margins']['right'], Inches(5.4),
+            self.palette['light']
         )
-        bg.fill.solid()
-        bg.fill.fore_color.rgb = self.palette['light']
-        bg.line.fill.background()
 
         # Content text box with better spacing
-        content_box = self.slide.shapes.add_textbox(
-            self.layout['margins']['left'] + Inches(0.6), self.layout['header_height'] + Inches(0.9),
-            self.layout['width'] - self.layout['margins']['left'] - self.layout['margins']['right'] - Inches(1.2), Inches(4.8)
-        )
-        cf = content_box.text_frame
-        cf.word_wrap = True
-        cf.vertical_anchor = MSO_ANCHOR.TOP
-
+        box_w = self.layout['width'] - self.layout['margins']['left'] - self.layout['margins']['right'] - Inches(1.2)
+        box_h = Inches(4.8)
         bullets = data.get('bullets', [])
 
-        # Adjust font size based on number of bullets for better fit
+        # Bullet count sets the largest size; measured fit shrinks it for long bullets
         if len(bullets) <= 3:
             bullet_size = Pt(32)
             space_after = Pt(24)
@@ -396,232 +1148,314 @@ class ContentSlide(BaseSlide):
             bullet_size = Pt(24)
             space_after = Pt(16)
 
-        for idx, bullet in enumerate(bullets):
-            p = cf.paragraphs[0] if idx == 0 else cf.add_paragraph()
-            p.text = bullet
-            p.font.name = self.fonts['body']
-            p.font.size = bullet_size
-            p.font.color.rgb = self.palette['text']
-            p.space_after = space_after
-            p.line_spacing = 1.3
-            p.level = 0  # Ensure bullet level is set
-
-            # Add bullet point marker
-            if idx > 0 or len(bullets) > 1:
-                p.text = f"• {bullet}"
+        texts = [f"• {b}" if idx > 0 or len(bullets) > 1 else b for idx, b in enumerate(bullets)]
+        fitted = TextFitter.fit(
+            texts, self.fonts['body'], box_w, box_h, bullet_size, Pt(14), line_spacing=1.3,
+            space_after=lambda size: space_after * size / bullet_size
+        )
+        if fitted != bullet_size:
+            space_after = Emu(int(space_after * fitted / bullet_size))
+            bullet_size = fitted
+
+        left, top = self.layout['margins']['left'] + Inches(0.6), self.layout['header_height'] + Inches(0.9)
+
+        def build():
+            content_box = self.slide.shapes.add_textbox(left, top, box_w, box_h)
+            cf = content_box.text_frame
+            cf.word_wrap = True
+            cf.vertical_anchor = MSO_ANCHOR.TOP
+
+            for idx, bullet in enumerate(bullets):
+                p = cf.paragraphs[0] if idx == 0 else cf.add_paragraph()
+                p.text = bullet
+                p.font.name = self.fonts['body']
+                p.font.size = bullet_size
+                p.font.color.rgb = self.palette['text']
+                p.space_after = space_after
+                p.line_spacing = 1.3
+                p.level = 0  # Ensure bullet level is set
+
+                # Add bullet point marker
+                if idx > 0 or len(bullets) > 1:
+                    p.text = texts[idx]
+            return content_box
+
+        self._add_text(('bullets', left, top, box_w, box_h, self.fonts['body'], bullet_size, space_after,
+                        self.palette['text']), texts, build, each=True)
 
 class SectionSlide(BaseSlide):
     slide_type = 'section'
     skip_header = True
 
     def _add_background(self):
-        left = self.slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, Inches(8), self.layout['height'])
-        left.fill.solid()
-        left.fill.fore_color.rgb = self.palette['secondary']
-        left.line.fill.background()
+        from pptx.util import Inches
+        from pptx.enum.shapes import MSO_SHAPE
 
-        right = self.slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(8), 0, self.layout['width'] - Inches(8), self.layout['height'])
-        right.fill.solid()
-        right.fill.fore_color.rgb = self.palette['primary']
-        right.line.fill.background()
+        self._add_panel(MSO_SHAPE.RECTANGLE, 0, 0, Inches(8), self.layout['height'], self.palette['secondary'])
+        self._add_panel(MSO_SHAPE.RECTANGLE, Inches(8), 0, self.layout['width'] - Inches(8), self.layout['height'],
+                        self.palette['primary'])
 
     def _add_content(self, data):
+        from pptx.util import Inches, Pt
+        from pptx.dml.color import RGBColor
+
         if data.get('section_number'):
-            nb = self.slide.shapes.add_textbox(Inches(1.5), Inches(1.5), Inches(2), Inches(1))
-            nb.text_frame.text = str(data['section_number'])
-            nb.text_frame.paragraphs[0].font.size = Pt(120)
-            nb.text_frame.paragraphs[0].font.bold = True
-            nb.text_frame.paragraphs[0].font.color.rgb = self.palette['accent_light']
-
-        tb = self.slide.shapes.add_textbox(Inches(1.5), Inches(3.5), Inches(6), Inches(2))
-        tb.text_frame.text = data.get('title', 'Section')
-        tb.text_frame.word_wrap = True
-        tb.text_frame.paragraphs[0].font.name = self.fonts['heading']
-        tb.text_frame.paragraphs[0].font.size = Pt(52)
-        tb.text_frame.paragraphs[0].font.bold = True
-        tb.text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
+            number = str(data['section_number'])
+
+            def build_number():
+                nb = self.slide.shapes.add_textbox(Inches(1.5), Inches(1.5), Inches(2), Inches(1))
+                nb.text_frame.text = number
+                nb.text_frame.paragraphs[0].font.size = Pt(120)
+                nb.text_frame.paragraphs[0].font.bold = True
+                nb.text_frame.paragraphs[0].font.color.rgb = self.palette['accent_light']
+                return nb
+
+            self._add_text(('number', self.palette['accent_light']), number.split('\n'), build_number)
+
+        title = data.get('title', 'Section')
+
+        def build_title():
+            tb = self.slide.shapes.add_textbox(Inches(1.5), Inches(3.5), Inches(6), Inches(2))
+            tb.text_frame.text = title
+            tb.text_frame.word_wrap = True
+            tb.text_frame.paragraphs[0].font.name = self.fonts['heading']
+            tb.text_frame.paragraphs[0].font.size = Pt(52)
+            tb.text_frame.paragraphs[0].font.bold = True
+            tb.text_frame.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
+            return tb
+
+        self._add_text(('title', self.fonts['heading']), title.split('\n'), build_title)
 
 class TwoColumnSlide(BaseSlide):
     slide_type = 'two_column'
 
     def _add_header(self, data):
-        super()._add_header(data)
-        title_box = self.slide.shapes.add_textbox(Inches(0.9), Inches(0.15), Inches(11), Inches(0.7))
-        tf = title_box.text_frame
-        tf.text = data.get('title', 'Slide Title')
-        tf.paragraphs[0].font.name = self.fonts['heading']
-        tf.paragraphs[0].font.size = Pt(44)
-        tf.paragraphs[0].font.bold = True
-        tf.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
+        from pptx.util import Inches, Pt
+        from pptx.dml.color import RGBColor
+
+        title = data.get('title', 'Slide Title')
+
+        def build():
+            title_box = self.slide.shapes.add_textbox(Inches(0.9), Inches(0.15), Inches(11), Inches(0.7))
+            tf = title_box.text_frame
+            tf.text = title
+            tf.paragraphs[0].font.name = self.fonts['heading']
+            tf.paragraphs[0].font.size = Pt(44)
+            tf.paragraphs[0].font.bold = True
+            tf.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
+            return title_box
+
+        self._add_text(('header', self.fonts['heading']), title.split('\n'), build)
 
     def _add_content(self, data):
+        from pptx.util import Inches, Pt
+        from pptx.enum.text import MSO_ANCHOR
+        from pptx.enum.shapes import MSO_SHAPE
+
         # Left column background
-        left_bg = self.slide.shapes.add_shape(
+        self._add_panel(
             MSO_SHAPE.ROUNDED_RECTANGLE,
             self.layout['margins']['left'], self.layout['header_height'] + Inches(0.4),
-            Inches(5.5), Inches(5.6)
+            Inches(5.5), Inches(5.6), self.palette['light']
         )
-        left_bg.fill.solid()
-        left_bg.fill.fore_color.rgb = self.palette['light']
-        left_bg.line.fill.background()
 
         # Right column background
-        right_bg = self.slide.shapes.add_shape(
+        self._add_panel(
             MSO_SHAPE.ROUNDED_RECTANGLE,
             self.layout['margins']['left'] + Inches(5.9), self.layout['header_height'] + Inches(0.4),
-            Inches(5.5), Inches(5.6)
+            Inches(5.5), Inches(5.6), self.palette['light']
         )
-        right_bg.fill.solid()
-        right_bg.fill.fore_color.rgb = self.palette['light']
-        right_bg.line.fill.background()
 
         # Left column header
         if data.get('left_header'):
-            left_header_box = self.slide.shapes.add_textbox(
-                self.layout['margins']['left'] + Inches(0.4), self.layout['header_height'] + Inches(0.6),
-                Inches(4.7), Inches(0.4)
-            )
-            lh = left_header_box.text_frame
-            lh.text = data['left_header']
-            lh.paragraphs[0].font.name = self.fonts['heading']
-            lh.paragraphs[0].font.size = Pt(28)
-            lh.paragraphs[0].font.bold = True
-            lh.paragraphs[0].font.color.rgb = self.palette['primary']
+            left_left = self.layout['margins']['left'] + Inches(0.4)
+
+            def build_left_header():
+                left_header_box = self.slide.shapes.add_textbox(
+                    left_left, self.layout['header_height'] + Inches(0.6),
+                    Inches(4.7), Inches(0.4)
+                )
+                lh = left_header_box.text_frame
+                lh.text = data['left_header']
+                lh.paragraphs[0].font.name = self.fonts['heading']
+                lh.paragraphs[0].font.size = Pt(28)
+                lh.paragraphs[0].font.bold = True
+                lh.paragraphs[0].font.color.rgb = self.palette['primary']
+                return left_header_box
+
+            self._add_text(('column_header', left_left, self.layout['header_height'], self.fonts['heading'],
+                            self.palette['primary']), data['left_header'].split('\n'), build_left_header)
 
         # Right column header
         if data.get('right_header'):
-            right_header_box = self.slide.shapes.add_textbox(
-                self.layout['margins']['left'] + Inches(6.3), self.layout['header_height'] + Inches(0.6),
-                Inches(4.7), Inches(0.4)
-            )
-            rh = right_header_box.text_frame
-            rh.text = data['right_header']
-            rh.paragraphs[0].font.name = self.fonts['heading']
-            rh.paragraphs[0].font.size = Pt(28)
-            rh.paragraphs[0].font.bold = True
-            rh.paragraphs[0].font.color.rgb = self.palette['primary']
-
-        # Left column content
-        left_content_box = self.slide.shapes.add_textbox(
-            self.layout['margins']['left'] + Inches(0.4), self.layout['header_height'] + Inches(1.2),
-            Inches(4.7), Inches(4.5)
-        )
-        lcf = left_content_box.text_frame
-        lcf.word_wrap = True
-        lcf.vertical_anchor = MSO_ANCHOR.TOP
+            right_left = self.layout['margins']['left'] + Inches(6.3)
+
+            def build_right_header():
+                right_header_box = self.slide.shapes.add_textbox(
+                    right_left, self.layout['header_height'] + Inches(0.6),
+                    Inches(4.7), Inches(0.4)
+                )
+                rh = right_header_box.text_frame
+                rh.text = data['right_header']
+                rh.paragraphs[0].font.name = self.fonts['heading']
+                rh.paragraphs[0].font.size = Pt(28)
+                rh.paragraphs[0].font.bold = True
+                rh.paragraphs[0].font.color.rgb = self.palette['primary']
+                return right_header_box
+
+            self._add_text(('column_header', right_left, self.layout['header_height'], self.fonts['heading'],
+                            self.palette['primary']), data['right_header'].split('\n'), build_right_header)
 
         left_items = data.get('left_items', [])
-        for idx, item in enumerate(left_items):
-            p = lcf.paragraphs[0] if idx == 0 else lcf.add_paragraph()
-            p.text = f"• {item}" if len(left_items) > 1 else item
-            p.font.name = self.fonts['body']
-            p.font.size = Pt(24)
-            p.font.color.rgb = self.palette['text']
-            p.space_after = Pt(16)
-            p.line_spacing = 1.3
-
-        # Right column content
-        right_content_box = self.slide.shapes.add_textbox(
-            self.layout['margins']['left'] + Inches(6.3), self.layout['header_height'] + Inches(1.2),
-            Inches(4.7), Inches(4.5)
+        right_items = data.get('right_items', [])
+        left_texts = [f"• {item}" if len(left_items) > 1 else item for item in left_items]
+        right_texts = [f"• {item}" if len(right_items) > 1 else item for item in right_items]
+        # Both columns share the size that fits the fuller one
+        item_size = min(
+            TextFitter.fit(texts, self.fonts['body'], Inches(4.7), Inches(4.5), Pt(24), Pt(14),
+                           line_spacing=1.3, space_after=Pt(16))
+            for texts in (left_texts, right_texts)
         )
-        rcf = right_content_box.text_frame
-        rcf.word_wrap = True
-        rcf.vertical_anchor = MSO_ANCHOR.TOP
 
-        right_items = data.get('right_items', [])
-        for idx, item in enumerate(right_items):
-            p = rcf.paragraphs[0] if idx == 0 else rcf.add_paragraph()
-            p.text = f"• {item}" if len(right_items) > 1 else item
-            p.font.name = self.fonts['body']
-            p.font.size = Pt(24)
-            p.font.color.rgb = self.palette['text']
-            p.space_after = Pt(16)
-            p.line_spacing = 1.3
+        def build_column(left, texts):
+            content_box = self.slide.shapes.add_textbox(
+                left, self.layout['header_height'] + Inches(1.2), Inches(4.7), Inches(4.5)
+            )
+            cf = content_box.text_frame
+            cf.word_wrap = True
+            cf.vertical_anchor = MSO_ANCHOR.TOP
+
+            for idx, item in enumerate(texts):
+                p = cf.paragraphs[0] if idx == 0 else cf.add_paragraph()
+                p.text = item
+                p.font.name = self.fonts['body']
+                p.font.size = item_size
+                p.font.color.rgb = self.palette['text']
+                p.space_after = Pt(16)
+                p.line_spacing = 1.3
+            return content_box
+
+        # Left and right column content
+        for offset, texts in ((Inches(0.4), left_texts), (Inches(6.3), right_texts)):
+            left = self.layout['margins']['left'] + offset
+            self._add_text(
+                ('column', left, self.layout['header_height'], self.fonts['body'], item_size, self.palette['text']),
+                texts, lambda: build_column(left, texts), each=True
+            )
 
 class QuoteSlide(BaseSlide):
     slide_type = 'quote'
     skip_header = True
 
     def _add_background(self):
+        from pptx.util import Inches
+        from pptx.enum.shapes import MSO_SHAPE
+
         # Gradient background effect with shapes
-        bg = self.slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, self.layout['width'], self.layout['height'])
-        bg.fill.solid()
-        bg.fill.fore_color.rgb = self.palette['primary']
-        bg.line.fill.background()
+        self._add_panel(MSO_SHAPE.RECTANGLE, 0, 0, self.layout['width'], self.layout['height'], self.palette['primary'])
 
         # Accent shape
-        accent = self.slide.shapes.add_shape(
+        self._add_panel(
             MSO_SHAPE.ROUNDED_RECTANGLE,
             Inches(0.5), Inches(0.5),
-            Inches(2), Inches(2)
+            Inches(2), Inches(2),
+            self.palette['accent'], transparency=0.7
         )
-        accent.fill.solid()
-        accent.fill.fore_color.rgb = self.palette['accent']
-        accent.fill.transparency = 0.7
-        accent.line.fill.background()
 
     def _add_content(self, data):
+        from pptx.util import Inches, Pt
+        from pptx.enum.text import PP_ALIGN
+        from pptx.dml.color import RGBColor
+
         # Large quote mark or icon area
-        quote_mark = self.slide.shapes.add_textbox(Inches(1.5), Inches(1.5), Inches(1.5), Inches(1.0))
-        qm = quote_mark.text_frame
-        qm.text = '"'
-        qm.paragraphs[0].font.size = Pt(180)
-        qm.paragraphs[0].font.bold = True
-        qm.paragraphs[0].font.color.rgb = self.palette['accent_light']
-        qm.paragraphs[0].font.name = self.fonts['heading']
+        def build_mark():
+            quote_mark = self.slide.shapes.add_textbox(Inches(1.5), Inches(1.5), Inches(1.5), Inches(1.0))
+            qm = quote_mark.text_frame
+            qm.text = '"'
+            qm.paragraphs[0].font.size = Pt(180)
+            qm.paragraphs[0].font.bold = True
+            qm.paragraphs[0].font.color.rgb = self.palette['accent_light']
+            qm.paragraphs[0].font.name = self.fonts['heading']
+            return quote_mark
+
+        self._add_text(('mark', self.palette['accent_light'], self.fonts['heading']), ['"'], build_mark)
 
         # Main quote text
-        quote_box = self.slide.shapes.add_textbox(Inches(2.0), Inches(2.5), Inches(9.3), Inches(3.0))
-        qt = quote_box.text_frame
-        qt.word_wrap = True
-        qt.text = data.get('quote', data.get('title', 'Quote text'))
-        qt.paragraphs[0].font.name = self.fonts['heading']
-        qt.paragraphs[0].font.size = Pt(48)
-        qt.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-        qt.paragraphs[0].alignment = PP_ALIGN.LEFT
-        qt.paragraphs[0].line_spacing = 1.4
+        quote = data.get('quote', data.get('title', 'Quote text'))
+        quote_size = TextFitter.fit(
+            quote.split('\n'), self.fonts['heading'], Inches(9.3), Inches(3.0), Pt(48), Pt(24), line_spacing=1.4
+        )
+
+        def build_quote():
+            quote_box = self.slide.shapes.add_textbox(Inches(2.0), Inches(2.5), Inches(9.3), Inches(3.0))
+            qt = quote_box.text_frame
+            qt.word_wrap = True
+            qt.text = quote
+            qt.paragraphs[0].font.name = self.fonts['heading']
+            qt.paragraphs[0].font.size = quote_size
+            qt.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
+            qt.paragraphs[0].alignment = PP_ALIGN.LEFT
+            qt.paragraphs[0].line_spacing = 1.4
+            return quote_box
+
+        self._add_text(('quote', self.fonts['heading'], quote_size), quote.split('\n'), build_quote)
 
         # Attribution
         if data.get('attribution'):
-            attr_box = self.slide.shapes.add_textbox(Inches(2.0), Inches(5.8), Inches(9.3), Inches(0.8))
-            attr = attr_box.text_frame
-            attr.text = f"— {data['attribution']}"
-            attr.paragraphs[0].font.name = self.fonts['body']
-            attr.paragraphs[0].font.size = Pt(28)
-            attr.paragraphs[0].font.color.rgb = self.palette['accent_light']
-            attr.paragraphs[0].font.italic = True
+            attribution = f"— {data['attribution']}"
+
+            def build_attribution():
+                attr_box = self.slide.shapes.add_textbox(Inches(2.0), Inches(5.8), Inches(9.3), Inches(0.8))
+                attr = attr_box.text_frame
+                attr.text = attribution
+                attr.paragraphs[0].font.name = self.fonts['body']
+                attr.paragraphs[0].font.size = Pt(28)
+                attr.paragraphs[0].font.color.rgb = self.palette['accent_light']
+                attr.paragraphs[0].font.italic = True
+                return attr_box
+
+            self._add_text(('attribution', self.fonts['body'], self.palette['accent_light']),
+                           attribution.split('\n'), build_attribution)
 
 class StatsSlide(BaseSlide):
     slide_type = 'stats'
     skip_header = True
 
     def _add_background(self):
-        bg = self.slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, 0, 0, self.layout['width'], self.layout['height'])
-        bg.fill.solid()
-        bg.fill.fore_color.rgb = RGBColor(255, 255, 255)
-        bg.line.fill.background()
+        from pptx.util import Inches
+        from pptx.enum.shapes import MSO_SHAPE
+
+        super()._add_background()
 
         # Colored accent bar
-        accent_bar = self.slide.shapes.add_shape(
+        self._add_panel(
             MSO_SHAPE.RECTANGLE,
             0, 0,
-            self.layout['width'], Inches(1.5)
+            self.layout['width'], Inches(1.5),
+            self.palette['primary']
         )
-        accent_bar.fill.solid()
-        accent_bar.fill.fore_color.rgb = self.palette['primary']
-        accent_bar.line.fill.background()
 
     def _add_content(self, data):
+        from pptx.util import Inches, Pt
+        from pptx.enum.text import PP_ALIGN
+        from pptx.dml.color import RGBColor
+        from pptx.enum.shapes import MSO_SHAPE
+
         # Title at top
-        title_box = self.slide.shapes.add_textbox(Inches(1.0), Inches(0.3), Inches(11.3), Inches(1.0))
-        tf = title_box.text_frame
-        tf.text = data.get('title', 'Key Statistics')
-        tf.paragraphs[0].font.name = self.fonts['heading']
-        tf.paragraphs[0].font.size = Pt(52)
-        tf.paragraphs[0].font.bold = True
-        tf.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
-        tf.paragraphs[0].alignment = PP_ALIGN.CENTER
+        title = data.get('title', 'Key Statistics')
+
+        def build_title():
+            title_box = self.slide.shapes.add_textbox(Inches(1.0), Inches(0.3), Inches(11.3), Inches(1.0))
+            tf = title_box.text_frame
+            tf.text = title
+            tf.paragraphs[0].font.name = self.fonts['heading']
+            tf.paragraphs[0].font.size = Pt(52)
+            tf.paragraphs[0].font.bold = True
+            tf.paragraphs[0].font.color.rgb = RGBColor(255, 255, 255)
+            tf.paragraphs[0].alignment = PP_ALIGN.CENTER
+            return title_box
+
+        self._add_text(('title', self.fonts['heading']), title.split('\n'), build_title)
 
         # Stats items (up to 3)
         stats = data.get('stats', [])
@@ -636,15 +1470,12 @@ class StatsSlide(BaseSlide):
             x_pos = Inches(1.0) + (stat_width * idx)
 
             # Background card
-            card = self.slide.shapes.add_shape(
+            self._add_panel(
                 MSO_SHAPE.ROUNDED_RECTANGLE,
                 x_pos + Inches(0.2), Inches(2.5),
-                stat_width - Inches(0.4), Inches(3.5)
+                stat_width - Inches(0.4), Inches(3.5),
+                self.palette['light'], outline=self.palette['accent'], outline_width=Pt(3)
             )
-            card.fill.solid()
-            card.fill.fore_color.rgb = self.palette['light']
-            card.line.color.rgb = self.palette['accent']
-            card.line.width = Pt(3)
 
             # Parse stat (try to extract number and label)
             parts = stat.split(':', 1) if ':' in stat else [stat, '']
@@ -663,30 +1494,49 @@ class StatsSlide(BaseSlide):
                     label_text = stat[20:]
 
             # Big number
-            num_box = self.slide.shapes.add_textbox(
-                x_pos + Inches(0.3), Inches(3.0),
-                stat_width - Inches(0.6), Inches(1.5)
+            number_size = TextFitter.fit(
+                [number_text], self.fonts['heading'], stat_width - Inches(0.6), None, Pt(72), Pt(28),
+                bold=True, wrap=False
             )
-            num_tf = num_box.text_frame
-            num_tf.text = number_text
-            num_tf.paragraphs[0].font.name = self.fonts['heading']
-            num_tf.paragraphs[0].font.size = Pt(72)
-            num_tf.paragraphs[0].font.bold = True
-            num_tf.paragraphs[0].font.color.rgb = self.palette['primary']
-            num_tf.paragraphs[0].alignment = PP_ALIGN.CENTER
+
+            def build_number():
+                num_box = self.slide.shapes.add_textbox(
+                    x_pos + Inches(0.3), Inches(3.0),
+                    stat_width - Inches(0.6), Inches(1.5)
+                )
+                num_tf = num_box.text_frame
+                num_tf.text = number_text
+                num_tf.paragraphs[0].font.name = self.fonts['heading']
+                num_tf.paragraphs[0].font.size = number_size
+                num_tf.paragraphs[0].font.bold = True
+                num_tf.paragraphs[0].font.color.rgb = self.palette['primary']
+                num_tf.paragraphs[0].alignment = PP_ALIGN.CENTER
+                return num_box
+
+            self._add_text(('number', x_pos, stat_width, self.fonts['heading'], number_size, self.palette['primary']),
+                           number_text.split('\n'), build_number)
 
             # Label
-            label_box = self.slide.shapes.add_textbox(
-                x_pos + Inches(0.3), Inches(4.7),
-                stat_width - Inches(0.6), Inches(1.0)
+            label_size = TextFitter.fit(
+                label_text.split('\n'), self.fonts['body'], stat_width - Inches(0.6), Inches(1.0), Pt(20), Pt(12)
             )
-            label_tf = label_box.text_frame
-            label_tf.word_wrap = True
-            label_tf.text = label_text
-            label_tf.paragraphs[0].font.name = self.fonts['body']
-            label_tf.paragraphs[0].font.size = Pt(20)
-            label_tf.paragraphs[0].font.color.rgb = self.palette['text']
-            label_tf.paragraphs[0].alignment = PP_ALIGN.CENTER
+
+            def build_label():
+                label_box = self.slide.shapes.add_textbox(
+                    x_pos + Inches(0.3), Inches(4.7),
+                    stat_width - Inches(0.6), Inches(1.0)
+                )
+                label_tf = label_box.text_frame
+                label_tf.word_wrap = True
+                label_tf.text = label_text
+                label_tf.paragraphs[0].font.name = self.fonts['body']
+                label_tf.paragraphs[0].font.size = label_size
+                label_tf.paragraphs[0].font.color.rgb = self.palette['text']
+                label_tf.paragraphs[0].alignment = PP_ALIGN.CENTER
+                return label_box
+
+            self._add_text(('label', x_pos, stat_width, self.fonts['body'], label_size, self.palette['text']),
+                           label_text.split('\n'), build_label)
 
 # ============================================================================
 # SLIDE FACTORY
@@ -707,13 +1557,225 @@ class SlideFactory:
         cls = SlideFactory.SLIDE_TYPES.get(slide_type, ContentSlide)
         return cls(prs, palette, layout, fonts, brand_kit)
 
+# ============================================================================
+# THEME LAYOUTS
+# ============================================================================
+
+class ThemeLayouts:
+    """One slide layout per slide type with the theme's frame baked in.
+
+    The shapes BaseSlide._add_frame draws on every slide (background panels,
+    brand logo, header bar) are drawn once into a copy of the type's usual
+    layout, so slides carry only their content shapes. Layouts are added to
+    the deck's master for every slide type in SlideFactory order, so their
+    part names do not depend on the slides (shards and incremental builds
+    splice slides between packages).
+    """
+
+    def __init__(self, prs, palette, layout, fonts=None, brand_kit=None, template_manager=None, name='SlideCraft'):
+        self._layouts = {}
+        for cls in SlideFactory.SLIDE_TYPES.values():
+            frame = cls(prs, palette, layout, fonts, brand_kit)
+            base = frame._slide_layout(template_manager, None)
+            self._layouts[cls.slide_type] = ThemeLayouts._bake(frame, base, f'{name} {cls.slide_type}')
+
+    def get_layout(self, slide_type):
+        return self._layouts.get(slide_type) or self._layouts['content']
+
+    @staticmethod
+    def _bake(frame, base, name):
+        """Draw the frame on a scratch slide and move its shapes into a new copy of `base`"""
+        from pptx.oxml.ns import qn
+
+        prs = frame.prs
+        frame.slide = prs.slides.add_slide(base)
+        slide_part = frame.slide.part
+        tree = frame.slide.shapes._spTree
+        first = len(tree)
+        frame._add_frame()
+        shapes = list(tree)[first:]
+
+        part = ThemeLayouts._copy_layout(prs, base, name)
+        layout_tree = part.slide_layout.shapes._spTree
+        rIds = {}
+        for shape in shapes:
+            for e in shape.iter():
+                for attr, value in e.attrib.items():
+                    if attr.startswith(_R_NS) and value not in rIds:
+                        rel = slide_part.rels[value]
+                        rIds[value] = part.relate_to(rel.target_part, rel.reltype)
+            _remap_rIds(shape, rIds)
+            # Shape ids only need to be unique within the layout
+            next_id = layout_tree.max_shape_id + 1
+            for c_nv_pr in shape.iter(qn('p:cNvPr')):
+                c_nv_pr.set('id', str(next_id))
+                next_id += 1
+            layout_tree.insert_element_before(shape, 'p:extLst')
+
+        sld_id_lst = prs.slides._sldIdLst
+        for sld_id in list(sld_id_lst):
+            if prs.part.related_part(sld_id.rId) is slide_part:
+                sld_id_lst.remove(sld_id)
+                prs.part.drop_rel(sld_id.rId)
+        return part.slide_layout
+
+    @staticmethod
+    def _copy_layout(prs, base, name):
+        """New layout part cloned from `base`, registered with its master under a free id"""
+        from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+        from lxml import etree
+        from pptx.opc.packuri import PackURI
+        from pptx.oxml.ns import qn
+        from pptx.parts.slide import SlideLayoutPart
+
+        src = base.part
+        package = src.package
+        element = deepcopy(src._element)
+        element.cSld.set('name', name)
+        partname = PackURI(package.next_partname('/ppt/slideLayouts/slideLayout%d.xml'))
+        part = SlideLayoutPart(partname, src.content_type, package, element)
+        rIds = {}
+        for rId, rel in src.rels.items():
+            if rel.is_external:
+                rIds[rId] = part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+            else:
+                rIds[rId] = part.relate_to(rel.target_part, rel.reltype)
+        _remap_rIds(element, rIds)
+
+        # sldMasterId and sldLayoutId values share one range across the presentation
+        ids = [int(e.get('id')) for e in prs.part._element.iter(qn('p:sldMasterId'))]
+        for master in prs.slide_masters:
+            ids += [int(e.get('id')) for e in master._element.iter(qn('p:sldLayoutId'))]
+        master_part = src.part_related_by(RT.SLIDE_MASTER)
+        id_lst = master_part._element.get_or_add_sldLayoutIdLst()
+        layout_id = etree.SubElement(id_lst, qn('p:sldLayoutId'), id=str(max(ids) + 1))
+        layout_id.set(qn('r:id'), master_part.relate_to(part, RT.SLIDE_LAYOUT))
+        return part
+
+# ============================================================================
+# OUTPUT CACHE
+# ============================================================================
+
+class OutputCache:
+    """Content-addressed on-disk store of built .pptx packages.
+
+    Entries are written to a temp file and renamed into place, so several
+    processes can share one directory. Hits refresh the entry's mtime and
+    eviction removes the least recently used entries beyond max_bytes.
+    """
+
+    DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+    _instances = {}
+
+    def __init__(self, directory, max_bytes=None):
+        self.directory = directory
+        self.max_bytes = max_bytes or self.DEFAULT_MAX_BYTES
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def at(cls, directory):
+        """Shared instance for `directory`, so hit/miss counts accumulate across builds"""
+        key = os.path.abspath(directory)
+        instance = cls._instances.get(key)
+        if instance is None:
+            # Concurrent first calls may each construct one; all of them get the same stored instance
+            instance = cls._instances.setdefault(key, cls(directory))
+        return instance
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pptx")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                blob = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)  # evicted by another process since the read; the data is still good
+        self.hits += 1
+        return blob
+
+    def put(self, key, blob):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            raise
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pptx'):
+                with contextlib.suppress(FileNotFoundError):
+                    st = entry.stat()
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            # Another process may have evicted it already
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+
+    def cache_info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'directory': self.directory}
+
 # ============================================================================
 # PRESENTATION BUILDER PRO
 # ============================================================================
 
+class _ChunkSink:
+    """Write-only, non-seekable buffer the builder saves into while iter_bytes drains it"""
+
+    def __init__(self):
+        self._buf = bytearray()
+
+    def write(self, data):
+        self._buf += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self, chunk_size, final):
+        while len(self._buf) >= chunk_size or (final and self._buf):
+            chunk = bytes(self._buf[:chunk_size])
+            del self._buf[:chunk_size]
+            yield chunk
+
+
 class PresentationBuilderPro:
-    def __init__(self, config):
+    # Sharded builds split slides into this many runs per worker so assembly overlaps rendering
+    SHARDS_PER_WORKER = 4
+    # Bump when slide rendering changes so incremental builds stop reusing older slide parts
+    RENDER_VERSION = 1
+    # Slides held by python-pptx at once when config['low_memory'] is set
+    LOW_MEMORY_WINDOW = 25
+
+    def __init__(self, config, cancel_event=None):
+        # slides_content may be an iterator (e.g. slides streaming from the AI generator):
+        # slides render as they arrive and are collected into config['slides_content']
+        self.slide_source = None
+        slides = config.get('slides_content')
+        if isinstance(slides, Iterator):
+            if config.get('cache') or config.get('previous') or config.get('shards', 1) > 1:
+                config = dict(config, slides_content=list(slides))  # these need every slide up front
+            else:
+                self.slide_source = slides
+                config = dict(config, slides_content=[])
         self.config = config
+        self.cancel_event = cancel_event  # threading.Event; set it to stop the build after the current slide
         self.brand_kit = None
         self.theme = None
         self.palette = None
@@ -721,22 +1783,37 @@ class PresentationBuilderPro:
         self.layout = LayoutConfig.get_layout(config.get('format', '16:9'))
         self.template_manager = None
         self.prs = None
-        self._initialize_styling()
+        self.output_path = None
+        self.slide_hashes = []
+        self.reused_slides = None
+        self.slide_reuse = None  # set per build once the slide hashes are known
+        self.theme_layouts = None
+        self.build_id = uuid.uuid4().hex
+        self.log = BuildLog(log, {'build_id': self.build_id})
+        self.timer = PhaseTimer.from_config(config.get('timing'))
+        with self._phase('build.styling'):
+            self._initialize_styling()
     
+    def _phase(self, name):
+        """Timing context for one builder phase; a no-op unless config['timing'] is set"""
+        return self.timer.phase(name) if self.timer else contextlib.nullcontext()
+
     def _initialize_styling(self):
+        from pptx.dml.color import RGBColor
+
         # Brand Kit > Theme > Default
         if self.config.get('brand_kit'):
             bk = self.config['brand_kit']
             self.brand_kit = BrandKit.from_file(bk) if isinstance(bk, str) else bk
             self.palette = self.brand_kit.to_palette()
             self.fonts = {'heading': self.brand_kit.heading_font, 'body': self.brand_kit.body_font}
-            print(f"✓ Brand Kit: {self.brand_kit.name}")
+            self.log.info("✓ Brand Kit: %s", self.brand_kit.name, extra={'event': 'style', 'brand_kit': self.brand_kit.name})
         
         elif self.config.get('theme'):
             self.theme = ThemeGallery.get_theme(self.config['theme'])
             self.palette = self.theme.to_palette()
-            self.fonts = self.theme.fonts
-            print(f"✓ Theme: {self.theme.name}")
+            self.fonts = dict(self.theme.fonts)
+            self.log.info("✓ Theme: %s", self.theme.name, extra={'event': 'style', 'theme': self.theme.name})
         
         else:
             # Default Tyler
@@ -748,41 +1825,382 @@ class PresentationBuilderPro:
             }
             self.fonts = {'heading': 'Arial Bold', 'body': 'Arial'}
     
-    def build(self):
-        print("🎨 Building v4 Pro presentation...")
-        
-        self._initialize_presentation()
+    def build(self, output=None):
+        """Build the deck.
+
+        output: None (timestamped file in the output directory), a file path,
+        a writable binary stream such as BytesIO, or 'bytes' to get the
+        package back in result['data'] without touching disk.
+        """
+        target = self._output_target(output)
+        cache = self._output_cache()
+        if cache is None:
+            try:
+                for _ in self._render_slides(target):
+                    pass
+            except BuildCancelled:
+                self._abort(target)
+                raise
+            output_path = self._save(target)
+        else:
+            blob, hit = self._cached_package(cache)
+            output_path = self._deliver(blob, target)
+
+        result = {'filepath': output_path, 'theme': getattr(self.theme, 'name', 'Custom'), 'build_id': self.build_id}
+        if cache is not None:
+            result['cache'] = 'hit' if hit else 'miss'
+        if self.reused_slides is not None:
+            result['reused_slides'] = self.reused_slides
+        if self.slide_reuse and self.slide_reuse.cloned:
+            result['cloned_slides'] = self.slide_reuse.cloned
+        if self.timer:
+            result['timings'] = self.timer.summary()
+        self._write_notes_sidecar(output_path, result)
+        if output == 'bytes':
+            result['data'] = target.getvalue()
+        self.log.info("✅ Complete: %s", output_path or 'in memory', extra={'event': 'complete', 'filepath': output_path})
+        return result
+
+    def _check_cancelled(self):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise BuildCancelled(f"Build {self.build_id} cancelled")
+
+    def _abort(self, target):
+        """Discard a cancelled build's partial output (stream and low-memory builds write as they go)"""
+        abort = getattr(self.prs, 'abort', None)
+        if abort is None:
+            return
+        abort()
+        if isinstance(target, str):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(target)
+
+    def _write_notes_sidecar(self, output_path, result):
+        """config['notes_sidecar'] ('md' or 'json'): speaker notes next to the deck, or in result['notes']"""
+        fmt = self.config.get('notes_sidecar')
+        if not fmt:
+            return
+        document = SpeakerNotes.document(self.config.get('slides_content', []), fmt)
+        if output_path is None:
+            result['notes'] = document
+            return
+        path = f"{os.path.splitext(output_path)[0]}.notes.{fmt}"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(document)
+        result['notes_path'] = path
+
+    def iter_bytes(self, chunk_size=64 * 1024):
+        """Build the deck and yield the package in chunks, e.g. for a streaming HTTP response.
+
+        With the stream engine, chunks are produced while slides render;
+        otherwise they follow once the package is saved.
+        """
+        cache = self._output_cache()
+        if cache is not None:
+            blob, _ = self._cached_package(cache)
+            for start in range(0, len(blob), chunk_size):
+                yield blob[start:start + chunk_size]
+            return
+
+        sink = _ChunkSink()
+        for _ in self._render_slides(sink):
+            yield from sink.drain(chunk_size, final=False)
+        self._save(sink)
+        yield from sink.drain(chunk_size, final=True)
+
+    def _output_cache(self):
+        cache = self.config.get('cache')
+        if not cache:
+            return None
+        return OutputCache.at(cache) if isinstance(cache, (str, os.PathLike)) else cache
+
+    def cache_key(self):
+        """Canonical hash of everything that determines the package bytes"""
+        payload = json.dumps([
+            self._hash_base(),
+            self._engine(),
+            self._spool_window(),
+            self.config.get('slides_content', []),
+        ], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _cached_package(self, cache):
+        """(package bytes, hit) for this config, building and storing them on a miss"""
+        key = self.cache_key()
+        with self._phase('build.cache_lookup'):
+            blob = cache.get(key)
+        if blob is not None:
+            self.log.info("⚡ Cache hit", extra={'event': 'cache_hit'})
+            self.slide_hashes = self._slide_hashes(self.config.get('slides_content', []))
+            return blob, True
+
+        buffer = BytesIO()
+        for _ in self._render_slides(buffer):
+            pass
+        with self._phase('build.save'):
+            self._write_package(buffer)
+        blob = buffer.getvalue()
+        with self._phase('build.cache_store'):
+            cache.put(key, blob)
+        return blob, False
+
+    def _deliver(self, blob, target):
+        """Write cached package bytes to an output target; returns the file path, if any"""
+        if isinstance(target, str):
+            with open(target, 'wb') as f:
+                f.write(blob)
+            self._write_manifest(target)
+            return target
+        target.write(blob)
+        return None
+
+    def _render_slides(self, target):
+        """Render slide by slide, yielding after each one"""
+        self.log.info("🎨 Building v4 Pro presentation...", extra={'event': 'start'})
+
+        # Read before initializing: a stream build may be about to overwrite this file
+        previous = self._load_previous()
+        with self._phase('build.template_load'):
+            self._initialize_presentation(target)
         
         self.prs.slide_width = self.layout['width']
         self.prs.slide_height = self.layout['height']
-        print(f"✓ Format: {self.layout['name']}")
+        self.log.info("✓ Format: %s", self.layout['name'], extra={'event': 'format'})
         
         slides_data = self.config.get('slides_content', [])
-        print(f"📊 Creating {len(slides_data)} slides...")
+        if self.slide_source is None:
+            self.log.info("📊 Creating %d slides...", len(slides_data), extra={'event': 'slides', 'count': len(slides_data)})
+        else:
+            self.log.info("📊 Creating slides as they arrive...", extra={'event': 'slides', 'count': None})
+
+        self.slide_hashes = self._slide_hashes(slides_data)
+        # Clones need the source slide's parts, which the stream and low-memory engines do not keep
+        if self.config.get('reuse_slides', True) and self._engine() == 'pptx' and not self._spool_window():
+            self.slide_reuse = SlideReuse(self.slide_hashes)
+        if previous:
+            yield from self._render_incremental(slides_data, *previous)
+            return
+
+        shards = self.config.get('shards', 1)
+        if shards > 1 and len(slides_data) > 1:
+            yield from self._render_sharded(shards, slides_data)
+            return
         
+        if self.slide_source is not None:
+            slides_data = self._arriving_slides(slides_data)
         for idx, slide_data in enumerate(slides_data, 1):
+            self._check_cancelled()
             slide_type = slide_data.get('type', 'content')
             title = slide_data.get('title', 'Untitled')[:50]
-            print(f"  {idx}. {slide_type}: {title}")
-            self._create_slide(slide_type, slide_data)
-        
-        output_path = self._save()
-        print(f"\n✅ Complete: {output_path}")
-        return {'filepath': output_path, 'theme': getattr(self.theme, 'name', 'Custom')}
+            self.log.debug("  %d. %s: %s", idx, slide_type, title, extra={'event': 'slide', 'index': idx})
+            self._create_slide(slide_type, slide_data, self.slide_hashes[idx - 1])
+            yield idx
+
+    def _arriving_slides(self, slides_data):
+        """Pull slides from config['slides_content']'s iterator, recording each one and its hash"""
+        base = self._hash_base()
+        for slide_data in self.slide_source:
+            slides_data.append(slide_data)
+            self.slide_hashes.append(self._slide_hash(base, slide_data))
+            yield slide_data
+
+    def _render_sharded(self, workers, slides_data):
+        """Render contiguous runs of slides in worker processes and append them in deck order"""
+        from concurrent.futures import ProcessPoolExecutor
+
+        size = -(-len(slides_data) // (workers * self.SHARDS_PER_WORKER))
+        runs = [slides_data[i:i + size] for i in range(0, len(slides_data), size)]
+        # Timing callbacks and cache objects need not pickle; workers neither time nor cache
+        config = {k: v for k, v in self.config.items() if k not in ('slides_content', 'timing', 'cache')}
+        self.log.info("  %d shards on %d workers", len(runs), workers, extra={'event': 'shards', 'shards': len(runs)})
+
+        done = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for records, images in pool.map(_render_shard, [config] * len(runs), runs):
+                self._check_cancelled()
+                self.prs.add_rendered(records, images)
+                done += len(records)
+                self.log.info("  %d/%d slides", done, len(slides_data), extra={'event': 'progress', 'done': done})
+                yield done
     
-    def _initialize_presentation(self):
+    def _render_incremental(self, slides_data, blob, old_hashes):
+        """Copy unchanged slides from the previous package; render only new or edited ones"""
+        from slidecraft_stream import read_slide_records
+
+        available = {}
+        for old_idx, h in enumerate(old_hashes):
+            available.setdefault(h, []).append(old_idx)
+        reuse = {}
+        for idx, h in enumerate(self.slide_hashes):
+            if available.get(h):
+                reuse[idx] = available[h].pop(0)
+        with self._phase('build.reuse_read'):
+            records, images = read_slide_records(blob, reuse.values())
+        self.reused_slides = len(reuse)
+        self.log.info("  ♻ Reusing %d unchanged slides", len(reuse), extra={'event': 'reuse', 'count': len(reuse)})
+
+        for idx, slide_data in enumerate(slides_data):
+            self._check_cancelled()
+            if idx in reuse:
+                record = records[reuse[idx]]
+                self.prs.add_rendered([record], {rel[2]: images[rel[2]] for rel in record[1] if rel[2] in images})
+            else:
+                slide_type = slide_data.get('type', 'content')
+                self.log.debug("  %d. %s: %s", idx + 1, slide_type, slide_data.get('title', 'Untitled')[:50],
+                               extra={'event': 'slide', 'index': idx + 1})
+                self._create_slide(slide_type, slide_data, self.slide_hashes[idx])
+            yield idx + 1
+
+    def _hash_base(self):
+        """Everything outside the slide dict that changes how a slide renders.
+
+        Template and logo enter by content, so moving or touching them changes nothing.
+        """
+        template = self.config.get('template_path')
+        logo = None
+        if self.brand_kit and self.brand_kit.logo_path and os.path.exists(self.brand_kit.logo_path):
+            logo = TemplateManager.digest(self.brand_kit.logo_path)
+        return [
+            self.RENDER_VERSION,
+            {k: str(v) for k, v in self.palette.items()},
+            self.fonts,
+            {k: v for k, v in self.layout.items()},
+            TemplateManager.digest(template) if template and os.path.exists(template) else None,
+            logo,
+        ] + ([] if self.config.get('embed_notes', True) else ['no-notes']) + (  # keeps existing manifests valid
+            ['theme-layouts'] if self.config.get('theme_layouts') else [])
+
+    def _slide_hashes(self, slides_data):
+        base = self._hash_base()
+        return [self._slide_hash(base, d) for d in slides_data]
+
+    @staticmethod
+    def _slide_hash(base, slide_data):
+        cls = SlideFactory.SLIDE_TYPES.get(slide_data.get('type', 'content'), ContentSlide)
+        payload = json.dumps([base, cls.__name__, slide_data], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _manifest_path(path):
+        return os.path.splitext(path)[0] + '.manifest.json'
+
+    def _load_previous(self):
+        """(package bytes, slide hashes) of config['previous'], or None for a full build"""
+        path = self.config.get('previous')
+        if not path:
+            return None
+        try:
+            with open(self._manifest_path(path)) as f:
+                manifest = json.load(f)
+            with open(path, 'rb') as f:
+                blob = f.read()
+        except (OSError, ValueError):
+            self.log.warning("⚠ No usable manifest for %s; rebuilding every slide", path, extra={'event': 'no_manifest'})
+            return None
+        return blob, manifest.get('slides', [])
+
+    def _write_manifest(self, path):
+        with open(self._manifest_path(path), 'w') as f:
+            json.dump({'render_version': self.RENDER_VERSION, 'slides': self.slide_hashes}, f, indent=2)
+
+    def _engine(self):
+        spliced = self.config.get('shards', 1) > 1 or bool(self.config.get('previous'))
+        engine = self.config.get('engine', 'stream' if spliced else 'pptx')
+        if spliced and engine != 'stream':
+            raise ValueError("Sharded and incremental builds require the stream engine")
+        return engine
+
+    def _initialize_presentation(self, target=None):
         template = self.config.get('template_path')
         if template:
             self.template_manager = TemplateManager(template)
             self.prs = self.template_manager.load()
         else:
-            self.prs = Presentation()
+            self.prs = TemplateManager.blank()
+
+        if self.config.get('theme_layouts'):
+            # Before any engine wraps the deck: layouts must exist in the base package
+            name = self.brand_kit.name if self.brand_kit else getattr(self.theme, 'name', 'SlideCraft')
+            with self._phase('build.theme_layouts'):
+                self.theme_layouts = ThemeLayouts(self.prs, self.palette, self.layout, self.fonts, self.brand_kit,
+                                                  self.template_manager, name)
+
+        engine = self._engine()
+        if engine == 'stream':
+            # Slides are written to the output as they are rendered; self.prs only supplies layouts
+            from slidecraft_stream import StreamPresentation
+            self.prs = StreamPresentation(self.prs, target if target is not None else self._output_path())
+        elif engine != 'pptx':
+            raise ValueError(f"Unknown engine: {engine}")
+        elif self._spool_window():
+            # python-pptx renders, but finished slides are moved to the output a window at a time
+            from slidecraft_stream import SpoolingPresentation
+            self.prs = SpoolingPresentation(self.prs, target if target is not None else self._output_path(),
+                                            self._spool_window())
+
+    def _spool_window(self):
+        """Slides per flush for low-memory pptx builds, or None.
+
+        config['low_memory']: True for LOW_MEMORY_WINDOW, or a window size.
+        The stream engine already writes each slide as it goes.
+        """
+        low_memory = self.config.get('low_memory')
+        if not low_memory or self._engine() != 'pptx':
+            return None
+        window = self.LOW_MEMORY_WINDOW if low_memory is True else int(low_memory)
+        if window < 1:
+            raise ValueError(f"low_memory window must be at least 1, got {low_memory!r}")
+        return window
     
-    def _create_slide(self, slide_type, slide_data):
+    def _create_slide(self, slide_type, slide_data, key=None):
+        """Render one slide; `key` (its slide hash) lets repeats be cloned from the first render"""
+        if not self.config.get('embed_notes', True) and slide_data.get('notes'):
+            slide_data = {k: v for k, v in slide_data.items() if k != 'notes'}
+        reuse = self.slide_reuse if key is not None else None
+        if reuse is not None and key in reuse:
+            with self._phase('build.slide_clone'):
+                reuse.clone(self.prs, key, slide_data.get('notes'))
+            return
         slide = SlideFactory.create_slide(slide_type, self.prs, self.palette, self.layout, self.fonts, self.brand_kit)
-        slide.create(slide_data, self.template_manager)
+        rendered = slide.create(slide_data, self.template_manager, self.timer, self.theme_layouts)
+        if reuse is not None:
+            reuse.remember(key, rendered)
     
-    def _save(self):
+    def _save(self, target=None):
+        """Save to `target`; returns the file path, or None for in-memory targets"""
+        if target is None:
+            target = self._output_path()
+        with self._phase('build.save'):
+            self._write_package(target)
+        if not isinstance(target, str):
+            return None
+        self._write_manifest(target)
+        return target
+
+    def _write_package(self, target):
+        if self._engine() == 'stream' or self._spool_window():
+            self.prs.save(target)
+        else:
+            # Fixed zip timestamps instead of python-pptx's wall clock, so identical decks are identical bytes
+            from slidecraft_stream import save_package
+            save_package(self.prs, target)
+
+    def _output_target(self, output):
+        if output is None:
+            return self._output_path()
+        if output == 'bytes':
+            return BytesIO()
+        if isinstance(output, (str, os.PathLike)):
+            self.output_path = os.fspath(output)
+            return self.output_path
+        if hasattr(output, 'write'):
+            return output
+        raise ValueError(f"Unsupported output target: {output!r}")
+
+    def _output_path(self):
+        if self.output_path:
+            return self.output_path
+
         ts = datetime.now().strftime('%Y%m%d_%H%M%S')
 
         # Try configured output directory, fallback to local outputs/
@@ -796,9 +2214,21 @@ class PresentationBuilderPro:
                 output_dir = os.path.join(os.getcwd(), 'outputs')
                 os.makedirs(output_dir, exist_ok=True)
 
-        path = os.path.join(output_dir, f"presentation_v4pro_{ts}.pptx")
-        self.prs.save(path)
-        return path
+        # The build id keeps builds finishing in the same second from overwriting each other
+        self.output_path = os.path.join(output_dir, f"presentation_v4pro_{ts}_{self.build_id[:8]}.pptx")
+        return self.output_path
+
+
+def _render_shard(config, slides_data):
+    """Worker side of sharded rendering: returns StreamShard records for `slides_data`"""
+    from slidecraft_stream import StreamShard
+
+    builder = PresentationBuilderPro(dict(config, engine='pptx', shards=1, previous=None))
+    builder._initialize_presentation()
+    builder.prs = StreamShard(builder.prs)
+    for slide_data, key in zip(slides_data, builder._slide_hashes(slides_data)):
+        builder._create_slide(slide_data.get('type', 'content'), slide_data, key)
+    return builder.prs.collect()
 
 # ============================================================================
 # API
@@ -1077,15 +2507,151 @@ def list_templates():
 # PRESENTATION BUILDER
 # ============================================================================
 
-def create_presentation(config):
-    """Create v5 presentation"""
-    return PresentationBuilderPro(config).build()
+def create_presentation(config, output=None):
+    """Create v5 presentation; see PresentationBuilderPro.build for `output` targets"""
+    return PresentationBuilderPro(config).build(output)
+
+
+def iter_presentation(config, chunk_size=64 * 1024):
+    """Create v5 presentation as an iterator of bytes chunks, without writing a file"""
+    return PresentationBuilderPro(config).iter_bytes(chunk_size)
+
+
+# Async builds render on one bounded pool; each event loop admits at most ASYNC_MAX_BUILDS at a time
+ASYNC_MAX_WORKERS = min(4, os.cpu_count() or 1)
+ASYNC_MAX_BUILDS = 8
+_async_executor = None
+_async_slots = weakref.WeakKeyDictionary()  # event loop -> _BuildSlots
+
+
+def configure_async(max_workers=None, max_builds=None, executor=None):
+    """Size the async render pool (or hand in your own executor) and the concurrent build cap.
+
+    Call before the first async build; changing max_builds later applies to loops started after.
+    """
+    global _async_executor, ASYNC_MAX_WORKERS, ASYNC_MAX_BUILDS
+    if max_builds is not None:
+        if max_builds < 1:
+            raise ValueError(f"max_builds must be at least 1, got {max_builds}")
+        ASYNC_MAX_BUILDS = max_builds
+        _async_slots.clear()
+    if max_workers is not None:
+        ASYNC_MAX_WORKERS = max_workers
+    if executor is not None or max_workers is not None:
+        old, _async_executor = _async_executor, executor
+        if old is not None:
+            old.shutdown(wait=False)
+
+
+def _render_executor():
+    global _async_executor
+    if _async_executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _async_executor = ThreadPoolExecutor(ASYNC_MAX_WORKERS, thread_name_prefix='slidecraft')
+    return _async_executor
+
+
+class _BuildSlots:
+    """Per-loop cap on concurrent async builds.
+
+    Unlike asyncio.Semaphore, which keeps the loop once it has had waiters, this
+    only references the loop through pending waiters, so the weak key in
+    _async_slots dies with the loop.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.active = 0
+        self._waiters = deque()
+
+    async def __aenter__(self):
+        import asyncio
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter  # a releasing build hands its slot over by resolving the waiter
+        except BaseException:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                self._release()  # handed a slot just as we were cancelled: pass it on
+            raise
+
+    async def __aexit__(self, *exc):
+        self._release()
+
+    def _release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+def _build_slots(loop):
+    slots = _async_slots.get(loop)
+    if slots is None:
+        slots = _async_slots[loop] = _BuildSlots(ASYNC_MAX_BUILDS)
+    return slots
+
+
+def _build_until_cancelled(config, output, cancel_event):
+    return PresentationBuilderPro(config, cancel_event).build(output)
+
+
+async def create_presentation_async(config, output=None, executor=None):
+    """create_presentation for asyncio: waits for a build slot, then renders on the render pool.
+
+    Cancelling the awaiting task (e.g. on client disconnect) stops the build after
+    its current slide, removes a partially streamed file, and re-raises CancelledError.
+    A process-pool `executor` can only drop builds that have not started yet.
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    loop = asyncio.get_running_loop()
+    executor = executor or _render_executor()
+    cancel_event = threading.Event() if isinstance(executor, ThreadPoolExecutor) else None
+    async with _build_slots(loop):
+        future = executor.submit(_build_until_cancelled, config, output, cancel_event)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if not future.cancel() and cancel_event is not None:
+                cancel_event.set()
+                # Hold the slot until the worker has actually stopped
+                stopped = asyncio.wrap_future(future)
+                await asyncio.wait([stopped])
+                stopped.exception()  # BuildCancelled (or a late failure): retrieved, CancelledError wins
+            raise
+
+
+def export_notes(config, fmt='md'):
+    """Speaker notes of a config as Markdown or JSON, without rendering the deck (quick previews)"""
+    return SpeakerNotes.document(config.get('slides_content', []), fmt)
+
+
+def merge_presentations(paths, output):
+    """Join finished decks in order by copying slide XML (no re-render); see slidecraft_merge"""
+    from slidecraft_merge import merge_decks
+    return merge_decks(paths, output)
+
+
+def split_presentation(path, ranges, output_dir=None):
+    """Split a finished deck into one file per slide range such as '1-10' or '11-'"""
+    from slidecraft_merge import split_deck
+    return split_deck(path, ranges, output_dir)
 
 # ============================================================================
 # TESTS
 # ============================================================================
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     print("="*70)
     print("🎨 SLIDECRAFT v5.0 - Presentations that inspire, in seconds")
     print("="*70 + "\n")
@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+import pytest
+
+from ai_generator import AIContentGenerator, RequestScheduler, SectionMerger, split_sections
+
+
+def test_sections_are_cut_between_paragraphs_within_the_limit():
+    paragraphs = [f"Paragraph {i}" + ' word' * 15 for i in range(20)]
+    sections = split_sections('\n\n'.join(paragraphs), 300)
+    assert len(sections) > 1
+    assert all(len(section) <= 300 for section in sections)
+    assert '\n\n'.join(sections).split('\n\n') == paragraphs
+
+
+def test_sections_prefer_to_start_at_headings():
+    text = '\n\n'.join(['Intro ' + 'x' * 120, '## Second', 'Body ' + 'y' * 120, 'CHAPTER TWO', 'Body ' + 'z' * 20])
+    sections = split_sections(text, 200)
+    assert [section.partition('\n')[0] for section in sections] == ['Intro ' + 'x' * 120, '## Second', 'CHAPTER TWO']
+
+
+def test_heading_does_not_cut_a_section_under_half_full():
+    assert split_sections('Short intro\n\n# Heading\n\nBody', 200) == ['Short intro\n\n# Heading\n\nBody']
+
+
+def test_oversize_paragraph_is_cut_between_lines_then_words():
+    lines = [f"line {i} " + 'abc ' * 10 for i in range(10)]
+    sections = split_sections('\n'.join(lines), 100)
+    assert all(len(section) <= 100 for section in sections)
+    assert ' '.join(' '.join(sections).split()) == ' '.join(' '.join(lines).split())
+
+    unbroken = 'x' * 250
+    assert split_sections(unbroken, 100) == ['x' * 100, 'x' * 100, 'x' * 50]
+
+
+def test_merger_keeps_the_first_title_and_drops_repeats():
+    merger = SectionMerger()
+    first = merger.add([{'type': 'title', 'title': 'Deck'},
+                        {'type': 'content', 'title': 'Intro', 'bullets': ['A'], 'notes': 'one'}])
+    second = merger.add([{'type': 'title', 'title': 'Deck again'},
+                         {'type': 'content', 'title': 'INTRO', 'bullets': ['a'], 'notes': 'other notes'},
+                         {'type': 'content', 'title': 'New', 'bullets': ['B']}])
+    assert [slide['title'] for slide in first + second] == ['Deck', 'Intro', 'New']
+    assert merger.count == 3
+
+
+def test_merger_renumbers_sections_across_parts():
+    merger = SectionMerger()
+    numbers = [slide['section_number']
+               for part in ([{'type': 'section', 'title': 'One', 'section_number': '01'}],
+                            [{'type': 'section', 'title': 'Two', 'section_number': '01'},
+                             {'type': 'section', 'title': 'One', 'section_number': '07'},
+                             {'type': 'section', 'title': 'Three', 'section_number': '02'}])
+               for slide in merger.add(part)]
+    assert numbers == ['01', '02', '03']
+
+
+class _Failure(Exception):
+    pass
+
+
+def test_async_sections_are_cancelled_when_one_fails():
+    started, cancelled = [], []
+
+    class Client:
+        @property
+        def messages(self):
+            return self
+
+        async def create(self, **params):
+            part = len(started)
+            started.append(part)
+            if part == 1:
+                await asyncio.sleep(0.01)
+                raise _Failure('section failed')
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.append(part)
+                raise
+            return type('Message', (), {'content': [type('Block', (), {'text': json.dumps([])})()]})()
+
+    generator = AIContentGenerator(api_key='test', scheduler=RequestScheduler(max_concurrency=8))
+    generator.LONG_CONTENT_CHARS, generator.SECTION_CHARS = 100, 100
+    generator.async_client = Client()
+    content = '\n\n'.join(f"Part {i} " + 'text ' * 15 for i in range(4))
+
+    async def main():
+        with pytest.raises(_Failure):
+            await asyncio.wait_for(generator.generate_presentation_structure_async('Topic', content), 5)
+        assert all(task.done() for task in asyncio.all_tasks() if task is not asyncio.current_task())
+
+    asyncio.run(main())
+    assert len(started) == 4
+    assert sorted(cancelled) == [0, 2, 3]
+    assert generator.scheduler.scheduler_info()['active'] == 0
@@ -0,0 +1,132 @@
+import contextlib
+import json
+import random
+
+import pytest
+
+from ai_generator import AIContentGenerator, ResponseCache, RequestScheduler, SlideStreamParser
+
+SLIDES = [
+    {'type': 'title', 'title': 'Braces { and ] in "quotes"', 'subtitle': 'back\\slash\nnewline'},
+    {'type': 'content', 'title': 'Nested', 'bullets': ['[a]', '{b}', 'c\\"d'], 'meta': {'x': [1, {'y': 2}]}},
+    {'type': 'quote', 'quote': 'café — \\u escapes', 'attribution': ''},
+]
+NORMALIZED = [dict(slide, notes='') for slide in SLIDES]
+RESPONSE = 'Here is the deck:\n```json\n' + json.dumps(SLIDES, indent=2) + '\n```\nEnjoy!'
+
+
+def _feed(chunks):
+    parser = SlideStreamParser()
+    slides = [slide for chunk in chunks for slide in parser.feed(chunk)]
+    parser.close()
+    return slides
+
+
+def _split(text, rng):
+    cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, 40)))
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+def test_random_chunk_splits_yield_the_whole_array():
+    rng = random.Random(1234)
+    assert _feed([RESPONSE]) == SLIDES
+    assert _feed(RESPONSE) == SLIDES
+    for _ in range(200):
+        assert _feed(_split(RESPONSE, rng)) == SLIDES
+
+
+def test_slides_are_returned_as_soon_as_they_close():
+    parser = SlideStreamParser()
+    text = json.dumps(SLIDES)
+    end = text.index('}, {') + 1
+    assert parser.feed(text[:end - 1]) == []
+    assert parser.feed(text[end - 1:end]) == SLIDES[:1]
+    assert parser.feed(text[end:]) == SLIDES[1:]
+    assert parser.done
+
+
+@pytest.mark.parametrize('escaped', ['\\"', '\\\\', '\\n', '\\u00e9'])
+def test_backslash_at_chunk_boundary(escaped):
+    text = '[{"title": "a' + escaped + '}b"}]'
+    for cut in range(text.index('\\'), text.index('\\') + len(escaped) + 1):
+        assert _feed([text[:cut], text[cut:]]) == json.loads(text)
+
+
+def test_non_dict_items_are_skipped():
+    text = '[1, "two", [3, {"four": 4}], null, {"type": "content"}, true]'
+    assert _feed(_split(text, random.Random(7))) == [{'type': 'content'}]
+
+
+def test_text_after_the_array_is_ignored():
+    assert _feed(['[{"a": 1}]', ' and [{"b": 2}]']) == [{'a': 1}]
+
+
+@pytest.mark.parametrize('text, message', [
+    ('[{"a": 1}, {"b": ', 'ended before'),
+    ('[{"a": 1}', 'ended before'),
+    ('Sorry, I cannot help with that.', 'No JSON array'),
+])
+def test_close_raises_on_truncated_response(text, message):
+    parser = SlideStreamParser()
+    parser.feed(text)
+    with pytest.raises(ValueError, match=message):
+        parser.close()
+
+
+class _Stream:
+    def __init__(self, chunks):
+        self.text_stream = iter(chunks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Client:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.opened = 0
+        self.messages = self
+
+    def stream(self, **params):
+        self.opened += 1
+        return _Stream(self.chunks)
+
+
+def _generator(tmp_path, chunks):
+    generator = AIContentGenerator(api_key='test', cache=ResponseCache(str(tmp_path)),
+                                   scheduler=RequestScheduler(max_concurrency=1))
+    generator.client = _Client(chunks)
+    return generator
+
+
+def test_stream_slides_caches_a_completed_stream(tmp_path):
+    generator = _generator(tmp_path, _split(RESPONSE, random.Random(3)))
+    assert list(generator.stream_slides('Topic', 'Notes')) == NORMALIZED
+    assert generator.cache.cache_info()['misses'] == 1
+
+    # Replayed from the cache without opening another stream
+    assert list(generator.stream_slides('Topic', 'Notes')) == NORMALIZED
+    assert generator.client.opened == 1
+    assert generator.cache.hits == 1
+
+
+def test_stream_slides_does_not_cache_a_truncated_stream(tmp_path):
+    truncated = RESPONSE[:RESPONSE.rindex('}')]
+    generator = _generator(tmp_path, [truncated])
+    slides = generator.stream_slides('Topic', 'Notes')
+    assert [next(slides), next(slides)] == NORMALIZED[:2]
+    with pytest.raises(ValueError, match='ended before'):
+        list(slides)
+    assert not list(tmp_path.glob('*.json'))
+    assert generator.scheduler.scheduler_info()['active'] == 0
+
+
+def test_stream_slides_does_not_cache_when_the_caller_stops_early(tmp_path):
+    generator = _generator(tmp_path, [RESPONSE])
+    with contextlib.closing(generator.stream_slides('Topic', 'Notes')) as slides:
+        assert next(slides) == NORMALIZED[0]
+    assert not list(tmp_path.glob('*.json'))
+    assert generator.scheduler.scheduler_info()['active'] == 0
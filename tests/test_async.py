@@ -0,0 +1,101 @@
+import asyncio
+import gc
+import threading
+import time
+
+import pytest
+
+import slidecraft_v5
+from slidecraft_v5 import configure_async, create_presentation_async
+
+SLIDES = [{'type': 'content', 'title': f'Slide {i}', 'bullets': ['One', 'Two', 'Three']} for i in range(3000)]
+
+
+@pytest.fixture(autouse=True)
+def _restore_async_settings():
+    yield
+    configure_async(max_builds=8)
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Replace the render call with a tracked sleep: records peak concurrency and cancel events"""
+    state = {'active': 0, 'peak': 0, 'events': []}
+    lock = threading.Lock()
+
+    def fake_build(config, output, cancel_event):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            state['events'].append(cancel_event)
+        time.sleep(config.get('seconds', 0.05))
+        with lock:
+            state['active'] -= 1
+        return {'filepath': output}
+
+    monkeypatch.setattr(slidecraft_v5, '_build_until_cancelled', fake_build)
+    return state
+
+
+def test_max_builds_caps_concurrent_builds(builds):
+    configure_async(max_workers=4, max_builds=2)
+
+    async def main():
+        return await asyncio.gather(*(create_presentation_async({}, f'deck{i}') for i in range(6)))
+
+    results = asyncio.run(main())
+    assert [r['filepath'] for r in results] == [f'deck{i}' for i in range(6)]
+    assert builds['peak'] == 2
+
+
+def test_event_loops_are_not_kept_alive(builds):
+    configure_async(max_workers=4, max_builds=1)
+    for _ in range(5):
+        async def main():
+            await asyncio.gather(*(create_presentation_async({}, None) for _ in range(3)))
+        asyncio.run(main())
+    gc.collect()
+    assert len(slidecraft_v5._async_slots) == 0
+
+
+def test_cancelled_waiter_does_not_lose_the_slot(builds):
+    configure_async(max_workers=4, max_builds=1)
+
+    async def main():
+        first = asyncio.ensure_future(create_presentation_async({'seconds': 0.1}, 'first'))
+        waiting = asyncio.ensure_future(create_presentation_async({}, 'cancelled'))
+        await asyncio.sleep(0.02)
+        waiting.cancel()
+        assert (await first)['filepath'] == 'first'
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        return await asyncio.wait_for(create_presentation_async({}, 'after'), 2)
+
+    assert asyncio.run(main())['filepath'] == 'after'
+
+
+def test_cancel_stops_the_build_and_removes_partial_output(tmp_path, monkeypatch):
+    events = []
+    build = slidecraft_v5._build_until_cancelled
+
+    def tracked(config, output, cancel_event):
+        events.append(cancel_event)
+        return build(config, output, cancel_event)
+
+    monkeypatch.setattr(slidecraft_v5, '_build_until_cancelled', tracked)
+    output = tmp_path / 'deck.pptx'
+
+    async def main():
+        task = asyncio.ensure_future(create_presentation_async(
+            {'slides_content': SLIDES, 'engine': 'stream', 'low_memory': True}, str(output)))
+        deadline = time.monotonic() + 10
+        while not (output.exists() and output.stat().st_size) and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        assert output.exists(), 'build did not start streaming'
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert events and events[0].is_set()
+    assert not output.exists()
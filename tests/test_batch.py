@@ -0,0 +1,56 @@
+import multiprocessing
+import os
+
+import pytest
+
+import slidecraft_batch
+from slidecraft_batch import create_presentations
+
+SLIDES = [{'type': 'title', 'title': 'Batch', 'subtitle': 'Deck'}]
+
+
+def _by_index(results):
+    return {r['index']: r for r in results}
+
+
+def test_names_are_sanitized_unique_and_directories_created(tmp_path):
+    configs = [{'name': '../escape', 'slides_content': SLIDES},
+               {'name': 'same', 'slides_content': SLIDES},
+               {'name': 'same', 'slides_content': SLIDES},
+               {'slides_content': SLIDES, 'output_dir': str(tmp_path / 'nested' / 'dir')}]
+    results = _by_index(create_presentations(configs, workers=2, output_dir=str(tmp_path / 'out')))
+    assert [results[i]['status'] for i in range(4)] == ['ok'] * 4
+    paths = [results[i]['filepath'] for i in range(4)]
+    assert len(set(paths)) == 4
+    assert all(os.path.exists(p) for p in paths)
+    assert os.path.dirname(paths[0]) == str(tmp_path / 'out')
+    assert os.path.dirname(paths[3]) == str(tmp_path / 'nested' / 'dir')
+
+
+def test_unpicklable_and_invalid_configs_do_not_stop_the_batch(tmp_path):
+    configs = [{'slides_content': SLIDES, 'hook': (i for i in range(3))},
+               'line 2: Expecting value',
+               {'slides_content': SLIDES, 'output_dir': str(tmp_path / 'file.txt')},
+               {'slides_content': SLIDES}]
+    (tmp_path / 'file.txt').write_text('not a directory')
+    results = _by_index(create_presentations(configs, workers=2, output_dir=str(tmp_path)))
+    assert [results[i]['status'] for i in range(4)] == ['error', 'error', 'error', 'ok']
+    assert 'pickle' in results[0]['error']
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='workers must inherit the patched builder')
+def test_worker_crash_fails_only_the_crashing_deck(tmp_path, monkeypatch):
+    build = slidecraft_batch.create_presentation
+
+    def crashing(config, **kwargs):
+        if config.get('name') == 'boom':
+            os._exit(1)
+        return build(config, **kwargs)
+
+    monkeypatch.setattr(slidecraft_batch, 'create_presentation', crashing)
+    names = ['a', 'b', 'boom', 'c', 'd', 'e']
+    results = _by_index(create_presentations([{'name': n, 'slides_content': SLIDES} for n in names],
+                                             workers=2, output_dir=str(tmp_path)))
+    assert len(results) == len(names)
+    assert [i for i, r in results.items() if r['status'] == 'error'] == [2]
+    assert 'BrokenProcessPool' in results[2]['error']
@@ -0,0 +1,144 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import time
+
+from PIL import Image
+
+from slidecraft_v5 import BrandKit, OutputCache, create_presentation
+
+SLIDES = [{'type': 'title', 'title': 'Cached', 'subtitle': 'Deck'},
+          {'type': 'content', 'title': 'Points', 'bullets': ['One', 'Two']}]
+
+
+def _logo(path, color):
+    Image.new('RGB', (64, 32), color).save(path)
+    return str(path)
+
+
+def _build(cache, logo_path):
+    kit = BrandKit('Acme', logo_path, ['#112233', '#445566'], ['#778899', '#AABBCC'], 'Arial Bold', 'Arial')
+    with contextlib.redirect_stdout(io.StringIO()):
+        return create_presentation({'brand_kit': kit, 'slides_content': SLIDES, 'cache': cache}, output='bytes')
+
+
+def test_cache_key_follows_logo_content_not_path(tmp_path):
+    cache = OutputCache(str(tmp_path / 'cache'))
+    first = _logo(tmp_path / 'logo.png', 'red')
+    assert _build(cache, first)['cache'] == 'miss'
+
+    moved = str(tmp_path / 'moved.png')
+    shutil.copy(first, moved)
+    os.utime(moved, ns=(1, 1))
+    assert _build(cache, moved)['cache'] == 'hit'
+
+    _logo(moved, 'blue')
+    assert _build(cache, moved)['cache'] == 'miss'
+
+
+def test_get_returns_data_when_entry_is_evicted_after_read(tmp_path, monkeypatch):
+    cache = OutputCache(str(tmp_path))
+    cache.put('a' * 64, b'package')
+
+    def evicted(path, *args, **kwargs):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, 'utime', evicted)
+    assert cache.get('a' * 64) == b'package'
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert cache.get('b' * 64) is None
+    assert cache.misses == 1
+
+
+
+def _responses(tmp_path, **options):
+    from ai_generator import ResponseCache
+    return ResponseCache(str(tmp_path), **options)
+
+
+def test_response_cache_drops_expired_entries(tmp_path, monkeypatch):
+    import ai_generator
+
+    cache = _responses(tmp_path, ttl=60)
+    cache.put('old', [{'title': 'Old'}])
+    assert cache.get('old') == [{'title': 'Old'}]
+
+    now = time.time()
+    monkeypatch.setattr(ai_generator.time, 'time', lambda: now + 61)
+    assert cache.get('old') is None
+    assert 'old' not in cache._memory
+    assert not (tmp_path / 'old.json').exists()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_response_cache_evicts_least_recently_used_files(tmp_path):
+    slides = [{'title': 'x' * 1000}]
+    cache = _responses(tmp_path, max_bytes=2500)
+    cache.put('a', slides)
+    cache.put('b', slides)
+    os.utime(tmp_path / 'a.json', ns=(1, 1))
+    os.utime(tmp_path / 'b.json', ns=(2, 2))
+    assert cache.get('a') == slides  # touches a, so b is now the oldest
+    cache.put('c', slides)
+    assert sorted(path.name for path in tmp_path.glob('*.json')) == ['a.json', 'c.json']
+
+
+def test_response_cache_memory_tier(tmp_path, monkeypatch):
+    from ai_generator import ResponseCache
+
+    monkeypatch.setattr(ResponseCache, 'MEMORY_ENTRIES', 2)
+    cache = _responses(tmp_path)
+    for key in 'abc':
+        cache.put(key, [{'title': key}])
+    assert list(cache._memory) == ['b', 'c']
+    for key in 'bc':
+        os.remove(tmp_path / f'{key}.json')
+    assert cache.get('b') == [{'title': 'b'}]
+
+    # A copy is returned, so callers cannot change the cached entry
+    cache.get('c')[0]['title'] = 'changed'
+    assert cache.get('c') == [{'title': 'c'}]
+
+    # 'a' is only on disk; reading it brings it back into memory, dropping the least recent
+    assert cache.get('a') == [{'title': 'a'}]
+    assert list(cache._memory) == ['c', 'a']
+
+
+def test_fresh_skips_the_response_cache_and_refreshes_it(tmp_path):
+    from ai_generator import AIContentGenerator, RequestScheduler
+
+    class Client:
+        calls = 0
+
+        @property
+        def messages(self):
+            return self
+
+        def create(self, **params):
+            Client.calls += 1
+            text = json.dumps([{'type': 'title', 'title': f'Answer {Client.calls}'}])
+            return type('Message', (), {'content': [type('Block', (), {'text': text})()]})()
+
+    generator = AIContentGenerator(api_key='test', cache=_responses(tmp_path),
+                                   scheduler=RequestScheduler(max_concurrency=1))
+    generator.client = Client()
+
+    def title(**options):
+        return generator.generate_presentation_structure('Topic', 'Notes', **options)['slides_content'][0]['title']
+
+    assert title() == 'Answer 1'
+    assert title() == 'Answer 1'
+    assert title(fresh=True) == 'Answer 2'
+    assert title() == 'Answer 2'
+    assert Client.calls == 2
+
+
+def test_response_cache_lock_is_reset_after_fork(tmp_path):
+    from ai_generator import _reset_clients
+
+    cache = _responses(tmp_path)
+    cache._lock.acquire()  # held by a thread that does not exist in the child
+    _reset_clients()
+    assert cache._lock.acquire(timeout=1)
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+import ai_generator
+from ai_generator import AIContentGenerator, configure_clients, shared_async_client, shared_client
+
+pytest.importorskip('anthropic')
+
+
+@pytest.fixture(autouse=True)
+def _restore_client_settings():
+    limits, timeout = dict(ai_generator.CLIENT_LIMITS), dict(ai_generator.CLIENT_TIMEOUT)
+    yield
+    ai_generator.CLIENT_LIMITS.update(limits)
+    ai_generator.CLIENT_TIMEOUT.update(timeout)
+    configure_clients()
+
+
+def test_configure_clients_closes_replaced_sync_clients():
+    generator = AIContentGenerator(api_key='test-key')
+    old = generator.client
+    assert shared_client('test-key') is old
+
+    configure_clients(connect_timeout=5)
+    assert old.is_closed()
+    assert generator.client is not old
+    assert not generator.client.is_closed()
+    assert generator.client.timeout.connect == 5
+
+
+def test_configure_clients_closes_async_clients_on_their_loop():
+    async def main():
+        old = shared_async_client('test-key')
+        # From another thread, as a settings change in a web app would be
+        await asyncio.to_thread(configure_clients, read_timeout=30)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert old.is_closed()
+        new = shared_async_client('test-key')
+        assert new is not old and not new.is_closed()
+        assert new.timeout.read == 30
+
+    asyncio.run(main())
+    assert not ai_generator._closing
+
+
+def test_configure_clients_skips_closed_loops():
+    loop = asyncio.new_event_loop()
+    client = loop.run_until_complete(_client_on_running_loop())
+    loop.close()
+    configure_clients()
+    assert not ai_generator._async_clients
+    assert not client.is_closed()
+
+
+async def _client_on_running_loop():
+    return shared_async_client('test-key')
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_does_not_load_pptx_or_pillow():
+    code = "import sys, slidecraft_v5; print(sorted(m for m in ('pptx', 'PIL', 'lxml') if m in sys.modules))"
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == '[]'
+
+
+def test_lazy_names_are_the_real_objects():
+    from pptx.dml.color import RGBColor as real_rgb
+    from pptx.util import Length as real_length
+
+    from slidecraft_v5 import Inches, Length, RGBColor
+
+    assert RGBColor is real_rgb and Length is real_length
+    assert isinstance(Inches(1), Length)
+
+
+def test_unknown_attribute_raises():
+    import slidecraft_v5
+
+    with pytest.raises(AttributeError):
+        slidecraft_v5.NotAName
@@ -0,0 +1,44 @@
+import contextlib
+import gc
+import io
+
+from pptx.package import Package
+
+from slidecraft_v5 import create_presentation
+
+SLIDES = [{'type': 'title', 'title': 'Leak check', 'subtitle': 'Deck', 'notes': 'Open warmly'},
+          {'type': 'content', 'title': 'Points', 'bullets': ['One', 'Two'], 'notes': 'Two points'},
+          {'type': 'quote', 'quote': 'Be the change', 'attribution': 'Gandhi', 'notes': 'Pause'}]
+
+
+def _live_packages():
+    gc.collect()
+    return sum(isinstance(o, Package) for o in gc.get_objects())
+
+
+def _build(**config):
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_presentation(dict(config, slides_content=SLIDES), output='bytes')
+
+
+def test_decks_with_notes_are_collected():
+    _build()
+    before = _live_packages()
+    for _ in range(3):
+        _build()
+    assert _live_packages() == before
+
+
+def test_branded_decks_are_collected(tmp_path):
+    from PIL import Image
+
+    from slidecraft_v5 import BrandKit
+
+    logo = tmp_path / 'logo.png'
+    Image.new('RGB', (120, 40), 'navy').save(logo)
+    kit = BrandKit('Acme', str(logo), ['#112233', '#445566'], ['#778899', '#AABBCC'], 'Arial Bold', 'Arial')
+    _build(brand_kit=kit)
+    before = _live_packages()
+    for _ in range(3):
+        _build(brand_kit=kit)
+    assert _live_packages() == before
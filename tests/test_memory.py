@@ -0,0 +1,29 @@
+import contextlib
+import io
+import tracemalloc
+
+import pytest
+
+from benchmark import _deck
+from slidecraft_v5 import SlideFactory, create_presentation
+
+
+def _traced_peak_mb(size, tmp_path, **config):
+    config = dict(config, theme='software_professional', slides_content=_deck(list(SlideFactory.SLIDE_TYPES), size))
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_presentation(dict(config, slides_content=config['slides_content'][:12]), output='bytes')
+        tracemalloc.start()
+        try:
+            create_presentation(config, output=str(tmp_path / f'deck_{size}.pptx'))
+            return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+
+
+@pytest.mark.parametrize('engine', ['pptx', 'stream'])
+def test_low_memory_traced_peak_stays_bounded(engine, tmp_path):
+    small = _traced_peak_mb(50, tmp_path, engine=engine, low_memory=True)
+    large = _traced_peak_mb(400, tmp_path, engine=engine, low_memory=True)
+    assert large < 8
+    # Only the zip directory grows with the deck: a few KB per slide
+    assert (large - small) * 1024 / 350 < 10
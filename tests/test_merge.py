@@ -0,0 +1,94 @@
+import contextlib
+import io
+import zipfile
+
+import pytest
+from PIL import Image
+from pptx import Presentation
+
+from slidecraft_merge import merge_decks, parse_range, split_deck
+from slidecraft_v5 import BrandKit, create_presentation
+
+
+def _deck(path, prefix, count, logo=None, theme='tech_modern'):
+    slides = [{'type': 'content', 'title': f'{prefix} {i}', 'bullets': ['One', 'Two'], 'notes': f'{prefix} notes {i}'}
+              for i in range(1, count + 1)]
+    config = {'theme': theme, 'slides_content': slides}
+    if logo:
+        config['brand_kit'] = BrandKit('Acme', logo, ['#112233', '#445566'], ['#778899', '#AABBCC'],
+                                       'Arial Bold', 'Arial')
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_presentation(config, output=str(path))
+    return str(path)
+
+
+def _parts(path, folder):
+    with zipfile.ZipFile(path) as z:
+        return [name for name in z.namelist() if name.startswith(folder) and '/_rels/' not in name]
+
+
+def _titles_and_notes(path):
+    prs = Presentation(path)
+    return [(slide.shapes.title.text if slide.shapes.title else
+             next(s.text_frame.text for s in slide.shapes if s.has_text_frame and s.text_frame.text),
+             slide.notes_slide.notes_text_frame.text if slide.has_notes_slide else None)
+            for slide in prs.slides]
+
+
+@pytest.fixture
+def logo(tmp_path):
+    path = tmp_path / 'logo.png'
+    Image.new('RGB', (120, 40), 'navy').save(path)
+    return str(path)
+
+
+def test_merge_shares_masters_and_media_between_decks(tmp_path, logo):
+    first = _deck(tmp_path / 'a.pptx', 'A', 3, logo)
+    second = _deck(tmp_path / 'b.pptx', 'B', 2, logo)
+    merged = str(tmp_path / 'merged.pptx')
+    assert merge_decks([first, second], merged)['slides'] == 5
+
+    for folder in ('ppt/slideMasters/', 'ppt/slideLayouts/', 'ppt/theme/', 'ppt/media/'):
+        assert len(_parts(merged, folder)) == len(_parts(first, folder)), folder
+    assert len(_parts(merged, 'ppt/media/')) == 1
+    assert len(Presentation(merged).slides) == 5
+
+
+def test_merge_keeps_each_slides_notes(tmp_path):
+    first = _deck(tmp_path / 'a.pptx', 'A', 2)
+    second = _deck(tmp_path / 'b.pptx', 'B', 2, theme='church_warmth')
+    merged = str(tmp_path / 'merged.pptx')
+    merge_decks([first, second], merged)
+    assert _titles_and_notes(merged) == _titles_and_notes(first) + _titles_and_notes(second)
+    assert [notes for _, notes in _titles_and_notes(merged)] == ['A notes 1', 'A notes 2', 'B notes 1', 'B notes 2']
+
+
+def test_merge_refuses_to_overwrite_an_input(tmp_path):
+    first = _deck(tmp_path / 'a.pptx', 'A', 1)
+    with pytest.raises(ValueError, match='also an input'):
+        merge_decks([first], first)
+
+
+@pytest.mark.parametrize('spec, expected', [
+    ('3', (3, 3)), ('3-7', (3, 7)), (' 3 - 7 ', (3, 7)), ('3-', (3, 10)), ('-7', (1, 7)),
+    ('1-10', (1, 10)), ('10-', (10, 10)), ((2, 4), (2, 4)),
+])
+def test_parse_range(spec, expected):
+    assert parse_range(spec, 10) == expected
+
+
+@pytest.mark.parametrize('spec', ['', '-', 'a-b', '3--4', '1,2', '7-3', '0', '0-2', '11', '5-11', '11-', (4, 2)])
+def test_parse_range_rejects_bad_or_out_of_range_specs(spec):
+    with pytest.raises(ValueError):
+        parse_range(spec, 10)
+
+
+def test_split_then_merge_round_trips(tmp_path, logo):
+    source = _deck(tmp_path / 'deck.pptx', 'S', 7, logo)
+    parts = split_deck(source, ['1-3', '4', '5-'], output_dir=str(tmp_path / 'parts'))
+    assert [(part['first'], part['last'], part['slides']) for part in parts] == [(1, 3, 3), (4, 4, 1), (5, 7, 3)]
+
+    merged = str(tmp_path / 'merged.pptx')
+    assert merge_decks([part['filepath'] for part in parts], merged)['slides'] == 7
+    assert _titles_and_notes(merged) == _titles_and_notes(source)
+    assert len(_parts(merged, 'ppt/media/')) == 1
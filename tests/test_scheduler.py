@@ -0,0 +1,272 @@
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+
+from ai_generator import RequestScheduler, _retry_after
+
+
+class Overloaded(Exception):
+    status_code = 529
+    response = None
+
+
+class BadRequest(Exception):
+    status_code = 400
+    response = None
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, headers):
+        super().__init__('rate limited')
+        self.response = type('Response', (), {'headers': headers})()
+
+
+def _scheduler(**options):
+    return RequestScheduler(max_concurrency=1, base_delay=0.001, max_delay=0.01, **options)
+
+
+def _failing_then(result, *errors):
+    errors = list(errors)
+
+    def send():
+        if errors:
+            raise errors.pop(0)
+        return result
+    return send
+
+
+def _admits_again(scheduler):
+    """True if a new request gets the (single) slot, i.e. nothing leaked it"""
+    done = threading.Event()
+    thread = threading.Thread(target=lambda: scheduler.call(done.set), daemon=True)
+    thread.start()
+    return done.wait(2)
+
+
+def test_call_retries_retryable_errors_and_releases():
+    scheduler = _scheduler()
+    assert scheduler.call(_failing_then('ok', Overloaded(), Overloaded())) == 'ok'
+    info = scheduler.scheduler_info()
+    assert (info['requests'], info['retries'], info['active']) == (3, 2, 0)
+
+
+def test_call_raises_non_retryable_and_exhausted_errors():
+    scheduler = _scheduler(max_retries=2)
+    with pytest.raises(BadRequest):
+        scheduler.call(_failing_then('ok', BadRequest()))
+    with pytest.raises(Overloaded):
+        scheduler.call(_failing_then('ok', *[Overloaded()] * 3))
+    assert scheduler.scheduler_info()['active'] == 0
+    assert _admits_again(scheduler)
+
+
+def test_call_releases_on_interrupt():
+    scheduler = _scheduler()
+    with pytest.raises(KeyboardInterrupt):
+        scheduler.call(_failing_then('ok', KeyboardInterrupt()))
+    assert _admits_again(scheduler)
+
+
+def test_cancelled_async_call_releases():
+    scheduler = _scheduler()
+
+    async def main():
+        task = asyncio.ensure_future(scheduler.call_async(lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert _admits_again(scheduler)
+
+
+class _Stream:
+    def __init__(self):
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+
+
+def test_stream_retries_when_opening_fails():
+    scheduler = _scheduler()
+    stream = _Stream()
+    with scheduler.stream(_failing_then(stream, Overloaded())) as opened:
+        assert opened is stream
+        assert scheduler.scheduler_info()['active'] == 1
+    assert stream.closed
+    assert scheduler.scheduler_info()['retries'] == 1
+    assert _admits_again(scheduler)
+
+
+@pytest.mark.parametrize('error', [BadRequest(), KeyboardInterrupt()])
+def test_stream_releases_when_open_stream_raises(error):
+    scheduler = _scheduler()
+    with pytest.raises(type(error)):
+        with scheduler.stream(_failing_then(_Stream(), error)):
+            pass
+    assert _admits_again(scheduler)
+
+
+def test_stream_releases_when_enter_raises():
+    class Refused(_Stream):
+        def __enter__(self):
+            raise BadRequest()
+
+    scheduler = _scheduler()
+    with pytest.raises(BadRequest):
+        with scheduler.stream(Refused):
+            pass
+    assert _admits_again(scheduler)
+
+
+def test_stream_releases_when_reading_fails():
+    scheduler = _scheduler()
+    stream = _Stream()
+    with contextlib.suppress(ValueError):
+        with scheduler.stream(lambda: stream):
+            raise ValueError('reader failed')
+    assert stream.closed
+    assert _admits_again(scheduler)
+
+
+# -- retry-after and pacing ---------------------------------------------------
+
+def test_retry_after_forms():
+    assert _retry_after({'retry-after': '2'}) == 2.0
+    assert _retry_after({'retry-after-ms': '1500', 'retry-after': '9'}) == 1.5
+    assert _retry_after({'retry-after-ms': 'soon', 'retry-after': '3'}) == 3.0
+    assert 3.0 < _retry_after({'retry-after': formatdate(time.time() + 5, usegmt=True)}) <= 5.0
+    assert _retry_after({'retry-after': formatdate(time.time() - 60, usegmt=True)}) == 0.0
+    assert _retry_after({'retry-after': 'whenever'}) is None
+    assert _retry_after({}) is None and _retry_after(None) is None
+
+
+def test_retry_after_pauses_every_admission():
+    scheduler = RequestScheduler(max_delay=10)
+    delay = scheduler._retry_delay(RateLimited({'retry-after': '0.5'}), attempt=0)
+    assert 0.5 <= delay <= 0.6
+    ticket = scheduler._enqueue(0, 'interactive', 'other')
+    assert 0.4 < scheduler._try_admit(ticket) <= 0.6
+    assert scheduler.scheduler_info()['throttled'] == 1
+
+
+def test_requests_per_minute_bucket_delays_the_next_request():
+    scheduler = RequestScheduler(requests_per_minute=60)  # one a second, bursts of one
+    scheduler.call(lambda: None)
+    ticket = scheduler._enqueue(0, 'interactive', 'default')
+    assert 0.9 < scheduler._try_admit(ticket) <= 1.0
+
+
+def test_tokens_per_minute_bucket_delays_by_tokens_needed():
+    scheduler = RequestScheduler(tokens_per_minute=600)  # ten a second, bursts of ten
+    scheduler.call(lambda: None, tokens=10)
+    ticket = scheduler._enqueue(5, 'interactive', 'default')
+    assert 0.4 < scheduler._try_admit(ticket) <= 0.5
+
+
+# -- ordering -----------------------------------------------------------------
+
+def _admission_order(scheduler, jobs):
+    """Queue (lane, tenant) jobs behind a held slot, then release it; returns the order they ran in"""
+    order, threads = [], []
+    held = scheduler._acquire(0, 'interactive', 'holder')
+    for lane, tenant in jobs:
+        thread = threading.Thread(target=scheduler.call, args=(lambda job=(lane, tenant): order.append(job),),
+                                  kwargs={'lane': lane, 'tenant': tenant})
+        thread.start()
+        threads.append(thread)
+        deadline = time.monotonic() + 2
+        while sum(scheduler.scheduler_info()['waiting'].values()) < len(threads) and time.monotonic() < deadline:
+            time.sleep(0.001)
+    scheduler._release(held)
+    for thread in threads:
+        thread.join(2)
+    return order
+
+
+def test_interactive_lane_goes_before_batch():
+    jobs = [('batch', 'a'), ('batch', 'a'), ('interactive', 'b'), ('batch', 'a'), ('interactive', 'b')]
+    order = _admission_order(_scheduler(), jobs)
+    assert [lane for lane, _ in order] == ['interactive'] * 2 + ['batch'] * 3
+
+
+def test_tenants_take_turns_within_a_lane():
+    jobs = [('batch', 'a')] * 4 + [('batch', 'b')] * 2 + [('batch', 'c')]
+    order = _admission_order(_scheduler(), jobs)
+    assert [tenant for _, tenant in order] == ['a', 'b', 'c', 'a', 'b', 'a', 'a']
+
+
+# -- async waiters --------------------------------------------------------------
+
+def test_async_waiters_are_woken_not_polled():
+    scheduler = _scheduler()
+    checks = []
+    try_admit = scheduler._try_admit
+
+    def counted(ticket):
+        checks.append(time.monotonic())
+        return try_admit(ticket)
+
+    scheduler._try_admit = counted
+    held = scheduler._acquire(0, 'interactive', 'holder')
+    released = []
+
+    def release_later():
+        time.sleep(0.3)
+        released.append(time.monotonic())
+        scheduler._release(held)
+
+    async def main():
+        threading.Thread(target=release_later).start()
+        await asyncio.wait_for(scheduler.call_async(lambda: asyncio.sleep(0)), 2)
+        return time.monotonic()
+
+    checks.clear()
+    admitted = asyncio.run(main())
+    assert len(checks) <= 3  # first check, the wake-up after release (and perhaps one spurious)
+    assert admitted - released[0] < 0.1
+
+
+# -- against a mock API ---------------------------------------------------------
+
+def test_bursts_against_a_server_that_returns_429s():
+    pytest.importorskip('anthropic')
+    import ai_generator
+    from benchmark import _mock_messages_server
+
+    server = _mock_messages_server(0, requests_per_second=10, overload_every=7)
+    os.environ['ANTHROPIC_BASE_URL'] = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        ai_generator.configure_clients()
+        for scheduler in (RequestScheduler(max_concurrency=32, base_delay=0.1),
+                          RequestScheduler(requests_per_minute=600, max_concurrency=4, base_delay=0.1)):
+            results = []
+
+            def job(index):
+                generator = ai_generator.AIContentGenerator('test-key', scheduler=scheduler)
+                results.append(generator.generate_presentation_structure('Topic', f'Request {index}'))
+
+            threads = [threading.Thread(target=job, args=(i,)) for i in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(30)
+            assert len(results) == 20 and all(results)
+            assert scheduler.scheduler_info()['active'] == 0
+        assert server.counts['429'] > 0 and server.counts['529'] > 0
+    finally:
+        server.shutdown()
+        os.environ.pop('ANTHROPIC_BASE_URL', None)
+        ai_generator.configure_clients()
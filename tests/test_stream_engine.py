@@ -0,0 +1,115 @@
+import contextlib
+import io
+import re
+import zipfile
+
+import pytest
+from PIL import Image
+
+from slidecraft_v5 import BrandKit, ThemeGallery, create_presentation
+
+SLIDES = [
+    {'type': 'title', 'title': 'Walking in Faith', 'subtitle': 'Hebrews 11:1-6\nNovember 17, 2025', 'notes': 'Open warmly'},
+    {'type': 'section', 'title': 'Opening Scripture', 'section_number': '01'},
+    {'type': 'section', 'title': 'Thank You', 'section_number': ''},
+    {'type': 'content', 'title': 'Context', 'bullets': ['A', 'B', 'C']},
+    {'type': 'content', 'title': 'Many', 'bullets': list('abcdefg'), 'notes': 'n'},
+    {'type': 'content', 'title': 'Context', 'bullets': ['A', 'B', 'C']},
+    {'type': 'two_column', 'title': 'TC', 'left_header': 'L', 'left_items': ['a', 'b'],
+     'right_header': 'R', 'right_items': ['c']},
+    {'type': 'quote', 'quote': 'Be the change', 'attribution': 'Gandhi'},
+    {'type': 'stats', 'title': 'Stats', 'stats': ['98%: happy', '3x faster', 'no numbers here at all ok']},
+    {'type': 'bogus', 'title': 'fallback', 'bullets': ['x']},
+]
+
+_SLIDE_REL = re.compile(rb'<Relationship Id="(rId\d+)" Type="[^"]+/slide" Target="([^"]+)"/>')
+
+
+def _parts(config, engine):
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = create_presentation(dict(config, engine=engine), output='bytes')['data']
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        return {name: z.read(name) for name in z.namelist() if not name.startswith('docProps')}
+
+
+def _normalized(parts):
+    """python-pptx relates the notes master lazily, so presentation-level rIds may differ: name slides by target"""
+    parts = dict(parts)
+    rels = parts.pop('ppt/_rels/presentation.xml.rels')
+    targets = dict(_SLIDE_REL.findall(rels))
+    parts['ppt/presentation.xml'] = re.sub(rb'(<p:sldId id="\d+" r:id=")(rId\d+)',
+                                           lambda m: m.group(1) + targets[m.group(2)],
+                                           parts['ppt/presentation.xml'])
+    other = re.sub(rb'<Relationship Id="rId\d+"', b'<Relationship', _SLIDE_REL.sub(b'', rels))
+    parts['presentation rels'] = sorted(re.findall(rb'<Relationship [^>]+/>', other))
+    parts['slides'] = [target for _, target in _SLIDE_REL.findall(rels)]
+    return parts
+
+
+@pytest.mark.parametrize('theme', ThemeGallery.list_themes())
+def test_stream_engine_matches_python_pptx(theme):
+    config = {'theme': theme, 'slides_content': SLIDES}
+    assert _normalized(_parts(config, 'stream')) == _normalized(_parts(config, 'pptx'))
+
+
+def test_stream_engine_matches_python_pptx_with_logo(tmp_path):
+    logo = tmp_path / 'logo.png'
+    Image.new('RGB', (120, 40), 'navy').save(logo)
+    kit = BrandKit('Acme', str(logo), ['#112233', '#445566'], ['#778899', '#AABBCC'], 'Arial Bold', 'Arial')
+    config = {'brand_kit': kit, 'slides_content': SLIDES}
+    stream, pptx = _parts(config, 'stream'), _parts(config, 'pptx')
+    assert any(name.startswith('ppt/media/') for name in stream)
+    assert _normalized(stream) == _normalized(pptx)
+
+
+def test_stamp_cache_is_bounded(monkeypatch):
+    from slidecraft_stream import StreamShapes
+
+    monkeypatch.setattr(StreamShapes, 'MAX_ENTRIES', 4)
+    monkeypatch.setattr(StreamShapes, '_stamps', {})
+    config = {'theme': 'tech_modern', 'slides_content': SLIDES}
+    assert _normalized(_parts(config, 'stream')) == _normalized(_parts(config, 'pptx'))
+    assert 0 < len(StreamShapes._stamps) <= 4
+
+
+class _NoBlueprints(dict):
+    def __setitem__(self, key, value):
+        pass
+
+
+def test_text_blueprints_match_plain_python_pptx(monkeypatch):
+    from slidecraft_v5 import ShapeBlueprints
+
+    slides = SLIDES + [{'type': 'content', 'title': 'Two\nlines', 'bullets': ['a\nb', 'c\vd', '']},
+                       {'type': 'quote', 'quote': 'First\nSecond', 'attribution': 'Someone'}]
+    config = {'theme': 'tech_modern', 'slides_content': slides}
+    monkeypatch.setattr(ShapeBlueprints, '_cache', _NoBlueprints())
+    plain = _parts(config, 'pptx')
+    monkeypatch.setattr(ShapeBlueprints, '_cache', {})
+    assert _parts(config, 'pptx') == plain
+    assert any(key[0] == 'text' for key in ShapeBlueprints._cache)
+
+
+def _title_run(slide):
+    return next(shape for shape in slide.shapes if shape.has_text_frame and shape.text_frame.text == 'Context'
+                ).text_frame.paragraphs[0].runs[0]
+
+
+def test_incremental_build_keeps_hyperlinks_of_reused_slides(tmp_path):
+    from pptx import Presentation
+
+    previous = str(tmp_path / 'deck.pptx')
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_presentation({'slides_content': SLIDES}, output=previous)
+    # Link text on slide 4 after the build, as a hand edit would; the manifest still matches
+    prs = Presentation(previous)
+    run = _title_run(prs.slides[3])
+    run.hyperlink.address = 'https://example.com/?a=1&b=2'
+    prs.save(previous)
+
+    edited = [dict(SLIDES[0], title='Walking in Hope')] + SLIDES[1:]
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = create_presentation({'slides_content': edited, 'previous': previous}, output='bytes')
+    assert result['reused_slides'] == len(SLIDES) - 1
+    slide = Presentation(io.BytesIO(result['data'])).slides[3]
+    assert _title_run(slide).hyperlink.address == 'https://example.com/?a=1&b=2'
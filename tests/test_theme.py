@@ -0,0 +1,35 @@
+import copy
+import json
+import pickle
+from dataclasses import asdict
+
+import pytest
+
+from slidecraft_v5 import ThemeGallery
+
+
+@pytest.fixture
+def theme():
+    return ThemeGallery.THEMES['tech_modern']
+
+
+def test_theme_round_trips_through_pickle_and_deepcopy(theme):
+    for clone in (pickle.loads(pickle.dumps(theme)), copy.deepcopy(theme), copy.copy(theme)):
+        assert clone == theme
+        assert clone.to_palette() == theme.to_palette()
+        with pytest.raises(TypeError):
+            clone.colors['primary'] = '#000000'
+
+
+def test_theme_asdict_is_json_serializable(theme):
+    data = json.loads(json.dumps(asdict(theme)))
+    assert data['colors'] == dict(theme.colors)
+    assert data['fonts'] == dict(theme.fonts)
+
+
+def test_theme_fields_are_read_only(theme):
+    for mutate in (lambda: theme.colors.update(primary='#000000'), lambda: theme.fonts.pop('body'),
+                   lambda: theme.colors.clear(), lambda: theme.fonts.setdefault('mono', 'Courier')):
+        with pytest.raises(TypeError):
+            mutate()
+    assert theme.colors['primary'] == '#0A192F'
@@ -0,0 +1,30 @@
+import contextlib
+import io
+import zipfile
+
+from slidecraft_v5 import PhaseTimer, create_presentation
+
+SLIDES = [{'type': 'title', 'title': 'Timed', 'subtitle': 'Deck', 'notes': 'Hello'},
+          {'type': 'content', 'title': 'One', 'bullets': ['A', 'B']},
+          {'type': 'content', 'title': 'Two', 'bullets': ['C']}]
+STEPS = ('add_slide', '_add_background', '_add_brand_logo', '_add_header_bar',
+         '_add_header', '_add_content', '_add_decorations', '_add_speaker_notes')
+
+
+def _build(**config):
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = create_presentation(dict(config, slides_content=SLIDES, reuse_slides=False), output='bytes')
+    with zipfile.ZipFile(io.BytesIO(result['data'])) as z:
+        return result, {name: z.read(name) for name in z.namelist() if not name.startswith('docProps')}
+
+
+def test_timed_build_matches_untimed_and_reports_every_step():
+    seen = []
+    result, timed = _build(timing=PhaseTimer(lambda name, seconds: seen.append(name)))
+    assert timed == _build()[1]
+
+    counts = {name: phase['count'] for name, phase in result['timings'].items()}
+    for step in STEPS:
+        assert counts[f'title.{step}'] == 1
+        assert counts[f'content.{step}'] == 2
+    assert [name for name in seen if name.startswith('title.')] == [f'title.{step}' for step in STEPS]